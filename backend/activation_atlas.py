@@ -0,0 +1,225 @@
+import os
+import math
+import uuid
+import threading
+from collections import OrderedDict
+import numpy as np
+
+# 활성화 아틀라스 저장 위치 (backend/output/atlases)
+ATLAS_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'output', 'atlases')
+
+
+class AtlasError(ValueError):
+    """아틀라스 조회 요청이 잘못되었을 때 발생하는 예외"""
+    pass
+
+
+class ActivationAtlas:
+    """유닛별 상위 k개 입력과 활성값 히스토그램을 배치 단위로 누적하는 인덱스"""
+
+    def __init__(self, k=10, bins=32):
+        self.k = int(k)
+        self.bins = int(bins)
+        if self.k < 1 or self.bins < 1:
+            raise AtlasError("k와 bins는 1 이상이어야 합니다.")
+        self.num_samples = 0
+        # 레이어 이름 -> 상태 배열 딕셔너리
+        self.layers = {}
+
+    def _init_layer(self, name, values):
+        num_units = values.shape[1]
+        lo, hi = float(values.min()), float(values.max())
+        if lo == hi:
+            lo, hi = lo - 1.0, hi + 1.0
+        # 첫 배치 범위에 여유를 두고 시작 (이후 배치가 범위를 벗어나면 _extend_edges로 구간을 넓힘)
+        margin = (hi - lo) * 0.25
+        self.layers[name] = {
+            'top_values': np.full((num_units, self.k), -np.inf, dtype=np.float32),
+            'top_ids': np.full((num_units, self.k), -1, dtype=np.int64),
+            'edges': np.linspace(lo - margin, hi + margin, self.bins + 1),
+            'counts': np.zeros((num_units, self.bins), dtype=np.int64),
+            'underflow': np.zeros(num_units, dtype=np.int64),
+            'overflow': np.zeros(num_units, dtype=np.int64),
+            'sum': np.zeros(num_units, dtype=np.float64)
+        }
+
+    def update(self, activations, input_ids):
+        """레이어별 (배치, 유닛) 활성값으로 top-k와 히스토그램을 갱신"""
+        input_ids = np.asarray(input_ids, dtype=np.int64)
+        for name, values in activations.items():
+            values = np.asarray(values, dtype=np.float32)
+            if name not in self.layers:
+                self._init_layer(name, values)
+            state = self.layers[name]
+            self._update_top_k(state, values, input_ids)
+            self._update_histogram(state, values)
+            state['sum'] += values.sum(axis=0)
+        self.num_samples += len(input_ids)
+
+    def _update_top_k(self, state, values, input_ids):
+        # 기존 top-k와 새 배치를 이어 붙인 뒤 유닛별로 k개만 남김
+        candidates = np.concatenate([state['top_values'], values.T], axis=1)
+        candidate_ids = np.concatenate(
+            [state['top_ids'], np.broadcast_to(input_ids, (values.shape[1], len(input_ids)))], axis=1
+        )
+        keep = np.argpartition(-candidates, self.k - 1, axis=1)[:, :self.k]
+        top_values = np.take_along_axis(candidates, keep, axis=1)
+        top_ids = np.take_along_axis(candidate_ids, keep, axis=1)
+
+        # 조회가 O(k)가 되도록 항상 내림차순 정렬 상태 유지
+        order = np.argsort(-top_values, axis=1, kind='stable')
+        state['top_values'] = np.take_along_axis(top_values, order, axis=1)
+        state['top_ids'] = np.take_along_axis(top_ids, order, axis=1)
+
+    def _extend_edges(self, state, vmin, vmax):
+        """[vmin, vmax]가 들어가도록 구간 폭을 m배로 넓히고 기존 개수를 새 구간으로 합침
+
+        새 구간 경계가 기존 경계와 겹치도록(왼쪽으로 새 구간 t개만큼 확장) 잡으므로
+        기존 개수를 근사 없이 옮길 수 있음.
+        """
+        edges = state['edges']
+        lo, hi = float(edges[0]), float(edges[-1])
+        if vmin >= lo and vmax < hi:
+            return
+        if self.bins == 1:
+            width = max(hi, vmax) - min(lo, vmin)
+            state['edges'] = np.array([min(lo, vmin), max(hi, vmax) + width * 1e-6 + 1e-12])
+            return
+
+        width = (hi - lo) / self.bins
+        m = 2
+        while True:
+            t = max(0, math.ceil((lo - vmin) / (m * width)))
+            new_lo = lo - t * m * width
+            if new_lo <= vmin and new_lo + self.bins * m * width > vmax and t + math.ceil(self.bins / m) <= self.bins:
+                break
+            m *= 2
+
+        counts = np.zeros_like(state['counts'])
+        for i in range(self.bins):
+            counts[:, t + i // m] += state['counts'][:, i]
+        state['counts'] = counts
+        state['edges'] = new_lo + np.arange(self.bins + 1) * (m * width)
+
+    def _update_histogram(self, state, values):
+        finite = values[np.isfinite(values)]
+        if finite.size:
+            self._extend_edges(state, float(finite.min()), float(finite.max()))
+        edges = state['edges']
+        num_units = values.shape[1]
+        bin_idx = np.floor((values.T - edges[0]) / (edges[-1] - edges[0]) * self.bins).astype(np.int64)
+
+        state['underflow'] += (bin_idx < 0).sum(axis=1)
+        state['overflow'] += (bin_idx >= self.bins).sum(axis=1)
+
+        # 유닛 오프셋을 더해 한 번의 bincount로 모든 유닛의 히스토그램 누적
+        valid = (bin_idx >= 0) & (bin_idx < self.bins)
+        flat = (bin_idx + np.arange(num_units)[:, None] * self.bins)[valid]
+        state['counts'] += np.bincount(flat, minlength=num_units * self.bins).reshape(num_units, self.bins)
+
+    def query(self, layer, unit):
+        """특정 유닛의 top-k 입력과 히스토그램 반환"""
+        if layer not in self.layers:
+            raise AtlasError(f"알 수 없는 레이어입니다: {layer}")
+        state = self.layers[layer]
+        if not 0 <= unit < state['top_values'].shape[0]:
+            raise AtlasError(f"유닛 인덱스가 범위를 벗어났습니다: {unit}")
+
+        top_ids = state['top_ids'][unit]
+        valid = top_ids >= 0
+        return {
+            'layer': layer,
+            'unit': unit,
+            'top_k': [
+                {'input_id': int(i), 'value': float(v)}
+                for i, v in zip(top_ids[valid], state['top_values'][unit][valid])
+            ],
+            'histogram': {
+                'edges': state['edges'].tolist(),
+                'counts': state['counts'][unit].tolist(),
+                'underflow': int(state['underflow'][unit]),
+                'overflow': int(state['overflow'][unit])
+            },
+            'mean': float(state['sum'][unit] / max(self.num_samples, 1))
+        }
+
+    def summary(self):
+        return {
+            'k': self.k,
+            'bins': self.bins,
+            'num_samples': self.num_samples,
+            'layers': {name: int(state['top_values'].shape[0]) for name, state in self.layers.items()}
+        }
+
+    def save(self, path):
+        arrays = {'k': self.k, 'bins': self.bins, 'num_samples': self.num_samples}
+        for name, state in self.layers.items():
+            for key, value in state.items():
+                arrays[f'{name}/{key}'] = value
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        atlas = cls(k=int(data['k']), bins=int(data['bins']))
+        atlas.num_samples = int(data['num_samples'])
+        for key in data.files:
+            if '/' in key:
+                name, field = key.split('/', 1)
+                atlas.layers.setdefault(name, {})[field] = data[key]
+        return atlas
+
+
+def build_atlas(visualizer, sampler, num_samples, k=10, bins=32):
+    """데이터셋 전체를 역전파 없이 한 번 순전파하면서 아틀라스를 구성"""
+    atlas = ActivationAtlas(k=k, bins=bins)
+    seen = 0
+    while seen < num_samples:
+        input_batch, _, indices = sampler.next_with_indices()
+        atlas.update(visualizer.forward_activations(input_batch), indices)
+        seen += len(indices)
+    return atlas
+
+
+class AtlasRegistry:
+    """생성된 아틀라스를 디스크에 저장하고 최근에 사용한 것만 메모리에 캐시 (오래된 것부터 제거)"""
+
+    def __init__(self, root=ATLAS_ROOT, max_atlases=16):
+        self.root = root
+        self.max_atlases = max_atlases
+        self._atlases = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, atlas_id):
+        try:
+            uuid.UUID(atlas_id)
+        except (ValueError, TypeError):
+            raise AtlasError(f"잘못된 아틀라스 ID입니다: {atlas_id}")
+        return os.path.join(self.root, f'{atlas_id}.npz')
+
+    def _remember(self, atlas_id, atlas):
+        with self._lock:
+            self._atlases[atlas_id] = atlas
+            self._atlases.move_to_end(atlas_id)
+            while len(self._atlases) > self.max_atlases:
+                self._atlases.popitem(last=False)
+
+    def add(self, atlas):
+        atlas_id = str(uuid.uuid4())
+        atlas.save(self._path(atlas_id))
+        self._remember(atlas_id, atlas)
+        return atlas_id
+
+    def get(self, atlas_id):
+        path = self._path(atlas_id)
+        with self._lock:
+            if atlas_id in self._atlases:
+                self._atlases.move_to_end(atlas_id)
+                return self._atlases[atlas_id]
+        # 메모리에서 밀려난 아틀라스는 디스크에서 다시 읽음
+        if not os.path.exists(path):
+            raise AtlasError(f"아틀라스를 찾을 수 없습니다: {atlas_id}")
+        atlas = ActivationAtlas.load(path)
+        self._remember(atlas_id, atlas)
+        return atlas
@@ -0,0 +1,366 @@
+import sys
+import math
+import threading
+from collections import deque
+import numpy as np
+from tensor_pyramid import PYRAMID_MIN_ELEMENTS, DEFAULT_TILE_SIZE
+from gradient_history import COLUMNS as HISTORY_COLUMNS, DEFAULT_CAPACITY
+
+# 캡처 방식 ('full': 모든 반복 전체 기록, 'sampled': stride마다 전체 기록, 'summary': 손실/가중치/그래디언트만 기록)
+CAPTURE_LEVELS = ('full', 'sampled', 'summary')
+
+# 아래 크기는 tracemalloc으로 한 반복(배열 45개, 원소 약 300개)의 보관/직렬화 과정을 측정해 정한 값
+# (benchmark_capture.py --calibrate로 다시 확인 가능)
+# 배열 하나의 객체 크기 (ndarray 헤더, 원래 torch 텐서 객체, 딕셔너리 항목; 데이터 제외)
+ARRAY_OBJECT_BYTES = 288
+# 반복 하나의 딕셔너리들(섹션/레이어)과 스칼라 값의 크기
+ITERATION_OBJECT_BYTES = 4096
+# .tolist()가 만드는 원소 하나의 크기 (float 객체 24바이트 + 리스트 안의 포인터 8바이트)
+LIST_BYTES_PER_ELEMENT = 32
+# .tolist()가 만드는 리스트 객체 하나의 크기 (헤더와 초과 할당 포함)
+LIST_OBJECT_BYTES = 64
+# JSON으로 직렬화될 때 원소 하나가 차지하는 대략적인 바이트 수 (예: "-0.12345678901234567, ")
+JSON_BYTES_PER_ELEMENT = 24
+
+# 요청 하나가 실행할 수 있는 최대 반복 수 (기록 방식과 관계없이 계산 시간과 곡선 기록 크기를 제한)
+MAX_EPOCHS = 100000
+
+# 재생 실행이 반복마다 보관하는 입력/타겟 텐서 객체 두 개와 리스트 항목의 대략적인 크기 (배열 데이터 제외)
+REPLAY_STEP_OVERHEAD_BYTES = 512
+
+# 동시에 실행할 수 있는 실시간 학습 세션 수 (세션마다 학습 스레드 하나)
+DEFAULT_MAX_LIVE_SESSIONS = 4
+
+# 실시간 학습 세션이 동시에 메모리에 두는 반복 수 (계산 중인 반복 + 보관하는 최근 반복)
+LIVE_SESSION_ITERATIONS = 2
+
+# 실제 사용량/추정치 비율을 보관할 최근 요청 수
+HISTORY_SIZE = 64
+
+
+class AdmissionError(ValueError):
+    """메모리 예산 안에서 실행할 수 없는 요청일 때 발생하는 예외"""
+
+    def __init__(self, message, status=413):
+        super(AdmissionError, self).__init__(message)
+        self.status = status
+
+
+def _conv_out(size, kernel, stride=1):
+    return (size - kernel) // stride + 1
+
+
+def trace_layout(model, input_shape):
+    """run_iteration이 한 반복에 기록하는 텐서들의 (경로 -> (형태, 원소 크기)) 목록
+
+    실제로 실행하지 않고 모델 구성과 입력 형태만으로 계산함.
+    """
+    batch, channels, height, width = input_shape
+    conv, pool, fc = model.conv1, model.pool1, model.fc
+    kh, kw = conv.kernel_size
+    pool_k = pool.kernel_size if isinstance(pool.kernel_size, int) else pool.kernel_size[0]
+    pool_s = pool.stride if isinstance(pool.stride, int) else pool.stride[0]
+
+    oh, ow = _conv_out(height, kh), _conv_out(width, kw)
+    ph, pw = _conv_out(oh, pool_k, pool_s), _conv_out(ow, pool_k, pool_s)
+
+    inputs = (batch, channels, height, width)
+    conv_w = tuple(conv.weight.shape)
+    fc_w = tuple(fc.weight.shape)
+    fc_b = tuple(fc.bias.shape)
+    unfolded = (batch, channels * kh * kw, oh * ow)
+    weight_matrix = (conv.out_channels, channels * kh * kw)
+    conv_out = (batch, conv.out_channels, oh, ow)
+    pool_out = (batch, conv.out_channels, ph, pw)
+    flatten = (batch, conv.out_channels * ph * pw)
+    logits = (batch, fc.out_features)
+
+    f32, i64 = 4, 8
+    weights = {'conv1_weight': (conv_w, f32), 'fc_weight': (fc_w, f32), 'fc_bias': (fc_b, f32)}
+    layout = {'target': ((batch,), i64)}
+    for section in ('initial_weights', 'updated_weights'):
+        layout.update({f'{section}/{k}': v for k, v in weights.items()})
+    layout.update({
+        'gradients/conv1_weight_grad': (conv_w, f32),
+        'gradients/fc_weight_grad': (fc_w, f32),
+        'gradients/fc_bias_grad': (fc_b, f32)
+    })
+    for name, value in weights.items():
+        layout[f'weight_delta/{name}'] = value
+        layout[f'weight_delta/expected_{name}'] = value
+
+    # 'summary' 캡처는 여기까지만 기록
+    full = {
+        'input_data': (inputs, f32),
+        'forward/conv/input_tensor': (inputs, f32),
+        'forward/conv/weight_tensor': (conv_w, f32),
+        'forward/conv/unfolded_input': (unfolded, f32),
+        'forward/conv/weight_matrix': (weight_matrix, f32),
+        'forward/conv/output_tensor': (conv_out, f32),
+        'forward/relu/input_tensor': (conv_out, f32),
+        'forward/relu/output_tensor': (conv_out, f32),
+        'forward/relu/mask': (conv_out, f32),
+        'forward/pool/input_tensor': (conv_out, f32),
+        'forward/pool/output_tensor': (pool_out, f32),
+        'forward/pool/indices': (pool_out, i64),
+        'forward/fc/input_tensor': (flatten, f32),
+        'forward/fc/weight': (fc_w, f32),
+        'forward/fc/bias': (fc_b, f32),
+        'forward/fc/output': (logits, f32),
+        'backward/fc/output_grad': (logits, f32),
+        'backward/fc/input_grad': (flatten, f32),
+        'backward/fc/weight_grad': (fc_w, f32),
+        'backward/fc/bias_grad': (fc_b, f32),
+        'backward/fc/expected_input_grad': (flatten, f32),
+        'backward/pool/output_grad': (pool_out, f32),
+        'backward/pool/input_grad': (conv_out, f32),
+        'backward/relu/output_grad': (conv_out, f32),
+        'backward/relu/input_grad': (conv_out, f32),
+        'backward/relu/mask': (conv_out, f32),
+        'backward/relu/expected_input_grad': (conv_out, f32),
+        'backward/conv/output_grad': (conv_out, f32),
+        'backward/conv/weight_grad': (conv_w, f32)
+    }
+    return layout, full
+
+
+def _numel(shape):
+    return math.prod(shape)
+
+
+def _num_lists(shape):
+    """.tolist()가 만드는 (중첩) 리스트 객체 수 (형태 (a, b, c)면 1 + a + a*b)"""
+    return sum(math.prod(shape[:k]) for k in range(len(shape))) if shape else 0
+
+
+def _bytes_for(entries):
+    """보관되는 배열 객체 + .tolist() 객체 + JSON 문자열과 인코딩된 응답(직렬화 중 동시에 존재)"""
+    retained = 0
+    listed = 0
+    encoded = 0
+    for shape, itemsize in entries.values():
+        numel = _numel(shape)
+        retained += numel * itemsize + ARRAY_OBJECT_BYTES
+        # 큰 텐서는 피라미드 미리보기(가장 거친 레벨)만 직렬화됨
+        if numel >= PYRAMID_MIN_ELEMENTS:
+            side = min(DEFAULT_TILE_SIZE, max(shape[-1], 1))
+            shape = (max(1, DEFAULT_TILE_SIZE * DEFAULT_TILE_SIZE // side), side)
+            numel = _numel(shape)
+        listed += numel * LIST_BYTES_PER_ELEMENT + _num_lists(shape) * LIST_OBJECT_BYTES
+        encoded += numel * JSON_BYTES_PER_ELEMENT + _num_lists(shape) * 2
+    return retained + listed + 2 * encoded
+
+
+def estimate_iteration_bytes(model, input_shape, capture='full'):
+    """기록되는 한 반복이 직렬화가 끝날 때까지 차지하는 최대 바이트 수 추정
+
+    NumPy 배열(객체 포함), .tolist()로 만든 파이썬 리스트/float, JSON 문자열과 인코딩된 응답을 합산함.
+    """
+    summary, full = trace_layout(model, input_shape)
+    if capture == 'summary':
+        return ITERATION_OBJECT_BYTES + _bytes_for(summary)
+    return ITERATION_OBJECT_BYTES + _bytes_for(summary) + _bytes_for(full)
+
+
+def history_bytes(epochs):
+    """GradientHistory가 epochs개 반복을 기록할 때의 최대 크기 (용량을 두 배씩 늘리므로 최대 2배)"""
+    return 2 * max(int(epochs), DEFAULT_CAPACITY) * (len(HISTORY_COLUMNS) + 1) * 8
+
+
+def estimate_replay_bytes(model, input_shape, epochs, checkpoint_interval, cache_size):
+    """재생 실행(replay_store)이 보관할 입력/타겟과 체크포인트, 재생 캐시가 차지할 바이트 수 추정"""
+    summary, full = trace_layout(model, input_shape)
+    per_step = _numel(full['input_data'][0]) * full['input_data'][1]
+    per_step += _numel(summary['target'][0]) * summary['target'][1] + REPLAY_STEP_OVERHEAD_BYTES
+    per_checkpoint = sum(_numel(shape) * itemsize + ARRAY_OBJECT_BYTES
+                         for path, (shape, itemsize) in summary.items() if path.startswith('initial_weights/'))
+    cached = min(cache_size, epochs) * estimate_iteration_bytes(model, input_shape, 'full')
+    return (epochs * per_step + math.ceil(epochs / checkpoint_interval) * per_checkpoint + cached
+            + history_bytes(epochs))
+
+
+def trace_memory_bytes(value):
+    """반복 데이터나 직렬화용 객체(중첩 딕셔너리/리스트/NumPy 배열)가 실제로 차지하는 바이트 수
+
+    배열 데이터만 세는 nbytes와 달리 배열/딕셔너리/리스트/float 객체 자체의 크기도 포함함.
+    """
+    if isinstance(value, np.ndarray):
+        size = sys.getsizeof(value)
+        if not value.flags.owndata:
+            # torch 텐서에서 만든 배열은 데이터와 원래 텐서 객체를 따로 보관함
+            size += value.nbytes
+            if value.base is not None and not isinstance(value.base, np.ndarray):
+                size += sys.getsizeof(value.base)
+        return size
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(trace_memory_bytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        size = sys.getsizeof(value)
+        if value and isinstance(value[0], (int, float)) and not isinstance(value[0], bool):
+            # 숫자만 담은 가장 안쪽 리스트는 원소를 하나씩 확인하지 않음
+            return size + len(value) * sys.getsizeof(value[0])
+        return size + sum(trace_memory_bytes(v) for v in value)
+    return sys.getsizeof(value)
+
+
+def _check_epochs(epochs):
+    if epochs < 1:
+        raise AdmissionError("epochs는 1 이상이어야 합니다.", status=400)
+    if epochs > MAX_EPOCHS:
+        raise AdmissionError(f"epochs는 {MAX_EPOCHS} 이하여야 합니다.", status=400)
+
+
+class Admission:
+    """승인된 요청의 캡처 방식과 예약한 메모리"""
+
+    def __init__(self, capture, stride, estimated_bytes, epochs):
+        self.capture = capture
+        self.stride = stride
+        self.estimated_bytes = estimated_bytes
+        self.epochs = epochs
+        self.actual_bytes = None
+
+    def to_dict(self):
+        return {
+            'capture': self.capture,
+            'stride': self.stride,
+            'recorded_iterations': math.ceil(self.epochs / self.stride),
+            'estimated_bytes': self.estimated_bytes,
+            'actual_bytes': self.actual_bytes
+        }
+
+
+class AdmissionController:
+    """요청별/전체 메모리 예산에 따라 실행을 승인, 축소(샘플링/요약 캡처) 또는 거절
+
+    전체 예산은 진행 중인 요청의 예약량과 retained_bytes()가 반환하는 보관 중인 실행의 크기를 합산해 확인함.
+    """
+
+    def __init__(self, request_budget_bytes, global_budget_bytes, retained_bytes=None,
+                 max_live_sessions=DEFAULT_MAX_LIVE_SESSIONS):
+        self.request_budget_bytes = int(request_budget_bytes)
+        self.global_budget_bytes = int(global_budget_bytes)
+        self.retained_bytes = retained_bytes or (lambda: 0)
+        self.max_live_sessions = int(max_live_sessions)
+        self._in_flight = 0
+        self._live_sessions = 0
+        self._history = deque(maxlen=HISTORY_SIZE)
+        self._counts = {'admitted': 0, 'degraded': 0, 'rejected': 0}
+        self._lock = threading.Lock()
+
+    def plan(self, model, input_shape, epochs, budget):
+        """예산 안에 들어가는 가장 자세한 캡처 방식 결정 (없으면 None)
+
+        캡처 방식과 관계없이 모든 반복을 기록하는 GradientHistory 크기를 먼저 예산에서 뺌.
+        """
+        history = history_bytes(epochs)
+        budget -= history
+        per_iteration = estimate_iteration_bytes(model, input_shape, 'full')
+        if per_iteration * epochs <= budget:
+            return Admission('full', 1, per_iteration * epochs + history, epochs)
+        # 전체 기록 반복 수를 예산에 맞게 줄임 (최소 1개)
+        if per_iteration <= budget:
+            stride = math.ceil(epochs / (budget // per_iteration))
+            return Admission('sampled', stride, per_iteration * math.ceil(epochs / stride) + history, epochs)
+        per_summary = estimate_iteration_bytes(model, input_shape, 'summary')
+        if per_summary * epochs <= budget:
+            return Admission('summary', 1, per_summary * epochs + history, epochs)
+        return None
+
+    def _reject(self, budget, estimated_bytes):
+        """거절 횟수를 기록하고 AdmissionError 발생 (잠금을 잡은 상태에서 호출)"""
+        self._counts['rejected'] += 1
+        if budget < self.request_budget_bytes:
+            raise AdmissionError(
+                f"서버 메모리 예산이 부족합니다 (예상 {estimated_bytes / 2**20:.1f} MB, 남은 예산 {max(budget, 0) / 2**20:.1f} MB). "
+                "잠시 후 다시 시도하세요.", status=503
+            )
+        raise AdmissionError(
+            f"요청한 트레이스가 너무 큽니다 (예상 {estimated_bytes / 2**20:.1f} MB, 요청당 예산 "
+            f"{self.request_budget_bytes / 2**20:.1f} MB). epochs를 줄이거나 더 작은 입력을 사용하세요."
+        )
+
+    def _budget(self):
+        return min(self.request_budget_bytes, self.global_budget_bytes - self._in_flight - self.retained_bytes())
+
+    def admit(self, model, input_shape, epochs, allow_degrade=True):
+        """요청을 승인하고 추정 바이트를 예약 (불가능하면 AdmissionError)"""
+        _check_epochs(epochs)
+        with self._lock:
+            budget = self._budget()
+            admission = self.plan(model, input_shape, epochs, budget)
+
+            if admission is None or (admission.capture != 'full' and not allow_degrade):
+                self._reject(budget, estimate_iteration_bytes(model, input_shape, 'full') * epochs)
+
+            self._counts['admitted' if admission.capture == 'full' else 'degraded'] += 1
+            self._in_flight += admission.estimated_bytes
+            return admission
+
+    def admit_exact(self, model, input_shape, epochs, capture='full', stride=1):
+        """이미 정해진 캡처 방식 그대로 승인 (다른 워커의 실행 복원용, 축소 없음)"""
+        _check_epochs(epochs)
+        recorded = math.ceil(epochs / stride)
+        estimated = estimate_iteration_bytes(model, input_shape, capture) * recorded + history_bytes(epochs)
+        return self._reserve(Admission(capture, stride, estimated, epochs))
+
+    def admit_replay(self, model, input_shape, epochs, checkpoint_interval, cache_size):
+        """재생 실행의 기록을 승인 (체크포인트와 입력만 보관하므로 축소 없이 승인 또는 거절)"""
+        _check_epochs(epochs)
+        estimated = estimate_replay_bytes(model, input_shape, epochs, checkpoint_interval, cache_size)
+        return self._reserve(Admission('replay', 1, estimated, epochs))
+
+    def admit_live(self, model, input_shape):
+        """실시간 학습 세션 승인 (동시 세션 수 제한, 진행 중인 반복과 보관하는 반복 하나를 예약)"""
+        estimated = LIVE_SESSION_ITERATIONS * estimate_iteration_bytes(model, input_shape, 'full')
+        with self._lock:
+            if self._live_sessions >= self.max_live_sessions:
+                self._counts['rejected'] += 1
+                raise AdmissionError(
+                    f"실시간 학습 세션이 너무 많습니다 (최대 {self.max_live_sessions}개). 잠시 후 다시 시도하세요.",
+                    status=503
+                )
+            budget = self._budget()
+            if estimated > budget:
+                self._reject(budget, estimated)
+            self._counts['admitted'] += 1
+            self._in_flight += estimated
+            self._live_sessions += 1
+            return Admission('live', 1, estimated, 1)
+
+    def _reserve(self, admission):
+        with self._lock:
+            budget = self._budget()
+            if admission.estimated_bytes > budget:
+                self._reject(budget, admission.estimated_bytes)
+            self._counts['admitted'] += 1
+            self._in_flight += admission.estimated_bytes
+            return admission
+
+    def release(self, admission, actual_bytes=None):
+        """예약을 해제하고 실제 사용량을 추정치와 함께 기록"""
+        with self._lock:
+            self._in_flight -= admission.estimated_bytes
+            if admission.capture == 'live':
+                self._live_sessions -= 1
+            if actual_bytes is not None:
+                admission.actual_bytes = int(actual_bytes)
+                self._history.append((admission.estimated_bytes, admission.actual_bytes))
+
+    def stats(self):
+        with self._lock:
+            ratios = [actual / estimated for estimated, actual in self._history if estimated]
+            return {
+                'request_budget_bytes': self.request_budget_bytes,
+                'global_budget_bytes': self.global_budget_bytes,
+                'in_flight_bytes': self._in_flight,
+                'live_sessions': self._live_sessions,
+                'max_live_sessions': self.max_live_sessions,
+                'retained_bytes': self.retained_bytes(),
+                **self._counts,
+                'recent': [{'estimated_bytes': e, 'actual_bytes': a} for e, a in self._history],
+                'actual_to_estimate': {
+                    'mean': float(np.mean(ratios)) if ratios else None,
+                    'max': float(np.max(ratios)) if ratios else None
+                }
+            }
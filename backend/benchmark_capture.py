@@ -0,0 +1,205 @@
+import os
+import sys
+import json
+import time
+import pickle
+import argparse
+import tempfile
+import subprocess
+import numpy as np
+import torch
+from model import SimpleCNN
+from visualizer import ModelVisualizer
+from compiled_capture import CAPTURE_MODES, get_compiled_step
+
+
+def sample_data():
+    # main.py의 샘플 데이터와 같은 4x4 입력
+    input_data = torch.tensor([[[[1.0, 2.0, 1.0, 0.0],
+                               [0.0, -1.0, 0.0, 1.0],
+                               [-2.0, 1.0, -2.0, -2.0],
+                               [0.0, 1.0, 0.0, 1.0]]]], dtype=torch.float32)
+    target = torch.tensor([0], dtype=torch.long)
+    return input_data, target
+
+
+def time_mode(mode, epochs, repeat):
+    """지정한 캡처 모드로 epochs번 반복을 repeat회 실행하고 (반복당 시간 목록, 마지막 트레이스) 반환"""
+    input_data, target = sample_data()
+    timings = []
+    iterations = None
+    for _ in range(repeat):
+        visualizer = ModelVisualizer(SimpleCNN(), learning_rate=0.01, capture_mode=mode)
+        start = time.perf_counter()
+        for _ in range(epochs):
+            visualizer.run_iteration(input_data, target)
+        timings.append((time.perf_counter() - start) / epochs)
+        iterations = visualizer.iterations
+    return timings, iterations
+
+
+# 새 프로세스에서 main.py의 import/초기화/워밍업 시간과 첫 실행 vs 정상 상태 실행 시간을 측정
+STARTUP_SCRIPT = """
+import json, time
+begin = time.perf_counter()
+import main
+import_ms = (time.perf_counter() - begin) * 1000
+params = {'epochs': 1, 'dataset_id': None, 'shuffle': False, 'learning_rate': 0.01}
+runs = []
+for i in range(6):
+    start = time.perf_counter()
+    main.compute_run(params, f'startup-{i}')
+    runs.append((time.perf_counter() - start) * 1000)
+print('STARTUP ' + json.dumps({'import_main_ms': import_ms, **main.STARTUP_TIMINGS,
+                               'snapshot_from_disk': float(main.STARTUP_SNAPSHOT_SOURCE == 'disk'),
+                               'first_run_ms': runs[0], 'steady_run_ms': sorted(runs[1:])[2]}))
+"""
+
+
+# 새 프로세스에서 /api/visualize와 같은 계산/직렬화를 tracemalloc으로 측정해 admission의 추정치와 비교
+CALIBRATE_SCRIPT = """
+import sys, json, tracemalloc
+import main
+from admission import estimate_iteration_bytes, history_bytes, trace_memory_bytes
+epochs = int(sys.argv[1])
+params = {'epochs': epochs, 'dataset_id': None, 'shuffle': False, 'learning_rate': 0.01,
+          'capture_mode': 'eager', 'capture': 'full', 'capture_stride': 1}
+tracemalloc.start()
+run = main.compute_run(params, 'calibrate')
+retained = tracemalloc.get_traced_memory()[0]
+response = {'iterations': [main.serialize_iteration(it, run, i) for i, it in enumerate(run.iterations)]}
+text = json.dumps(response)
+payload = text.encode()
+peak = tracemalloc.get_traced_memory()[1]
+tracemalloc.stop()
+estimated = estimate_iteration_bytes(main.model, (1, *main.SimpleCNN.input_shape), 'full') * epochs + history_bytes(epochs)
+measured = run.nbytes + trace_memory_bytes(response) + sys.getsizeof(text) + sys.getsizeof(payload)
+print('CALIBRATE ' + json.dumps({'estimated': estimated, 'traced_peak': peak, 'traced_retained': retained,
+                                 'measured': measured}))
+"""
+
+
+def measure_memory(epochs):
+    """전체 캡처 실행의 tracemalloc 최대 사용량, 보관량, admission이 기록하는 실제 사용량과 추정치"""
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, CNN_VIS_WARMUP='0', CNN_VIS_TRACE_CACHE_DIR=tempfile.mkdtemp(prefix='cnn-vis-bench-'))
+    output = subprocess.run([sys.executable, '-c', CALIBRATE_SCRIPT, str(epochs)], cwd=backend_dir, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    line = next(l for l in output.splitlines() if l.startswith('CALIBRATE '))
+    return json.loads(line[len('CALIBRATE '):])
+
+
+def measure_startup(warmup, runs, saved_snapshot=True):
+    """워커를 새로 띄울 때의 시간 측정 (runs회 반복한 중앙값)
+
+    saved_snapshot이 False면 실행마다 빈 스냅샷 디렉터리를 써서 저장된 초기 가중치 파일이 없는 경우를 측정함.
+    """
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    snapshot_dir = tempfile.mkdtemp(prefix='cnn-vis-snapshot-')
+    if saved_snapshot:
+        # 측정 전에 스냅샷 파일을 한 번 만들어 둠
+        subprocess.run([sys.executable, '-c', 'import model; model.pristine_model()'], cwd=backend_dir,
+                       env=dict(os.environ, CNN_VIS_SNAPSHOT_DIR=snapshot_dir), check=True)
+    samples = []
+    for _ in range(runs):
+        env = dict(os.environ, CNN_VIS_WARMUP='1' if warmup else '0',
+                   CNN_VIS_TRACE_CACHE_DIR=tempfile.mkdtemp(prefix='cnn-vis-bench-'),
+                   CNN_VIS_SNAPSHOT_DIR=snapshot_dir if saved_snapshot else tempfile.mkdtemp(prefix='cnn-vis-snapshot-'))
+        output = subprocess.run([sys.executable, '-c', STARTUP_SCRIPT], cwd=backend_dir, env=env,
+                                capture_output=True, text=True, check=True).stdout
+        line = next(l for l in output.splitlines() if l.startswith('STARTUP '))
+        samples.append(json.loads(line[len('STARTUP '):]))
+    return {key: float(np.median([s.get(key, 0.0) for s in samples])) for key in samples[0]}
+
+
+def measure_model_construction(repeat=200):
+    """SimpleCNN() 생성과 직렬화 스냅샷 역직렬화의 시간 비교 (ms, 중앙값)"""
+    snapshot = pickle.dumps(SimpleCNN(), protocol=pickle.HIGHEST_PROTOCOL)
+    built, loaded = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        SimpleCNN()
+        built.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        pickle.loads(snapshot)
+        loaded.append((time.perf_counter() - start) * 1000)
+    return float(np.median(built)), float(np.median(loaded))
+
+
+def max_trace_difference(a, b):
+    """두 트레이스의 모든 텐서를 비교해 최대 절대 오차 반환"""
+    worst = 0.0
+    for it_a, it_b in zip(a, b):
+        for section in ('forward', 'backward', 'gradients', 'initial_weights', 'updated_weights'):
+            for name, value in it_a[section].items():
+                pairs = value.items() if isinstance(value, dict) else [(None, value)]
+                for key, array in pairs:
+                    other = it_b[section][name][key] if key is not None else it_b[section][name]
+                    if isinstance(array, np.ndarray):
+                        worst = max(worst, float(np.abs(array.astype(np.float64) - other).max()))
+        worst = max(worst, abs(it_a['loss'] - it_b['loss']))
+    return worst
+
+
+def main():
+    parser = argparse.ArgumentParser(description='eager 캡처와 컴파일된 캡처의 CPU 성능 비교')
+    parser.add_argument('--epochs', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--modes', default='eager,script', help=f"쉼표로 구분 ({', '.join(CAPTURE_MODES)})")
+    parser.add_argument('--startup-runs', type=int, default=3, help='시작 시간 측정 횟수 (0이면 생략)')
+    parser.add_argument('--calibrate-epochs', type=int, default=200,
+                        help='메모리 추정치 확인에 쓸 반복 수 (0이면 생략)')
+    args = parser.parse_args()
+
+    if args.calibrate_epochs > 0:
+        m = measure_memory(args.calibrate_epochs)
+        per = lambda key: m[key] / args.calibrate_epochs / 1024
+        print(f"memory per iteration ({args.calibrate_epochs} iterations, KB): estimated {per('estimated'):.1f}, "
+              f"traced peak {per('traced_peak'):.1f}, traced retained {per('traced_retained'):.1f}, "
+              f"measured (admission actual_bytes) {per('measured'):.1f}")
+        print(f"estimate / traced peak: {m['estimated'] / m['traced_peak']:.2f}")
+        print()
+
+    if args.startup_runs > 0:
+        print(f"{'startup':>18} {'imports':>9} {'init':>8} {'snapshot':>9} {'warm-up':>9} {'import main':>12} "
+              f"{'1st run':>9} {'steady':>9}  (ms, median of {args.startup_runs})")
+        for label, warmup, saved in (('cold, no snapshot', False, False), ('cold, snapshot', False, True),
+                                     ('warm, snapshot', True, True)):
+            t = measure_startup(warmup, args.startup_runs, saved_snapshot=saved)
+            print(f"{label:>18} {t['imports_ms']:>9.1f} {t['init_ms']:>8.1f} {t['snapshot_ms']:>9.2f} "
+                  f"{t.get('warmup_ms', 0.0):>9.1f} {t['import_main_ms']:>12.1f} "
+                  f"{t['first_run_ms']:>9.2f} {t['steady_run_ms']:>9.2f}")
+        built_ms, loaded_ms = measure_model_construction()
+        print(f"model construction: SimpleCNN() {built_ms:.3f} ms, pickle.loads(snapshot) {loaded_ms:.3f} ms")
+        print()
+
+    torch.set_num_threads(1)
+    modes = [m for m in args.modes.split(',') if m]
+    input_data, _ = sample_data()
+
+    results = {}
+    for mode in modes:
+        if mode != 'eager':
+            # 컴파일 비용은 한 번만 발생하므로 별도로 측정
+            start = time.perf_counter()
+            step = get_compiled_step(SimpleCNN(), input_data.shape, 0.01, mode)
+            compile_time = time.perf_counter() - start
+            if step is None:
+                print(f"{mode:>8}: unavailable, skipped")
+                continue
+            print(f"{mode:>8}: compile {compile_time * 1000:.1f} ms (once per model spec / input shape)")
+        timings, iterations = time_mode(mode, args.epochs, args.repeat)
+        results[mode] = (timings, iterations)
+
+    print(f"\n{'mode':>8} {'median ms/iter':>15} {'best ms/iter':>13} {'speedup':>8} {'max |diff|':>11}")
+    baseline_timings, baseline_iterations = results.get('eager', next(iter(results.values())))
+    baseline = float(np.median(baseline_timings))
+    for mode, (timings, iterations) in results.items():
+        median = float(np.median(timings))
+        diff = max_trace_difference(baseline_iterations, iterations)
+        print(f"{mode:>8} {median * 1000:>15.3f} {min(timings) * 1000:>13.3f} "
+              f"{baseline / median:>7.2f}x {diff:>11.2e}")
+
+
+if __name__ == '__main__':
+    main()
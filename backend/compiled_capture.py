@@ -0,0 +1,122 @@
+import threading
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+# 지원하는 캡처 모드 ('eager'는 기존 autograd + retain_grad 경로)
+CAPTURE_MODES = ('eager', 'script', 'compile')
+
+# (모델 구성, 입력 형태, 학습률, 모드) -> 컴파일된 스텝 캐시 (에포크와 요청 간 재사용)
+_compiled_cache = {}
+_cache_lock = threading.Lock()
+
+
+class CaptureStep(nn.Module):
+    """순전파, 손실, 역전파, SGD 업데이트를 명시적인 텐서 연산으로 수행하는 한 스텝
+
+    retain_grad 대신 모든 중간 결과와 그래디언트를 그래프 출력으로 반환하므로
+    TorchScript 추적이나 torch.compile로 한 번만 컴파일해 재사용할 수 있음.
+    """
+
+    def __init__(self, kernel_size, pool_kernel_size, pool_stride, learning_rate):
+        super(CaptureStep, self).__init__()
+        self.kernel_size = kernel_size
+        self.pool_kernel_size = pool_kernel_size
+        self.pool_stride = pool_stride
+        self.learning_rate = learning_rate
+
+    def forward(self, x, one_hot, conv_w, fc_w, fc_b):
+        batch_size = x.size(0)
+
+        # 순전파
+        unfolded = F.unfold(x, kernel_size=self.kernel_size)
+        weight_matrix = conv_w.reshape(conv_w.size(0), -1)
+        conv_out = F.conv2d(x, conv_w)
+        relu_mask = (conv_out > 0).to(x.dtype)
+        relu_out = F.relu(conv_out)
+        pool_out, indices = F.max_pool2d(relu_out, self.pool_kernel_size, self.pool_stride, return_indices=True)
+        flatten = pool_out.reshape(batch_size, -1)
+        fc_out = flatten @ fc_w.t() + fc_b
+
+        # CrossEntropyLoss (배치 평균)
+        log_probs = F.log_softmax(fc_out, dim=1)
+        loss = -(log_probs * one_hot).sum() / batch_size
+
+        # 역전파 (소프트맥스-크로스엔트로피 -> FC -> 평탄화 -> MaxPool -> ReLU -> Conv)
+        fc_output_grad = log_probs.exp() - one_hot
+        scaled_grad = fc_output_grad / batch_size
+        fc_w_grad = scaled_grad.t() @ flatten
+        fc_b_grad = scaled_grad.sum(0)
+        flatten_grad = scaled_grad @ fc_w
+        pool_out_grad = flatten_grad.reshape(pool_out.shape)
+        # 겹치는 풀링 창에서 같은 위치가 여러 번 선택될 수 있으므로 누적
+        relu_out_grad = torch.zeros_like(relu_out).flatten(2).scatter_add(
+            2, indices.flatten(2), pool_out_grad.flatten(2)
+        ).reshape(relu_out.shape)
+        conv_out_grad = relu_out_grad * relu_mask
+        conv_w_grad = (conv_out_grad.flatten(2) @ unfolded.transpose(1, 2)).sum(0).reshape(conv_w.shape)
+
+        # SGD 업데이트
+        new_conv_w = conv_w - self.learning_rate * conv_w_grad
+        new_fc_w = fc_w - self.learning_rate * fc_w_grad
+        new_fc_b = fc_b - self.learning_rate * fc_b_grad
+
+        return (unfolded, weight_matrix, conv_out, relu_mask, relu_out, pool_out, indices, flatten, fc_out,
+                loss, fc_output_grad, flatten_grad, pool_out_grad, relu_out_grad, conv_out_grad,
+                conv_w_grad, fc_w_grad, fc_b_grad, new_conv_w, new_fc_w, new_fc_b)
+
+
+def model_spec(model):
+    """컴파일 캐시 키로 쓰는 모델 구성 (지원하지 않는 구조면 None)"""
+    conv, pool, fc = getattr(model, 'conv1', None), getattr(model, 'pool1', None), getattr(model, 'fc', None)
+    if not isinstance(conv, nn.Conv2d) or not isinstance(pool, nn.MaxPool2d) or not isinstance(fc, nn.Linear):
+        return None
+    # 명시적 역전파는 bias 없는 stride 1, padding 0 합성곱만 다룸
+    if conv.bias is not None or conv.stride != (1, 1) or conv.padding != (0, 0) or conv.dilation != (1, 1):
+        return None
+    if pool.padding != 0 or pool.dilation != 1 or pool.ceil_mode:
+        return None
+    return (
+        conv.in_channels, conv.out_channels, conv.kernel_size,
+        pool.kernel_size, pool.stride,
+        fc.in_features, fc.out_features
+    )
+
+
+def get_compiled_step(model, input_shape, learning_rate, mode='script'):
+    """(모델 구성, 입력 형태)별로 한 번만 컴파일하고 캐시된 스텝을 반환 (불가능하면 None)"""
+    spec = model_spec(model)
+    if spec is None or mode not in ('script', 'compile'):
+        return None
+    key = (spec, tuple(input_shape), float(learning_rate), mode)
+
+    with _cache_lock:
+        if key in _compiled_cache:
+            return _compiled_cache[key]
+
+        step = CaptureStep(model.conv1.kernel_size, model.pool1.kernel_size, model.pool1.stride, learning_rate)
+        example = (
+            torch.zeros(input_shape),
+            torch.zeros(input_shape[0], model.fc.out_features),
+            model.conv1.weight.detach().clone(),
+            model.fc.weight.detach().clone(),
+            model.fc.bias.detach().clone()
+        )
+        try:
+            if mode == 'compile':
+                if not hasattr(torch, 'compile'):
+                    raise RuntimeError("torch.compile은 PyTorch 2.0 이상에서만 사용할 수 있습니다.")
+                compiled = torch.compile(step)
+                # torch.compile은 첫 호출 때 실제로 컴파일하므로 여기서 한 번 실행해
+                # 컴파일러 오류(C 컴파일러 없음, 지원하지 않는 연산 등)를 잡고 eager로 대체
+                with torch.no_grad():
+                    compiled(*example)
+            else:
+                with torch.no_grad():
+                    compiled = torch.jit.trace(step, example)
+        except Exception as e:
+            print(f"Compiled capture unavailable ({mode}): {e}; falling back to eager")
+            compiled = None
+
+        _compiled_cache[key] = compiled
+        return compiled
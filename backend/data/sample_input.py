@@ -1,6 +1,5 @@
 import torch
 import numpy as np
-import matplotlib.pyplot as plt
 
 # Generate sample input (4x4 image)
 def generate_sample_input():
@@ -17,6 +16,8 @@ def generate_sample_input():
 
 # Visualize the input
 def visualize_input(input_data):
+    # matplotlib은 그림을 저장할 때만 필요하므로 여기서 import (모듈 import 시간 단축)
+    import matplotlib.pyplot as plt
     plt.figure(figsize=(6, 6))
     plt.imshow(input_data[0, 0].numpy(), cmap='viridis')
     plt.colorbar()
@@ -0,0 +1,396 @@
+import os
+import json
+import uuid
+import queue
+import shutil
+import hashlib
+import threading
+from contextlib import contextmanager
+import numpy as np
+import torch
+import torch.nn.functional as F
+
+try:
+    import fcntl
+except ImportError:
+    # Windows에서는 프로세스 간 잠금 없이 스레드 잠금만 사용
+    fcntl = None
+
+# 데이터셋 저장 위치 (backend/output/datasets)
+DATASET_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'output', 'datasets')
+
+# 업로드 스트림을 읽을 때 한 번에 읽는 바이트 수 (파일 전체를 메모리에 올리지 않음)
+STREAM_CHUNK_BYTES = 1 << 20
+
+# 전처리 블록 하나가 사용할 메모리 예산 (블록의 샘플 수는 샘플 크기에 따라 정해짐)
+PREPROCESS_BLOCK_BYTES = 32 << 20
+
+# 정규화/리사이즈 중 블록 하나당 동시에 존재하는 float32 사본 수
+# (읽은 블록, 정규화 결과, 채널 평균 또는 리사이즈 결과, 출력 배열)
+PREPROCESS_BLOCK_COPIES = 4
+
+# 업로드 가능한 원본 데이터 타입
+SUPPORTED_DTYPES = {
+    'uint8': np.uint8,
+    'float32': np.float32
+}
+
+LABEL_DTYPE = np.int64
+
+
+class DatasetError(ValueError):
+    """데이터셋 요청이 잘못되었을 때 발생하는 예외"""
+    pass
+
+
+def _merge_ranges(ranges, start, end):
+    """수신한 바이트 구간 목록에 새 구간을 추가하고 겹치는 구간을 병합"""
+    merged = []
+    for s, e in sorted(ranges + [[start, end]]):
+        if merged and s <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], e)
+        else:
+            merged.append([s, e])
+    return merged
+
+
+class DatasetStore:
+    """청크 단위 업로드를 메모리 맵 파일에 바로 기록하는 데이터셋 저장소"""
+
+    def __init__(self, root=DATASET_ROOT):
+        self.root = root
+        self._lock = threading.Lock()
+        # 데이터셋별 전처리 잠금 (같은 프로세스의 스레드용, 프로세스 간에는 파일 잠금)
+        self._preprocess_locks = {}
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, dataset_id, filename):
+        # 경로 조작 방지를 위해 uuid 형식만 허용
+        try:
+            uuid.UUID(dataset_id)
+        except (ValueError, TypeError):
+            raise DatasetError(f"잘못된 데이터셋 ID입니다: {dataset_id}")
+        return os.path.join(self.root, dataset_id, filename)
+
+    def _read_meta(self, dataset_id):
+        path = self._path(dataset_id, 'meta.json')
+        if not os.path.exists(path):
+            raise DatasetError(f"데이터셋을 찾을 수 없습니다: {dataset_id}")
+        with open(path) as f:
+            return json.load(f)
+
+    @contextmanager
+    def _file_lock(self, dataset_id, filename):
+        """데이터셋 디렉터리의 잠금 파일로 다른 워커 프로세스와 배타적으로 실행"""
+        with open(self._path(dataset_id, filename), 'a') as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    @contextmanager
+    def _meta_lock(self, dataset_id):
+        """메타데이터 읽기-수정-쓰기 구간 잠금 (같은 프로세스의 스레드와 다른 워커 프로세스 모두)"""
+        with self._lock, self._file_lock(dataset_id, 'meta.lock'):
+            yield
+
+    @contextmanager
+    def _preprocess_lock(self, dataset_id):
+        """같은 데이터셋의 전처리를 한 번에 하나만 실행 (같은 파일에 동시에 쓰지 않도록)"""
+        with self._lock:
+            lock = self._preprocess_locks.setdefault(dataset_id, threading.Lock())
+        with lock, self._file_lock(dataset_id, 'preprocess.lock'):
+            yield
+
+    def _write_meta(self, dataset_id, meta):
+        path = self._path(dataset_id, 'meta.json')
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, path)
+
+    def create(self, num_samples, sample_shape, dtype='float32'):
+        """빈 데이터셋을 만들고 원본 데이터와 라벨용 메모리 맵 파일을 미리 할당"""
+        if dtype not in SUPPORTED_DTYPES:
+            raise DatasetError(f"지원하지 않는 데이터 타입입니다: {dtype}")
+        try:
+            if not isinstance(sample_shape, (list, tuple)):
+                raise TypeError(sample_shape)
+            num_samples = int(num_samples)
+            sample_shape = [int(s) for s in sample_shape]
+        except (TypeError, ValueError):
+            raise DatasetError("num_samples는 양수, sample_shape는 [채널, 높이, 너비] 형태여야 합니다.")
+        if num_samples <= 0 or len(sample_shape) != 3 or min(sample_shape) <= 0:
+            raise DatasetError("num_samples는 양수, sample_shape는 [채널, 높이, 너비] 형태여야 합니다.")
+
+        dataset_id = str(uuid.uuid4())
+        os.makedirs(os.path.join(self.root, dataset_id))
+        shape = (int(num_samples), *sample_shape)
+
+        # 희소 파일로 미리 할당 (실제 디스크/메모리는 쓰기 시점에 사용)
+        np.memmap(self._path(dataset_id, 'data.raw'), dtype=SUPPORTED_DTYPES[dtype], mode='w+', shape=shape).flush()
+        np.memmap(self._path(dataset_id, 'labels.raw'), dtype=LABEL_DTYPE, mode='w+', shape=(shape[0],)).flush()
+
+        meta = {
+            'dataset_id': dataset_id,
+            'num_samples': shape[0],
+            'sample_shape': sample_shape,
+            'dtype': dtype,
+            'data_bytes': int(np.prod(shape)) * np.dtype(SUPPORTED_DTYPES[dtype]).itemsize,
+            'label_bytes': shape[0] * np.dtype(LABEL_DTYPE).itemsize,
+            'received': {'data': [], 'labels': []},
+            'preprocessed': {}
+        }
+        self._write_meta(dataset_id, meta)
+        return meta
+
+    def info(self, dataset_id):
+        """업로드 진행 상황을 포함한 메타데이터 반환"""
+        meta = self._read_meta(dataset_id)
+        meta['complete'] = self._is_complete(meta, 'data')
+        meta['has_labels'] = self._is_complete(meta, 'labels')
+        return meta
+
+    def delete(self, dataset_id):
+        """데이터셋 디렉터리(원본, 라벨, 전처리 결과) 삭제 (진행 중인 전처리가 끝난 뒤)"""
+        self._read_meta(dataset_id)
+        with self._preprocess_lock(dataset_id):
+            shutil.rmtree(os.path.join(self.root, dataset_id))
+        with self._lock:
+            self._preprocess_locks.pop(dataset_id, None)
+
+    def _is_complete(self, meta, part):
+        total = meta['data_bytes'] if part == 'data' else meta['label_bytes']
+        return meta['received'][part] == [[0, total]]
+
+    def write_stream(self, dataset_id, part, offset, stream):
+        """요청 스트림을 고정 크기 청크로 읽어 메모리 맵의 지정 위치에 직접 기록"""
+        if part not in ('data', 'labels'):
+            raise DatasetError(f"알 수 없는 업로드 대상입니다: {part}")
+        meta = self._read_meta(dataset_id)
+        total = meta['data_bytes'] if part == 'data' else meta['label_bytes']
+        offset = int(offset)
+        if offset < 0 or offset >= total:
+            raise DatasetError(f"offset이 범위를 벗어났습니다: {offset}")
+
+        mm = np.memmap(self._path(dataset_id, f'{part}.raw'), dtype=np.uint8, mode='r+')
+        position = offset
+        try:
+            while True:
+                chunk = stream.read(STREAM_CHUNK_BYTES)
+                if not chunk:
+                    break
+                if position + len(chunk) > total:
+                    raise DatasetError("업로드한 데이터가 데이터셋 크기를 초과합니다.")
+                mm[position:position + len(chunk)] = np.frombuffer(chunk, dtype=np.uint8)
+                position += len(chunk)
+            mm.flush()
+        finally:
+            del mm
+
+        # 수신 구간 기록 (여러 워커 프로세스에서 청크가 동시에 올라올 수 있으므로 파일 잠금)
+        with self._meta_lock(dataset_id):
+            meta = self._read_meta(dataset_id)
+            if position > offset:
+                meta['received'][part] = _merge_ranges(meta['received'][part], offset, position)
+            self._write_meta(dataset_id, meta)
+        return position - offset
+
+    def _open_raw(self, meta):
+        shape = (meta['num_samples'], *meta['sample_shape'])
+        dtype = SUPPORTED_DTYPES[meta['dtype']]
+        return np.memmap(self._path(meta['dataset_id'], 'data.raw'), dtype=dtype, mode='r', shape=shape)
+
+    def _check_labels(self, meta, num_classes):
+        """업로드된 라벨이 모두 [0, num_classes) 범위인지 확인 (라벨이 아직 없으면 건너뜀)"""
+        if num_classes is None or not self._is_complete(meta, 'labels'):
+            return
+        labels = np.memmap(self._path(meta['dataset_id'], 'labels.raw'), dtype=LABEL_DTYPE, mode='r',
+                           shape=(meta['num_samples'],))
+        invalid = np.flatnonzero((labels < 0) | (labels >= num_classes))
+        if invalid.size:
+            raise DatasetError(
+                f"라벨은 0 이상 {num_classes} 미만이어야 합니다 (잘못된 라벨 {invalid.size}개, "
+                f"예: 샘플 {int(invalid[0])}의 라벨 {int(labels[invalid[0]])})."
+            )
+
+    def preprocess(self, dataset_id, input_shape, num_classes=None):
+        """정규화 + 모델 입력 크기로 리사이즈를 한 번만 수행하고 결과를 캐시
+
+        num_classes가 주어지면 업로드된 라벨 범위도 확인함.
+        """
+        meta = self._read_meta(dataset_id)
+        if not self._is_complete(meta, 'data'):
+            raise DatasetError("데이터 업로드가 아직 완료되지 않았습니다.")
+        self._check_labels(meta, num_classes)
+
+        input_shape = [int(s) for s in input_shape]
+        cache_key = hashlib.sha1(json.dumps({'shape': input_shape, 'normalize': 'mean_std'}).encode()).hexdigest()[:16]
+        if cache_key in meta['preprocessed']:
+            return meta['preprocessed'][cache_key]
+
+        with self._preprocess_lock(dataset_id):
+            # 기다리는 동안 다른 요청(또는 워커)이 전처리를 끝냈을 수 있음
+            meta = self._read_meta(dataset_id)
+            if cache_key in meta['preprocessed']:
+                return meta['preprocessed'][cache_key]
+            entry = self._preprocess_locked(meta, input_shape, cache_key)
+
+            with self._meta_lock(dataset_id):
+                meta = self._read_meta(dataset_id)
+                meta['preprocessed'][cache_key] = entry
+                self._write_meta(dataset_id, meta)
+        return entry
+
+    def _preprocess_locked(self, meta, input_shape, cache_key):
+        """정규화와 리사이즈 결과 파일을 작성하고 메타데이터 항목 반환 (_preprocess_lock 안에서 호출)"""
+        dataset_id = meta['dataset_id']
+        raw = self._open_raw(meta)
+        num_samples = meta['num_samples']
+        block_samples = _block_samples(meta['sample_shape'], input_shape)
+
+        # 1단계: 전체 평균/표준편차를 블록 단위로 누적 계산 (블록은 float32, 합계만 float64)
+        total, total_sq, count = 0.0, 0.0, 0
+        for start in range(0, num_samples, block_samples):
+            block = np.asarray(raw[start:start + block_samples], dtype=np.float32)
+            total += float(block.sum(dtype=np.float64))
+            total_sq += float(np.square(block).sum(dtype=np.float64))
+            count += block.size
+        mean = total / count
+        std = float(np.sqrt(max(total_sq / count - mean * mean, 0.0))) or 1.0
+
+        # 2단계: 정규화 및 리사이즈 결과를 새 메모리 맵에 기록
+        filename = f'preprocessed_{cache_key}.f32'
+        out_shape = (num_samples, *input_shape)
+        out = np.memmap(self._path(dataset_id, filename), dtype=np.float32, mode='w+', shape=out_shape)
+        for start in range(0, num_samples, block_samples):
+            block = torch.from_numpy(np.array(raw[start:start + block_samples], dtype=np.float32))
+            block.sub_(mean).div_(std)
+            out[start:start + block.shape[0]] = _resize_block(block, input_shape).numpy()
+        out.flush()
+        del out
+
+        return {
+            'file': filename,
+            'shape': list(out_shape),
+            'mean': mean,
+            'std': std
+        }
+
+    def open_preprocessed(self, dataset_id, input_shape, num_classes=None):
+        """전처리된 입력과 라벨을 읽기 전용 메모리 맵으로 반환"""
+        # 라벨은 전처리 이후에 올라올 수도 있으므로 열 때마다 확인
+        entry = self.preprocess(dataset_id, input_shape, num_classes)
+        inputs = np.memmap(self._path(dataset_id, entry['file']), dtype=np.float32, mode='r',
+                           shape=tuple(entry['shape']))
+        meta = self._read_meta(dataset_id)
+        if self._is_complete(meta, 'labels'):
+            labels = np.memmap(self._path(dataset_id, 'labels.raw'), dtype=LABEL_DTYPE, mode='r',
+                               shape=(meta['num_samples'],))
+        else:
+            # 라벨을 올리지 않은 경우 샘플 데이터와 동일하게 클래스 0 사용
+            labels = np.zeros(meta['num_samples'], dtype=LABEL_DTYPE)
+        return inputs, labels
+
+    def sampler(self, dataset_id, input_shape, batch_size=1, shuffle=False, seed=0, prefetch=4, num_classes=None):
+        """전처리된 메모리 맵에서 배치를 미리 읽어오는 샘플러 생성 (num_classes가 있으면 라벨 범위 확인)"""
+        inputs, labels = self.open_preprocessed(dataset_id, input_shape, num_classes)
+        return DatasetSampler(inputs, labels, batch_size=batch_size, shuffle=shuffle, seed=seed, prefetch=prefetch)
+
+
+def _block_samples(sample_shape, input_shape):
+    """PREPROCESS_BLOCK_BYTES 안에 들어가는 블록당 샘플 수 (최소 1개)"""
+    elements = max(int(np.prod(sample_shape)), int(np.prod(input_shape)))
+    return max(1, PREPROCESS_BLOCK_BYTES // (elements * 4 * PREPROCESS_BLOCK_COPIES))
+
+
+def _resize_block(block, input_shape):
+    """(N, C, H, W) 블록을 모델 입력 형태 (C', H', W')로 변환"""
+    channels, height, width = input_shape
+
+    # 채널 수가 다르면 채널 평균으로 맞춤 (예: RGB -> 흑백)
+    if block.shape[1] != channels:
+        block = block.mean(dim=1, keepdim=True).expand(-1, channels, -1, -1)
+
+    if block.shape[2:] == (height, width):
+        return block.contiguous()
+    if block.shape[2] >= height and block.shape[3] >= width:
+        # 축소는 영역 평균으로 계산해 앨리어싱 방지
+        return F.adaptive_avg_pool2d(block, (height, width))
+    return F.interpolate(block, size=(height, width), mode='bilinear', align_corners=False)
+
+
+class DatasetSampler:
+    """백그라운드 스레드가 메모리 맵에서 배치를 미리 읽어 큐에 쌓아두는 반복자"""
+
+    def __init__(self, inputs, labels, batch_size=1, shuffle=False, seed=0, prefetch=4):
+        self.inputs = inputs
+        self.labels = labels
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.seed = seed
+        self._queue = queue.Queue(maxsize=max(1, prefetch))
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._produce, daemon=True)
+        self._thread.start()
+
+    def _produce(self):
+        num_samples = len(self.inputs)
+        epoch = 0
+        try:
+            while not self._stop.is_set():
+                if self.shuffle:
+                    order = np.random.default_rng(self.seed + epoch).permutation(num_samples)
+                else:
+                    order = np.arange(num_samples)
+
+                for start in range(0, num_samples, self.batch_size):
+                    idx = order[start:start + self.batch_size]
+                    # 팬시 인덱싱으로 필요한 샘플만 복사
+                    batch = (
+                        torch.from_numpy(np.ascontiguousarray(self.inputs[idx])),
+                        torch.from_numpy(np.ascontiguousarray(self.labels[idx])),
+                        idx
+                    )
+                    if not self._put(batch):
+                        return
+                epoch += 1
+        except Exception as e:
+            self._put(e)
+
+    def _put(self, item):
+        # 소비자가 멈춘 경우 종료 신호를 확인하면서 대기
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        inputs, targets, _ = self.next_with_indices()
+        return inputs, targets
+
+    def next_with_indices(self):
+        """(입력, 타겟, 샘플 인덱스) 배치를 반환"""
+        item = self._queue.get()
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    def close(self):
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,191 @@
+import os
+import re
+import gzip
+import json
+import base64
+import argparse
+import numpy as np
+
+# React 빌드 결과 위치 (frontend에서 npm run build 실행 후 생성)
+DEFAULT_BUILD_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'frontend', 'build')
+
+# 내보내기 데이터가 들어가는 <script> 태그 ID (frontend/src/utils/exportedTrace.js와 동일)
+MANIFEST_ELEMENT_ID = 'cnn-vis-export'
+BLOB_ELEMENT_PREFIX = 'trace-blob-'
+
+SUPPORTED_FLOAT_DTYPES = ('float16', 'float32')
+
+# float16을 선택해도 반정밀도로 줄이는 텐서 (경로의 마지막 이름; 활성값과 그 그래디언트)
+# 가중치, 그래디언트, 가중치 변화량은 float16 간격(0.4 근처에서 약 2.4e-4)보다 작은 반복당 변화가
+# 사라지지 않도록 항상 float32로 저장함
+HALF_PRECISION_KEYS = frozenset((
+    'input_data', 'input_tensor', 'output_tensor', 'unfolded_input', 'output', 'mask',
+    'output_grad', 'input_grad', 'expected_input_grad'
+))
+
+# 타입 배열 뷰를 바로 만들 수 있도록 텐서 시작 위치를 정렬
+BLOB_ALIGNMENT = 8
+
+
+class ExportError(ValueError):
+    """HTML 내보내기에 필요한 빌드 파일이 없거나 옵션이 잘못된 경우"""
+    pass
+
+
+def _walk(value, path=''):
+    """반복 데이터를 ('경로', 값) 목록으로 평탄화 (딕셔너리만 재귀)"""
+    if isinstance(value, dict):
+        for key, child in value.items():
+            yield from _walk(child, f'{path}/{key}' if path else key)
+    else:
+        yield path, value
+
+
+def _float_dtype_for(path, float_dtype):
+    if float_dtype == 'float16' and path.rsplit('/', 1)[-1] in HALF_PRECISION_KEYS:
+        return 'float16'
+    return 'float32'
+
+
+def pack_iteration(iteration, float_dtype='float32'):
+    """한 반복의 텐서를 하나의 gzip 바이너리로 묶고 매니페스트 항목을 생성
+
+    float_dtype이 'float16'이면 활성값 텐서만 반정밀도로 저장함 (HALF_PRECISION_KEYS).
+    """
+    tensors = []
+    scalars = {}
+    chunks = []
+    offset = 0
+    for path, value in _walk(iteration):
+        if not isinstance(value, np.ndarray):
+            if value is not None:
+                scalars[path] = value.item() if isinstance(value, np.generic) else value
+            continue
+        # 실수 텐서는 지정한 정밀도로(가중치 관련 텐서는 항상 float32), 정수 텐서(인덱스, 타겟)는 int32로 저장
+        dtype = _float_dtype_for(path, float_dtype) if np.issubdtype(value.dtype, np.floating) else 'int32'
+        data = np.ascontiguousarray(value, dtype=np.dtype(dtype).newbyteorder('<')).tobytes()
+        padding = -len(data) % BLOB_ALIGNMENT
+        tensors.append({
+            'path': path,
+            'dtype': dtype,
+            'shape': list(value.shape),
+            'offset': offset,
+            'length': len(data)
+        })
+        chunks.append(data + b'\0' * padding)
+        offset += len(data) + padding
+
+    blob = gzip.compress(b''.join(chunks), compresslevel=9)
+    return {'tensors': tensors, 'scalars': scalars}, base64.b64encode(blob).decode('ascii')
+
+
+def pack_run(iterations, float_dtype='float32'):
+    """실행 전체를 매니페스트와 반복별 base64 청크 목록으로 변환
+
+    iterations는 반복 데이터를 하나씩 내주는 iterable이면 되며(예: run.iter_iterations()),
+    압축된 청크만 쌓이고 원본 반복 데이터는 하나씩 처리한 뒤 버려짐.
+    """
+    if float_dtype not in SUPPORTED_FLOAT_DTYPES:
+        raise ExportError(f"지원하지 않는 실수 타입입니다: {float_dtype}")
+    entries = []
+    blobs = []
+    for iteration in iterations:
+        entry, blob = pack_iteration(iteration, float_dtype)
+        entry['blob'] = f'{BLOB_ELEMENT_PREFIX}{len(blobs)}'
+        entries.append(entry)
+        blobs.append(blob)
+    return entries, blobs
+
+
+def _script_safe(text):
+    # 인라인 스크립트 안에서 태그가 닫히지 않도록 '</' 이스케이프
+    return text.replace('</', '<\\/')
+
+
+def _inline_assets(html, build_dir):
+    """index.html이 참조하는 CSS/JS 파일을 인라인으로 삽입
+
+    Web Worker 청크(mathWorker)는 포함하지 않음. 내보낸 페이지에서는 workerPool이 워커 대신
+    메인 스레드에서 커널을 실행함.
+    """
+    def read_asset(href):
+        path = os.path.join(build_dir, href.lstrip('/'))
+        if not os.path.exists(path):
+            raise ExportError(f"빌드 파일을 찾을 수 없습니다: {path}")
+        with open(path, encoding='utf-8') as f:
+            return f.read()
+
+    html = re.sub(
+        r'<link href="([^"]+\.css)" rel="stylesheet">',
+        lambda m: f'<style>{read_asset(m.group(1))}</style>',
+        html
+    )
+    # 인라인 스크립트에는 defer가 적용되지 않으므로 #root 뒤(</body> 앞)로 옮김
+    scripts = []
+    def collect_script(match):
+        scripts.append(f'<script>{_script_safe(read_asset(match.group(1)))}</script>')
+        return ''
+    html = re.sub(r'<script defer="defer" src="([^"]+\.js)"></script>', collect_script, html)
+    return html.replace('</body>', ''.join(scripts) + '</body>', 1)
+
+
+def render_html(manifest, blobs, build_dir=DEFAULT_BUILD_DIR):
+    """React 빌드와 매니페스트, 압축 텐서 청크를 하나의 HTML 문자열로 결합"""
+    index_path = os.path.join(build_dir, 'index.html')
+    if not os.path.exists(index_path):
+        raise ExportError("frontend/build/index.html이 없습니다. frontend에서 'npm run build'를 먼저 실행하세요.")
+    with open(index_path, encoding='utf-8') as f:
+        html = _inline_assets(f.read(), build_dir)
+
+    data_tags = [
+        f'<script id="{MANIFEST_ELEMENT_ID}" type="application/json">{_script_safe(json.dumps(manifest))}</script>'
+    ]
+    for i, blob in enumerate(blobs):
+        data_tags.append(f'<script id="{BLOB_ELEMENT_PREFIX}{i}" type="application/octet-stream">{blob}</script>')
+
+    # 앱 스크립트가 실행되기 전에 데이터가 DOM에 있도록 <head> 끝에 삽입
+    return html.replace('</head>', ''.join(data_tags) + '</head>', 1)
+
+
+def export_run(iterations, model_info, model_config, float_dtype='float32', build_dir=DEFAULT_BUILD_DIR):
+    """실행 데이터를 독립 실행형 HTML 문자열로 내보내기"""
+    entries, blobs = pack_run(iterations, float_dtype)
+    manifest = {
+        'version': 1,
+        'float_dtype': float_dtype,
+        'model_info': model_info,
+        'model_config': model_config,
+        'iterations': entries
+    }
+    return render_html(manifest, blobs, build_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='시각화 실행을 독립 실행형 HTML 파일로 내보내기')
+    parser.add_argument('--epochs', type=int, default=3)
+    parser.add_argument('--dataset-id', default=None)
+    parser.add_argument('--dtype', choices=SUPPORTED_FLOAT_DTYPES, default='float32',
+                        help='float16이면 활성값만 반정밀도로 저장 (가중치/그래디언트는 항상 float32)')
+    parser.add_argument('--build-dir', default=DEFAULT_BUILD_DIR)
+    parser.add_argument('--output', default='cnn_visualization.html')
+    args = parser.parse_args()
+
+    # API 서버와 같은 방식으로 실행을 계산 (서버를 띄우지는 않으므로 시작 시 워밍업은 생략)
+    os.environ.setdefault('CNN_VIS_WARMUP', '0')
+    from main import compute_run, trace_key, build_model_info, MODEL_CONFIG, visualizer
+    params = {
+        'epochs': args.epochs,
+        'dataset_id': args.dataset_id,
+        'shuffle': False,
+        'learning_rate': visualizer.learning_rate
+    }
+    run = compute_run(params, trace_key(params))
+
+    html = export_run(run.iter_iterations(), build_model_info(), MODEL_CONFIG, args.dtype, args.build_dir)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        f.write(html)
+    print(f"Exported {len(run)} iterations to {args.output} ({os.path.getsize(args.output) / 1024:.1f} KB)")
+
+
+if __name__ == '__main__':
+    main()
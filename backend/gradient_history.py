@@ -0,0 +1,159 @@
+import threading
+import numpy as np
+
+# 기록하는 학습 파라미터 (가중치 딕셔너리의 키)
+PARAMETERS = ('conv1_weight', 'fc_weight', 'fc_bias')
+
+# 출력 그래디언트 크기를 기록하는 레이어 (역전파 순서)
+LAYERS = ('fc', 'pool', 'relu', 'conv')
+
+# 열 이름 ('grad_norm/fc_weight'처럼 종류/대상 형태)
+COLUMNS = (
+    ('loss',)
+    + tuple(f'grad_norm/{name}' for name in PARAMETERS)
+    + tuple(f'update_ratio/{name}' for name in PARAMETERS)
+    + tuple(f'activation_grad_norm/{layer}' for layer in LAYERS)
+)
+
+# 처음 할당하는 행 수 (가득 차면 두 배로 늘림)
+DEFAULT_CAPACITY = 256
+
+
+class HistoryError(ValueError):
+    """존재하지 않는 열이나 잘못된 구간/점 개수를 요청했을 때 발생하는 예외"""
+    pass
+
+
+def _norm(array):
+    return float(np.sqrt(np.sum(np.square(array, dtype=np.float64))))
+
+
+def _json_values(array):
+    """JSON으로 보낼 수 있도록 유한하지 않은 값(NaN, inf)은 None으로 바꾼 리스트"""
+    finite = np.isfinite(array)
+    if finite.all():
+        return array.tolist()
+    return [value if ok else None for value, ok in zip(array.tolist(), finite.tolist())]
+
+
+class GradientHistory:
+    """반복마다의 손실, 파라미터별 그래디언트 크기, 업데이트 비율(|Δw|/|w|),
+    레이어별 출력 그래디언트 크기를 열 단위 NumPy 배열로 보관하는 기록
+
+    반복 딕셔너리 목록을 순회하지 않고 구간 조회와 다운샘플링을 한 번의 배열 연산으로 처리함.
+    캡처 범위나 간격과 관계없이 모든 반복을 기록함 (반복당 열 개수 x 8바이트).
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        capacity = max(1, int(capacity))
+        self._steps = np.empty(capacity, dtype=np.int64)
+        # 행: 열 이름, 열: 반복 (열 하나가 연속된 메모리에 놓이도록 배치)
+        self._values = np.empty((len(COLUMNS), capacity), dtype=np.float64)
+        self._index = {name: i for i, name in enumerate(COLUMNS)}
+        self._length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def capacity(self):
+        return self._steps.shape[0]
+
+    @property
+    def nbytes(self):
+        return self._steps.nbytes + self._values.nbytes
+
+    def _grow(self):
+        capacity = self.capacity * 2
+        steps = np.empty(capacity, dtype=np.int64)
+        values = np.empty((len(COLUMNS), capacity), dtype=np.float64)
+        steps[:self._length] = self._steps[:self._length]
+        values[:, :self._length] = self._values[:, :self._length]
+        self._steps, self._values = steps, values
+
+    def append(self, iteration_data):
+        """run_iteration이 만든 반복 데이터 하나를 기록 (캡처 범위로 잘라내기 전의 전체 데이터)"""
+        row = [iteration_data['loss']]
+        row += [_norm(iteration_data['gradients'][f'{name}_grad']) for name in PARAMETERS]
+        for name in PARAMETERS:
+            weight = _norm(iteration_data['initial_weights'][name])
+            delta = _norm(iteration_data['weight_delta'][name])
+            row.append(delta / weight if weight else float('nan'))
+        row += [_norm(iteration_data['backward'][layer]['output_grad']) for layer in LAYERS]
+
+        with self._lock:
+            if self._length == self.capacity:
+                self._grow()
+            self._steps[self._length] = iteration_data['step']
+            self._values[:, self._length] = row
+            self._length += 1
+
+    def _columns(self, columns):
+        if columns is None:
+            return list(COLUMNS)
+        unknown = [name for name in columns if name not in self._index]
+        if unknown:
+            raise HistoryError(f"알 수 없는 열입니다: {', '.join(unknown)} (가능한 열: {', '.join(COLUMNS)})")
+        return list(columns)
+
+    def _bounds(self, start, stop):
+        """반복 번호(step) 구간 [start, stop)을 배열 인덱스 구간으로 변환 (step은 증가 순서로 기록됨)"""
+        steps = self._steps[:self._length]
+        lo = 0 if start is None else int(np.searchsorted(steps, start, side='left'))
+        hi = self._length if stop is None else int(np.searchsorted(steps, stop, side='left'))
+        return lo, max(lo, hi)
+
+    def range(self, start=None, stop=None, columns=None):
+        """반복 번호 구간 [start, stop)의 곡선들을 (steps, {열: 값 배열}) 형태로 반환"""
+        names = self._columns(columns)
+        with self._lock:
+            lo, hi = self._bounds(start, stop)
+            steps = self._steps[lo:hi].copy()
+            rows = self._values[[self._index[name] for name in names], lo:hi]
+        return steps, dict(zip(names, rows))
+
+    def downsample(self, num_points, start=None, stop=None, columns=None):
+        """구간의 각 곡선을 최대 num_points개 점으로 줄여 반환 (최소/최대 솎아내기)
+
+        구간을 num_points // 2개 구간으로 나누고 각 구간의 최솟값과 최댓값을 반복 순서대로 남기므로
+        점 개수를 줄여도 급격한 튐(스파이크)이 사라지지 않음. 열마다 반복 번호가 다르므로
+        {열: (steps, values)} 형태로 반환함.
+        """
+        num_points = int(num_points)
+        if num_points < 2:
+            raise HistoryError("num_points는 2 이상이어야 합니다.")
+        steps, curves = self.range(start, stop, columns)
+        count = len(steps)
+        if count <= num_points:
+            return {name: (steps, values) for name, values in curves.items()}
+
+        buckets = num_points // 2
+        edges = np.linspace(0, count, buckets + 1).astype(np.int64)
+        bucket_ids = np.repeat(np.arange(buckets), np.diff(edges))
+        # 같은 구간 안에서 값 순서로 정렬하면 구간의 첫 원소가 최솟값, 마지막 원소가 최댓값
+        first, last = edges[:-1], edges[1:] - 1
+
+        result = {}
+        for name, values in curves.items():
+            order = np.lexsort((values, bucket_ids))
+            picks = np.stack([order[first], order[last]], axis=1)
+            picks.sort(axis=1)
+            picks = picks.ravel()
+            result[name] = (steps[picks], values[picks])
+        return result
+
+    def to_dict(self, num_points=None, start=None, stop=None, columns=None):
+        """API 응답용 딕셔너리 (num_points가 있으면 다운샘플링한 곡선)"""
+        if num_points is None:
+            steps, curves = self.range(start, stop, columns)
+            series = {name: {'steps': steps.tolist(), 'values': _json_values(values)}
+                      for name, values in curves.items()}
+        else:
+            series = {name: {'steps': steps.tolist(), 'values': _json_values(values)}
+                      for name, (steps, values) in self.downsample(num_points, start, stop, columns).items()}
+        return {
+            'length': len(self),
+            'columns': list(COLUMNS),
+            'series': series
+        }
@@ -0,0 +1,133 @@
+import json
+import threading
+from collections import deque
+import numpy as np
+from run_registry import lookup_path, RunError
+
+# 느린 클라이언트를 위해 병합해 두는 손실 기록의 최대 길이
+MAX_MERGED_LOSSES = 512
+
+# 세션 하나가 실행할 수 있는 최대 반복 수 (max_iterations를 주지 않으면 이 값까지 실행)
+MAX_LIVE_ITERATIONS = 100000
+
+# 반복 사이의 최소 대기 시간 (초, 세션 하나가 CPU 코어 하나를 계속 점유하지 않도록)
+MIN_LIVE_INTERVAL = 0.005
+
+
+class FrameBuffer:
+    """클라이언트별 프레임 버퍼: 최신 프레임 하나만 보관하고 밀린 프레임은 병합/폐기
+
+    학습 루프는 offer()가 절대 대기하지 않으므로 네트워크에 막히지 않고,
+    연결당 메모리는 프레임 하나와 고정 길이 손실 기록으로 제한됨.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._latest = None
+        self._losses = deque(maxlen=MAX_MERGED_LOSSES)
+        self._dropped = 0
+        self._closed = False
+
+    def offer(self, frame):
+        with self._condition:
+            if self._latest is not None:
+                # 아직 전송되지 않은 프레임은 버리고 손실값만 병합
+                self._dropped += 1
+            self._latest = frame
+            self._losses.append([frame['iteration'], frame['loss']])
+            self._condition.notify()
+
+    def take(self, timeout=None):
+        """새 프레임이 올 때까지 기다렸다가 병합된 프레임 반환 (시간 초과/종료 시 None)"""
+        with self._condition:
+            if self._latest is None and not self._closed:
+                self._condition.wait(timeout)
+            if self._latest is None:
+                return None
+            frame = dict(self._latest)
+            frame['losses'] = list(self._losses)
+            frame['dropped'] = self._dropped
+            self._latest = None
+            self._losses.clear()
+            self._dropped = 0
+            return frame
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    @property
+    def closed(self):
+        return self._closed
+
+
+def build_frame(index, iteration, fields):
+    """반복 데이터에서 손실, 그래디언트 노름, 요청한 텐서만 뽑은 압축 프레임 생성"""
+    frame = {
+        'iteration': index,
+        'loss': iteration['loss'],
+        'grad_norms': {
+            name: float(np.linalg.norm(grad)) for name, grad in iteration['gradients'].items()
+        },
+        'tensors': {}
+    }
+    for path in fields:
+        try:
+            value = lookup_path(iteration, path)
+        except RunError:
+            continue
+        frame['tensors'][path] = value.tolist() if isinstance(value, np.ndarray) else value
+    return frame
+
+
+class LiveTrainingSession:
+    """백그라운드 스레드에서 학습을 계속 돌리며 프레임을 버퍼에 밀어넣는 세션"""
+
+    def __init__(self, visualizer, next_sample, fields=(), interval=0.0, max_iterations=None):
+        self.visualizer = visualizer
+        self.next_sample = next_sample
+        self.fields = list(fields)
+        self.interval = max(float(interval), MIN_LIVE_INTERVAL)
+        self.max_iterations = MAX_LIVE_ITERATIONS if max_iterations is None else min(max_iterations, MAX_LIVE_ITERATIONS)
+        # 학습 스레드에서 발생한 예외 메시지 (스트림에 error 이벤트로 전송)
+        self.error = None
+        self.buffer = FrameBuffer()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        index = 0
+        try:
+            while not self._stop.is_set() and index < self.max_iterations:
+                input_data, target = self.next_sample()
+                iteration = self.visualizer.run_iteration(input_data, target)
+                self.buffer.offer(build_frame(index, iteration, self.fields))
+                index += 1
+                self._stop.wait(self.interval)
+        except Exception as e:
+            self.error = str(e) or type(e).__name__
+        finally:
+            self.buffer.close()
+
+    def frames(self, keepalive=15.0):
+        """SSE 이벤트 문자열을 생성 (프레임이 없으면 주기적으로 keep-alive 주석 전송)"""
+        while True:
+            frame = self.buffer.take(timeout=keepalive)
+            if frame is None:
+                if self.buffer.closed:
+                    if self.error is not None:
+                        yield f'event: error\ndata: {json.dumps({"error": self.error})}\n\n'
+                    yield 'event: end\ndata: {}\n\n'
+                    return
+                yield ': keepalive\n\n'
+                continue
+            yield f'data: {json.dumps(frame)}\n\n'
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=1.0)
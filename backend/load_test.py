@@ -0,0 +1,345 @@
+import os
+import sys
+import json
+import time
+import random
+import socket
+import argparse
+import tempfile
+import threading
+import subprocess
+import urllib.error
+import urllib.request
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def read_rss_mb(pid):
+    """/proc/<pid>/status의 VmRSS (MB, 읽을 수 없으면 None)"""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+class HttpClient:
+    """로컬에서 띄운 서버에 urllib으로 요청 (응답: 상태 코드, 본문 바이트, 헤더)"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+
+    def request(self, method, path, body=None, content_type='application/json'):
+        if body is not None and not isinstance(body, bytes):
+            body = json.dumps(body).encode()
+        req = urllib.request.Request(self.base_url + path, data=body, method=method,
+                                     headers={'Content-Type': content_type} if body is not None else {})
+        try:
+            with urllib.request.urlopen(req, timeout=300) as resp:
+                return resp.status, resp.read(), dict(resp.headers)
+        except urllib.error.HTTPError as e:
+            return e.code, e.read(), dict(e.headers)
+
+
+class TestClient:
+    """Flask 테스트 클라이언트로 같은 프로세스 안에서 요청 (스레드마다 클라이언트 생성)"""
+
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+
+    def request(self, method, path, body=None, content_type='application/json'):
+        if not hasattr(self._local, 'client'):
+            self._local.client = self.app.test_client()
+        if body is not None and not isinstance(body, bytes):
+            body = json.dumps(body).encode()
+        resp = self._local.client.open(path, method=method, data=body, content_type=content_type)
+        return resp.status_code, resp.get_data(), dict(resp.headers)
+
+
+def start_server(port, cache_dir):
+    """backend/main.py의 앱을 디버그 리로더 없이 별도 프로세스로 실행하고 준비될 때까지 대기"""
+    env = dict(os.environ, CNN_VIS_TRACE_CACHE_DIR=cache_dir)
+    code = f"import main; main.app.run(host='127.0.0.1', port={port}, threaded=True)"
+    proc = subprocess.Popen([sys.executable, '-c', code], cwd=BACKEND_DIR, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    client = HttpClient(f'http://127.0.0.1:{port}')
+    deadline = time.time() + 120
+    delay = 0.1
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"서버 프로세스가 종료되었습니다 (exit code {proc.returncode})")
+        try:
+            if client.request('GET', '/api/model_info')[0] == 200:
+                return proc, client
+        except OSError:
+            pass
+        # 연결 실패와 200이 아닌 응답 모두 점점 길게 기다렸다가 다시 확인
+        time.sleep(delay)
+        delay = min(delay * 2, 2.0)
+    proc.kill()
+    raise RuntimeError("서버가 제한 시간 안에 시작되지 않았습니다.")
+
+
+def create_dataset(client, size, num_samples=64, seed=0):
+    """size x size 크기의 합성 데이터셋을 업로드하고 전처리까지 마친 뒤 (ID, 전처리 시간 초) 반환
+
+    전처리(finalize)에서 모델 입력 크기(4x4)로 한 번 리사이즈되므로 입력 크기는 업로드/전처리 비용에만
+    영향을 주고, 이후 요청마다의 계산량은 크기와 관계없이 같음.
+    """
+    status, body, _ = client.request('POST', '/api/datasets', {
+        'num_samples': num_samples, 'sample_shape': [1, size, size], 'dtype': 'float32'
+    })
+    if status != 201:
+        raise RuntimeError(f"데이터셋 생성 실패 ({status}): {body[:200]!r}")
+    dataset_id = json.loads(body)['dataset_id']
+    try:
+        return dataset_id, _upload_and_finalize(client, dataset_id, size, num_samples, seed)
+    except Exception:
+        delete_dataset(client, dataset_id)
+        raise
+
+
+def _upload_and_finalize(client, dataset_id, size, num_samples, seed):
+    rng = np.random.default_rng(seed)
+    data = rng.standard_normal((num_samples, 1, size, size), dtype=np.float32)
+    labels = rng.integers(0, 2, num_samples).astype(np.int64)
+    for part, array in (('data', data), ('labels', labels)):
+        status, body, _ = client.request('PUT', f'/api/datasets/{dataset_id}/{part}?offset=0',
+                                      array.tobytes(), content_type='application/octet-stream')
+        if status != 200:
+            raise RuntimeError(f"데이터셋 업로드 실패 ({status}): {body[:200]!r}")
+    start = time.perf_counter()
+    status, body, _ = client.request('POST', f'/api/datasets/{dataset_id}/finalize')
+    elapsed = time.perf_counter() - start
+    if status != 200:
+        raise RuntimeError(f"데이터셋 전처리 실패 ({status}): {body[:200]!r}")
+    return elapsed
+
+
+def delete_dataset(client, dataset_id):
+    """부하 테스트가 만든 데이터셋 삭제 (실패해도 정리 과정을 멈추지 않음)"""
+    try:
+        status, body, _ = client.request('DELETE', f'/api/datasets/{dataset_id}')
+    except OSError as e:
+        status, body = None, str(e).encode()
+    if status != 204:
+        print(f"warning: dataset {dataset_id} was not deleted ({status}): {body[:200]!r}", file=sys.stderr)
+
+
+class RssSampler(threading.Thread):
+    """일정 간격으로 서버 프로세스 RSS를 기록"""
+
+    def __init__(self, pid, interval):
+        super(RssSampler, self).__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.samples = []
+        self._stop_event = threading.Event()
+        self._start = time.perf_counter()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            rss = read_rss_mb(self.pid)
+            if rss is not None:
+                self.samples.append((time.perf_counter() - self._start, rss))
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def build_workload(args, dataset_ids, rng):
+    """요청 목록 생성 ((이름, 메서드, 경로, 본문) - 에포크/입력 크기 조합을 무작위로 섞음)"""
+    epochs_mix = [int(e) for e in args.epochs.split(',')]
+    workload = []
+    for _ in range(args.requests):
+        if rng.random() < args.model_info_ratio:
+            workload.append(('model_info', 'GET', '/api/model_info', None))
+            continue
+        size = rng.choice(list(dataset_ids))
+        epochs = rng.choice(epochs_mix)
+        # trace_cache=false면 서버가 공유 캐시를 건너뛰므로 같은 파라미터 조합도 매번 실제로 계산함
+        body = {'epochs': epochs, 'dataset_id': dataset_ids[size], 'shuffle': args.shuffle,
+                'trace_cache': args.trace_cache}
+        workload.append((f'run_visualization[{size}x{size}, {epochs} ep]', 'POST', '/api/run_visualization', body))
+    return workload
+
+
+def run_load(client, workload, concurrency):
+    """concurrency개의 스레드로 요청 목록을 처리하고 (이름, 상태, 지연 시간) 목록과 전체 소요 시간 반환
+
+    공유 트레이스 캐시에서 바로 응답한 요청(X-Trace-Cache: hit)은 이름에 ' [cache hit]'를 붙여 따로 집계함.
+    """
+    results = []
+    lock = threading.Lock()
+    queue = list(reversed(workload))
+
+    def worker():
+        while True:
+            with lock:
+                if not queue:
+                    return
+                name, method, path, body = queue.pop()
+            start = time.perf_counter()
+            try:
+                status, _, headers = client.request(method, path, body)
+                if headers.get('X-Trace-Cache') == 'hit':
+                    name += ' [cache hit]'
+            except Exception:
+                status = None
+            elapsed = time.perf_counter() - start
+            with lock:
+                results.append((name, status, elapsed))
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, time.perf_counter() - start
+
+
+def summarize(results, wall_time):
+    """엔드포인트별/전체 처리량, 지연 시간 백분위, 오류율"""
+    groups = {'all': results}
+    for name in sorted({r[0] for r in results}):
+        groups[name] = [r for r in results if r[0] == name]
+
+    summary = {}
+    for name, rows in groups.items():
+        latencies = np.array([r[2] for r in rows]) * 1000
+        errors = sum(1 for r in rows if r[1] is None or r[1] >= 400)
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(rows) else (0, 0, 0)
+        summary[name] = {
+            'requests': len(rows),
+            'cache_hits': sum(1 for r in rows if r[0].endswith(' [cache hit]')),
+            'throughput_rps': len(rows) / wall_time if wall_time > 0 else 0.0,
+            'p50_ms': float(p50),
+            'p95_ms': float(p95),
+            'p99_ms': float(p99),
+            'max_ms': float(latencies.max()) if len(rows) else 0.0,
+            'error_rate': errors / len(rows) if rows else 0.0
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='백엔드 API 부하 테스트 (처리량, 지연 시간 백분위, 오류율, RSS)')
+    parser.add_argument('--mode', choices=('server', 'test-client'), default='server',
+                        help='server: main.py를 별도 프로세스로 실행, test-client: Flask 테스트 클라이언트')
+    parser.add_argument('--url', default=None, help='이미 실행 중인 서버 주소 (지정하면 서버를 띄우지 않음)')
+    parser.add_argument('--server-pid', type=int, default=None, help='--url 사용 시 RSS를 측정할 서버 PID')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--epochs', default='1,3,10', help='요청마다 무작위로 고를 에포크 수 (쉼표로 구분)')
+    parser.add_argument('--input-sizes', default='0,28,64',
+                        help='업로드할 합성 데이터셋 한 변 크기 (0은 내장 4x4 샘플). 전처리에서 4x4로 리사이즈되므로 '
+                             '크기는 업로드/전처리 시간에만 영향을 주고 요청당 계산량은 같음')
+    parser.add_argument('--model-info-ratio', type=float, default=0.2)
+    parser.add_argument('--shuffle', action='store_true', help='데이터셋 샘플 순서 섞기')
+    parser.add_argument('--trace-cache', action='store_true',
+                        help='공유 트레이스 캐시 사용 허용 (기본값은 요청마다 캐시를 건너뛰어 실제 계산 비용 측정)')
+    parser.add_argument('--warmup', type=int, default=5, help='측정 전에 보낼 요청 수')
+    parser.add_argument('--rss-interval', type=float, default=0.5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', default=None, help='결과를 JSON 파일로 저장')
+    parser.add_argument('--max-p95-ms', type=float, default=None, help='전체 p95가 이 값을 넘으면 실패 (exit 1)')
+    parser.add_argument('--max-error-rate', type=float, default=None, help='전체 오류율이 이 값을 넘으면 실패 (exit 1)')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    proc = None
+    client = None
+    datasets = {}
+    # 실행마다 빈 트레이스 캐시를 사용해 이전 실행의 캐시 적중이 결과에 섞이지 않도록 함 (끝나면 삭제)
+    cache_tmp = tempfile.TemporaryDirectory(prefix='cnn-vis-load-')
+    cache_dir = cache_tmp.name
+
+    try:
+        if args.url:
+            client, pid = HttpClient(args.url.rstrip('/')), args.server_pid
+        elif args.mode == 'server':
+            proc, client = start_server(free_port(), cache_dir)
+            pid = proc.pid
+        else:
+            os.environ['CNN_VIS_TRACE_CACHE_DIR'] = cache_dir
+            sys.path.insert(0, BACKEND_DIR)
+            import main as backend_main
+            client, pid = TestClient(backend_main.app), os.getpid()
+
+        sizes = [int(s) for s in args.input_sizes.split(',')]
+        for size in sizes:
+            datasets[size] = create_dataset(client, size, seed=args.seed) if size else (None, 0.0)
+        dataset_ids = {size: dataset_id for size, (dataset_id, _) in datasets.items()}
+
+        for name, method, path, body in build_workload(argparse.Namespace(**{**vars(args), 'requests': args.warmup}),
+                                                       dataset_ids, rng):
+            client.request(method, path, body)
+
+        sampler = RssSampler(pid, args.rss_interval) if pid else None
+        if sampler:
+            sampler.start()
+        results, wall_time = run_load(client, build_workload(args, dataset_ids, rng), args.concurrency)
+        if sampler:
+            sampler.stop()
+    finally:
+        # 만든 데이터셋을 서버를 종료하기 전에 삭제하고 트레이스 캐시 디렉터리 정리
+        for dataset_id, _ in datasets.values():
+            if dataset_id:
+                delete_dataset(client, dataset_id)
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=30)
+        cache_tmp.cleanup()
+
+    summary = summarize(results, wall_time)
+    rss = sampler.samples if sampler else []
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}, {wall_time:.2f} s, "
+          f"trace cache {'on' if args.trace_cache else 'bypassed'}, {summary['all']['cache_hits']} cache hits")
+    for size, (dataset_id, finalize_s) in datasets.items():
+        if dataset_id:
+            print(f"dataset {size}x{size}: finalize (resize to model input) {finalize_s * 1000:.1f} ms")
+    print(f"{'endpoint':<52} {'reqs':>5} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'err %':>6}")
+    for name, row in summary.items():
+        print(f"{name:<52} {row['requests']:>5} {row['throughput_rps']:>8.2f} {row['p50_ms']:>9.1f} "
+              f"{row['p95_ms']:>9.1f} {row['p99_ms']:>9.1f} {row['error_rate'] * 100:>6.1f}")
+    if rss:
+        values = [mb for _, mb in rss]
+        print(f"\nserver RSS: start {values[0]:.1f} MB, peak {max(values):.1f} MB, end {values[-1]:.1f} MB")
+        # 시간에 따른 RSS를 최대 10개 지점으로 요약
+        step = max(1, len(rss) // 10)
+        print('  ' + ', '.join(f"{t:.1f}s {mb:.1f}MB" for t, mb in rss[::step]))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'args': vars(args), 'wall_time_s': wall_time, 'summary': summary,
+                       'dataset_finalize_s': {str(size): t for size, (dataset_id, t) in datasets.items() if dataset_id},
+                       'rss_mb': [{'t': t, 'rss_mb': mb} for t, mb in rss]}, f, indent=2)
+
+    # 성능 작업의 게이트로 쓸 수 있도록 기준 초과 시 실패 코드 반환
+    failed = []
+    if args.max_p95_ms is not None and summary['all']['p95_ms'] > args.max_p95_ms:
+        failed.append(f"p95 {summary['all']['p95_ms']:.1f} ms > {args.max_p95_ms} ms")
+    if args.max_error_rate is not None and summary['all']['error_rate'] > args.max_error_rate:
+        failed.append(f"error rate {summary['all']['error_rate']:.3f} > {args.max_error_rate}")
+    if failed:
+        print('\nFAILED: ' + '; '.join(failed))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
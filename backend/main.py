@@ -1,18 +1,84 @@
+import os
+import sys
+import time
+
+# 워커 시작 시간 측정 (벤치마크 출력에 사용)
+_startup_begin = time.perf_counter()
+STARTUP_TIMINGS = {}
+
 import torch
 import numpy as np
 import json
-from flask import Flask, jsonify, request
+import hashlib
+import threading
+from flask import Flask, Response, jsonify, request, stream_with_context
 from flask_cors import CORS
-from model import SimpleCNN
+from model import SimpleCNN, pristine_model, pristine_snapshot_source
 from visualizer import ModelVisualizer
+from dataset_store import DatasetStore, DatasetError
+from activation_atlas import AtlasRegistry, AtlasError, build_atlas
+from run_registry import RunRegistry, RunError
+from tensor_pyramid import is_large_tensor, PyramidError
+from shared_trace_cache import SharedTraceCache
+from compiled_capture import CAPTURE_MODES
+from admission import AdmissionController, AdmissionError, trace_memory_bytes
+from replay_store import ReplayRun, record_replay_run, DEFAULT_CHECKPOINT_INTERVAL, DEFAULT_REPLAY_CACHE_SIZE
+from gradient_history import HistoryError
+from trace_diff import diff_iterations, diff_runs, diff_weight_update
+from live_feed import LiveTrainingSession, MAX_LIVE_ITERATIONS
+from export_html import export_run, ExportError
+
+STARTUP_TIMINGS['imports_ms'] = (time.perf_counter() - _startup_begin) * 1000
 
 app = Flask(__name__)
 CORS(app)  # 크로스 오리진 요청 허용
 
-# CNN 모델 및 시각화 도구 초기화
-model = SimpleCNN()
+# CNN 모델 및 시각화 도구 초기화 (초기 가중치 스냅샷은 이전 워커가 저장한 파일이 있으면 그것을 읽음)
+_snapshot_begin = time.perf_counter()
+model = pristine_model()
+STARTUP_TIMINGS['snapshot_ms'] = (time.perf_counter() - _snapshot_begin) * 1000
+STARTUP_SNAPSHOT_SOURCE = pristine_snapshot_source()
 visualizer = ModelVisualizer(model, learning_rate=0.01)
 
+# 사용자 데이터셋 저장소
+dataset_store = DatasetStore()
+
+# 활성화 아틀라스 저장소
+atlas_registry = AtlasRegistry()
+
+# 최근 시각화 실행 보관소 (피라미드 타일 조회 등에 사용)
+run_registry = RunRegistry()
+
+# 트레이스 메모리 예산 (요청당 / 진행 중인 요청과 보관 중인 실행 전체)
+admission = AdmissionController(
+    request_budget_bytes=int(os.environ.get('CNN_VIS_REQUEST_BUDGET_MB', 256)) * 1024 * 1024,
+    global_budget_bytes=int(os.environ.get('CNN_VIS_GLOBAL_BUDGET_MB', 1024)) * 1024 * 1024,
+    retained_bytes=run_registry.nbytes,
+    max_live_sessions=int(os.environ.get('CNN_VIS_MAX_LIVE_SESSIONS', 4))
+)
+
+# 트레이스 내용과 직렬화 형식을 결정하는 모듈 (코드가 바뀌면 캐시 키와 인덱스 버전이 달라짐)
+TRACE_CODE_MODULES = ('main.py', 'model.py', 'visualizer.py', 'compiled_capture.py',
+                      'replay_store.py', 'dataset_store.py', 'tensor_pyramid.py')
+
+def _trace_code_version():
+    """재배포 후 /dev/shm에 남은 이전 코드의 트레이스를 쓰지 않도록 모듈 소스로 만든 버전"""
+    digest = hashlib.sha1(torch.__version__.encode())
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in TRACE_CODE_MODULES:
+        with open(os.path.join(backend_dir, name), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:8]
+
+TRACE_CODE_VERSION = _trace_code_version()
+
+# 워커 프로세스 간 공유되는 직렬화 트레이스 캐시
+trace_cache = SharedTraceCache(
+    directory=os.environ.get('CNN_VIS_TRACE_CACHE_DIR'),
+    capacity_bytes=int(os.environ.get('CNN_VIS_TRACE_CACHE_MB', 512)) * 1024 * 1024,
+    version=int(TRACE_CODE_VERSION, 16)
+)
+
 # 샘플 데이터 생성
 def create_sample_data():
     # 4x4 입력 이미지 (배치 크기 1, 채널 1)
@@ -26,91 +92,436 @@ def create_sample_data():
     
     return input_data, target
 
+# 시각화 응답에 포함되는 모델 구성
+MODEL_CONFIG = {
+    'conv1': {
+        'in_channels': 1,
+        'out_channels': 1,
+        'kernel_size': 2,
+        'padding': 0
+    },
+    'pool1': {
+        'kernel_size': 2,
+        'stride': 1
+    },
+    'fc': {
+        'in_features': 4,
+        'out_features': 2
+    }
+}
+
+def serialize_iteration(iteration, run=None, index=None):
+    """반복 데이터의 NumPy 배열을 리스트로 변환 (큰 텐서는 피라미드 요약으로 대체)"""
+    def convert(value, path):
+        if not isinstance(value, np.ndarray):
+            return value
+        if run is not None and is_large_tensor(value):
+            return run.pyramid(index, path).summary(path)
+        return value.tolist()
+    
+    serializable_iteration = {}
+    
+    # 기본 정보 (step은 샘플링 캡처에서 원래 반복 번호)
+    serializable_iteration['step'] = iteration.get('step')
+    serializable_iteration['learning_rate'] = iteration['learning_rate']
+    serializable_iteration['loss'] = iteration['loss']
+    
+    # 입력 데이터 및 타겟 ('summary' 캡처에는 입력이 없음)
+    if 'input_data' in iteration:
+        serializable_iteration['input_data'] = convert(iteration['input_data'], 'input_data')
+    serializable_iteration['target'] = iteration['target'].tolist()
+    
+    # 초기 가중치, 업데이트된 가중치, 그래디언트
+    for section in ('initial_weights', 'updated_weights', 'gradients'):
+        serializable_iteration[section] = {
+            k: convert(v, f'{section}/{k}') for k, v in iteration[section].items()
+        }
+    
+    # 순전파/역전파 계산
+    for section in ('forward', 'backward'):
+        if section not in iteration:
+            continue
+        serializable_iteration[section] = {}
+        for layer_name, layer_data in iteration[section].items():
+            serializable_iteration[section][layer_name] = {
+                k: convert(v, f'{section}/{layer_name}/{k}')
+                for k, v in layer_data.items() if v is not None
+            }
+    
+    return serializable_iteration
+
+def trace_key(params):
+    """실행 파라미터와 코드 버전으로부터 결정적인 실행 ID 생성 (같은 파라미터는 같은 트레이스)"""
+    return hashlib.sha1((TRACE_CODE_VERSION + json.dumps(params, sort_keys=True)).encode()).hexdigest()
+
+def compute_replay_run(params, run_id):
+    """체크포인트와 입력만 저장하는 재생 실행을 기록하고 레지스트리에 등록"""
+    def record(next_sample):
+        return record_replay_run(run_id, next_sample, params['epochs'], params['learning_rate'],
+                                 checkpoint_interval=params['checkpoint_interval'],
+                                 capture_mode=params.get('capture_mode', 'eager'),
+                                 cache_size=params.get('cache_size', DEFAULT_REPLAY_CACHE_SIZE),
+                                 meta=params)
+    
+    if params['dataset_id']:
+        sampler = dataset_store.sampler(params['dataset_id'], SimpleCNN.input_shape,
+                                        shuffle=params['shuffle'], num_classes=SimpleCNN.num_classes)
+        with sampler:
+            run = record(lambda: next(sampler))
+    else:
+        sample = create_sample_data()
+        run = record(lambda: sample)
+    
+    return run_registry.register(run)
+
+def compute_run(params, run_id):
+    """파라미터에 따라 초기 가중치에서 시작하는 실행을 계산하고 레지스트리에 등록"""
+    if params.get('checkpoint_interval'):
+        return compute_replay_run(params, run_id)
+    
+    run_visualizer = ModelVisualizer(pristine_model(), learning_rate=params['learning_rate'],
+                                     capture_mode=params.get('capture_mode', 'eager'),
+                                     capture=params.get('capture', 'full'),
+                                     capture_stride=params.get('capture_stride', 1),
+                                     record_history=True)
+    
+    if params['dataset_id']:
+        # 업로드된 데이터셋에서 샘플러로 입력 공급
+        sampler = dataset_store.sampler(params['dataset_id'], SimpleCNN.input_shape,
+                                        shuffle=params['shuffle'], num_classes=SimpleCNN.num_classes)
+        with sampler:
+            iterations = run_visualizer.run_sampler(sampler, params['epochs'])
+    else:
+        # 샘플 데이터 생성
+        input_data, target = create_sample_data()
+        
+        # 시각화 실행
+        iterations = run_visualizer.run_epochs(input_data, target, params['epochs'])
+    
+    return run_registry.add(iterations, params, run_id=run_id,
+                            gradient_history=run_visualizer.gradient_history)
+
+def get_or_restore_run(run_id):
+    """다른 워커가 만든 실행이면 공유 캐시에 저장된 파라미터로 다시 계산"""
+    try:
+        return run_registry.get(run_id)
+    except RunError:
+        cached = trace_cache.get('params:' + run_id)
+        if cached is None:
+            raise
+        with cached:
+            params = json.loads(bytes(cached.view))
+        # 다시 계산할 때도 메모리 예산을 거침 (저장된 캡처 방식 그대로 승인하거나 AdmissionError)
+        ticket = admit_params(params)
+        run = None
+        try:
+            run = compute_run(params, run_id)
+        finally:
+            admission.release(ticket, run.nbytes if run is not None else None)
+        return run
+
+def admit_params(params):
+    """실행 파라미터(일반 실행 또는 재생 실행) 그대로 계산할 수 있는지 메모리 예산 확인 후 예약"""
+    input_shape = (1, *SimpleCNN.input_shape)
+    if params.get('checkpoint_interval'):
+        return admission.admit_replay(model, input_shape, params['epochs'], params['checkpoint_interval'],
+                                      params.get('cache_size', DEFAULT_REPLAY_CACHE_SIZE))
+    return admission.admit_exact(model, input_shape, params['epochs'], params.get('capture', 'full'),
+                                 params.get('capture_stride', 1))
+
+def cached_response(cached):
+    """공유 캐시 항목을 복사 없이 스트리밍하는 응답 (본문 전송 전에 연결이 끊겨도 참조 해제)"""
+    response = Response(cached.iter_chunks(), mimetype='application/json', headers={'X-Trace-Cache': 'hit'})
+    # 제너레이터가 시작되지 않으면 iter_chunks의 finally가 실행되지 않으므로 응답 종료 시에도 해제
+    response.call_on_close(cached.close)
+    return response
+
+@app.errorhandler(AdmissionError)
+def handle_admission_error(e):
+    # 실행 복원(get_or_restore_run) 중 예산을 넘으면 해당 상태 코드(413/503)로 응답
+    return jsonify({'error': str(e)}), e.status
+
 @app.route('/api/run_visualization', methods=['POST'])
 def run_visualization():
     # 요청에서 에포크 수 가져오기 (기본값 3)
     data = request.json
-    num_epochs = data.get('epochs', 3)
+    params = {
+        'epochs': data.get('epochs', 3),
+        'dataset_id': data.get('dataset_id'),
+        'shuffle': data.get('shuffle', False),
+        'learning_rate': visualizer.learning_rate,
+        'capture_mode': data.get('capture_mode', 'eager')
+    }
+    if params['capture_mode'] not in CAPTURE_MODES:
+        return jsonify({'error': f"capture_mode는 {', '.join(CAPTURE_MODES)} 중 하나여야 합니다."}), 400
+    if not isinstance(params['epochs'], int) or isinstance(params['epochs'], bool):
+        return jsonify({'error': "epochs는 정수여야 합니다."}), 400
+    # trace_cache=false면 공유 캐시의 응답을 쓰지도 저장하지도 않음 (부하 테스트에서 실제 계산 비용 측정용)
+    use_cache = data.get('trace_cache', True)
+    if not isinstance(use_cache, bool):
+        return jsonify({'error': "trace_cache는 true 또는 false여야 합니다."}), 400
+    cache_header = {'X-Trace-Cache': 'miss' if use_cache else 'bypass'}
     
-    # 샘플 데이터 생성
-    input_data, target = create_sample_data()
+    # 다른 워커가 이미 계산한 전체 트레이스는 공유 세그먼트에서 바로 전송 (축소 여부와 관계없이 가장 자세한 결과)
+    cached = trace_cache.get('response:' + trace_key(dict(params, capture='full', capture_stride=1))) if use_cache else None
+    if cached is not None:
+        return cached_response(cached)
     
-    # 시각화 실행
-    iterations = visualizer.run_epochs(input_data, target, num_epochs)
+    # 계산을 시작하기 전에 트레이스 크기를 추정해 승인/축소/거절
+    try:
+        ticket = admission.admit(model, (1, *SimpleCNN.input_shape), params['epochs'],
+                                 allow_degrade=data.get('allow_degrade', True))
+    except AdmissionError as e:
+        return jsonify({'error': str(e)}), e.status
+    # 캡처 결정을 키에 포함해 일시적인 메모리 부족으로 축소된 트레이스가 전체 트레이스 자리를 차지하지 않도록 함
+    run_params = dict(params, capture=ticket.capture, capture_stride=ticket.stride)
+    run_id = trace_key(run_params)
     
-    # NumPy 배열을 리스트로 변환하여 JSON으로 직렬화 가능하게 변환
-    serializable_iterations = []
+    if use_cache and ticket.capture != 'full':
+        cached = trace_cache.get('response:' + run_id)
+        if cached is not None:
+            admission.release(ticket)
+            return cached_response(cached)
     
-    for iteration in iterations:
-        serializable_iteration = {}
-        
-        # 기본 정보
-        serializable_iteration['learning_rate'] = iteration['learning_rate']
-        serializable_iteration['loss'] = iteration['loss']
-        
-        # 입력 데이터 및 타겟
-        serializable_iteration['input_data'] = iteration['input_data'].tolist()
-        serializable_iteration['target'] = iteration['target'].tolist()
-        
-        # 초기 가중치
-        serializable_iteration['initial_weights'] = {
-            k: v.tolist() for k, v in iteration['initial_weights'].items()
-        }
+    # 요청마다 초기 가중치에서 시작하는 독립된 실행으로 처리
+    actual_bytes = None
+    try:
+        run = compute_run(run_params, run_id)
         
-        # 업데이트된 가중치
-        serializable_iteration['updated_weights'] = {
-            k: v.tolist() for k, v in iteration['updated_weights'].items()
-        }
-        
-        # 그래디언트
-        serializable_iteration['gradients'] = {
-            k: v.tolist() for k, v in iteration['gradients'].items()
-        }
-        
-        # 순전파 계산
-        serializable_iteration['forward'] = {}
-        for layer_name, layer_data in iteration['forward'].items():
-            serializable_iteration['forward'][layer_name] = {
-                k: v.tolist() if isinstance(v, np.ndarray) else v
-                for k, v in layer_data.items()
-            }
-        
-        # 역전파 계산
-        serializable_iteration['backward'] = {}
-        for layer_name, layer_data in iteration['backward'].items():
-            serializable_iteration['backward'][layer_name] = {
-                k: v.tolist() if isinstance(v, np.ndarray) else v
-                for k, v in layer_data.items() if v is not None
-            }
-        
-        serializable_iterations.append(serializable_iteration)
-    
-    # 반환 데이터
-    response_data = {
-        'iterations': serializable_iterations,
-        'model_config': {
-            'conv1': {
-                'in_channels': 1,
-                'out_channels': 1,
-                'kernel_size': 2,
-                'padding': 0
-            },
-            'pool1': {
-                'kernel_size': 2,
-                'stride': 1
-            },
-            'fc': {
-                'in_features': 4,
-                'out_features': 2
-            }
+        # 반환 데이터
+        response_data = {
+            'run_id': run.run_id,
+            'capture': ticket.to_dict(),
+            'iterations': [serialize_iteration(it, run, i) for i, it in enumerate(run.iterations)],
+            'model_config': MODEL_CONFIG
         }
+        text = json.dumps(response_data)
+        payload = text.encode()
+        # 직렬화가 끝난 시점에 함께 존재하는 객체들의 실제 크기 (보관 트레이스 + 리스트 변환 결과 + JSON 문자열 + 응답)
+        actual_bytes = (run.nbytes + trace_memory_bytes(response_data)
+                        + sys.getsizeof(text) + sys.getsizeof(payload))
+        del text
+    except DatasetError as e:
+        return jsonify({'error': str(e)}), 400
+    finally:
+        # 예약을 해제하고 실제 사용량을 추정치와 함께 기록
+        admission.release(ticket, actual_bytes)
+    
+    trace_cache.put('params:' + run_id, json.dumps(run_params).encode())
+    if use_cache:
+        trace_cache.put('response:' + run_id, payload)
+    return Response(payload, mimetype='application/json', headers=cache_header)
+
+@app.route('/api/admission', methods=['GET'])
+def get_admission_stats():
+    # 메모리 예산, 예약량, 최근 요청의 추정치 대비 실제 사용량
+    return jsonify(admission.stats())
+
+@app.route('/api/replay_runs', methods=['POST'])
+def create_replay_run():
+    # 전체 트레이스 대신 K 반복마다의 체크포인트와 입력만 저장하는 실행 생성
+    data = request.json or {}
+    params = {
+        'epochs': data.get('epochs', 3),
+        'dataset_id': data.get('dataset_id'),
+        'shuffle': data.get('shuffle', False),
+        'learning_rate': visualizer.learning_rate,
+        'capture_mode': data.get('capture_mode', 'eager'),
+        'checkpoint_interval': data.get('checkpoint_interval', DEFAULT_CHECKPOINT_INTERVAL),
+        'cache_size': data.get('cache_size', DEFAULT_REPLAY_CACHE_SIZE)
     }
+    if params['capture_mode'] not in CAPTURE_MODES:
+        return jsonify({'error': f"capture_mode는 {', '.join(CAPTURE_MODES)} 중 하나여야 합니다."}), 400
+    for key in ('epochs', 'checkpoint_interval', 'cache_size'):
+        if not isinstance(params[key], int) or isinstance(params[key], bool) or params[key] < 1:
+            return jsonify({'error': f"{key}는 1 이상의 정수여야 합니다."}), 400
+    run_id = trace_key(params)
+    
+    try:
+        run = run_registry.get(run_id)
+    except RunError:
+        # 기록 전에 입력/체크포인트/재생 캐시 크기를 추정해 요청당/전체 예산 확인
+        try:
+            ticket = admit_params(params)
+        except AdmissionError as e:
+            return jsonify({'error': str(e)}), e.status
+        run = None
+        try:
+            run = compute_run(params, run_id)
+        except DatasetError as e:
+            return jsonify({'error': str(e)}), 400
+        finally:
+            admission.release(ticket, run.nbytes if run is not None else None)
     
-    return jsonify(response_data)
+    trace_cache.put('params:' + run_id, json.dumps(params).encode())
+    return jsonify({'run_id': run_id, **run.stats()})
 
-@app.route('/api/model_info', methods=['GET'])
-def get_model_info():
-    return jsonify({
+@app.route('/api/runs/<run_id>/iterations/<int:index>', methods=['GET'])
+def get_run_iteration(run_id, index):
+    # 반복 하나만 조회 (재생 실행이면 가장 가까운 체크포인트부터 다시 계산)
+    try:
+        run = get_or_restore_run(run_id)
+        start = time.perf_counter()
+        iteration = run.iteration(index)
+        elapsed = time.perf_counter() - start
+        result = serialize_iteration(iteration, run, index)
+    except RunError as e:
+        return jsonify({'error': str(e)}), 404
+    except DatasetError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    result['elapsed_ms'] = elapsed * 1000
+    if isinstance(run, ReplayRun):
+        result['replay'] = run.stats()
+    return jsonify(result)
+
+@app.route('/api/runs/<run_id>/gradient_history', methods=['GET'])
+def get_gradient_history(run_id):
+    # 손실/그래디언트 크기/업데이트 비율 곡선을 한 번에 조회 (points가 있으면 최소/최대 솎아내기)
+    columns = request.args.get('columns')
+    try:
+        history = get_or_restore_run(run_id).gradient_history
+        if history is None:
+            raise RunError(f"그래디언트 기록이 없는 실행입니다: {run_id}")
+        result = history.to_dict(
+            num_points=request.args.get('points', type=int),
+            start=request.args.get('start', type=int),
+            stop=request.args.get('stop', type=int),
+            columns=columns.split(',') if columns else None
+        )
+    except RunError as e:
+        return jsonify({'error': str(e)}), 404
+    except (HistoryError, DatasetError) as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'run_id': run_id, **result})
+
+@app.route('/api/runs/<run_id>/iterations/<int:index>/pyramid', methods=['GET'])
+def get_pyramid_tiles(run_id, index):
+    # 뷰포트(전체 해상도 좌표)와 줌 레벨에 해당하는 타일만 반환
+    path = request.args.get('path', '')
+    try:
+        pyramid = get_or_restore_run(run_id).pyramid(index, path)
+        tiles = pyramid.tiles(
+            request.args.get('plane', 0, type=int),
+            request.args.get('level', 0, type=int),
+            request.args.get('x', 0, type=int),
+            request.args.get('y', 0, type=int),
+            request.args.get('width', pyramid.tile_size, type=int),
+            request.args.get('height', pyramid.tile_size, type=int)
+        )
+    except RunError as e:
+        return jsonify({'error': str(e)}), 404
+    except (PyramidError, DatasetError) as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'path': path, 'tiles': tiles})
+
+@app.route('/api/diff', methods=['POST'])
+def diff_traces():
+    # 두 반복(또는 두 실행)의 차이를 서버에서 계산해 바뀐 부분만 전송
+    data = request.json or {}
+    a = data.get('a', {})
+    b = data.get('b')
+    threshold = data.get('threshold')
+    include_dense = data.get('include_dense', False)
+
+    if not isinstance(a, dict) or (b is not None and not isinstance(b, dict)):
+        return jsonify({'error': "a와 b는 객체여야 합니다."}), 400
+    for side in (a, b or {}):
+        if 'run_id' in side and not isinstance(side['run_id'], str):
+            return jsonify({'error': "run_id는 문자열이어야 합니다."}), 400
+        iteration = side.get('iteration')
+        if 'iteration' in side and (not isinstance(iteration, int) or isinstance(iteration, bool)):
+            return jsonify({'error': "iteration은 정수여야 합니다."}), 400
+    if threshold is not None and (not isinstance(threshold, (int, float)) or isinstance(threshold, bool)):
+        return jsonify({'error': "threshold는 숫자여야 합니다."}), 400
+    
+    try:
+        run_a = get_or_restore_run(a.get('run_id', ''))
+        if b is None:
+            # 한 반복 안의 초기 가중치 vs 업데이트된 가중치
+            result = {'weights': diff_weight_update(run_a.iteration(a.get('iteration', 0)),
+                                                    threshold, include_dense)}
+        else:
+            run_b = get_or_restore_run(b.get('run_id', run_a.run_id))
+            if 'iteration' in a and 'iteration' in b:
+                result = diff_iterations(run_a.iteration(a['iteration']), run_b.iteration(b['iteration']),
+                                         threshold, include_dense)
+            else:
+                # 실행 전체 비교는 같은 반복 번호(step)끼리, 바뀐 텐서만 포함
+                result = diff_runs(run_a.iter_iterations(), run_b.iter_iterations(),
+                                   threshold, include_dense)
+    except RunError as e:
+        return jsonify({'error': str(e)}), 404
+    except DatasetError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify(result)
+
+@app.route('/api/live_training', methods=['GET'])
+def live_training():
+    # 연결이 유지되는 동안 학습을 계속 실행하며 반복별 프레임을 SSE로 전송
+    fields = [f for f in request.args.get('fields', '').split(',') if f]
+    dataset_id = request.args.get('dataset_id')
+    interval = request.args.get('interval', 0.0, type=float)
+    max_iterations = request.args.get('max_iterations', None, type=int)
+    if interval < 0:
+        return jsonify({'error': "interval은 0 이상이어야 합니다."}), 400
+    if max_iterations is not None and not 1 <= max_iterations <= MAX_LIVE_ITERATIONS:
+        return jsonify({'error': f"max_iterations는 1 이상 {MAX_LIVE_ITERATIONS} 이하여야 합니다."}), 400
+    
+    # 세션마다 학습 스레드가 생기므로 동시 세션 수와 메모리 예산을 먼저 확인
+    ticket = admission.admit_live(model, (1, *SimpleCNN.input_shape))
+    
+    if dataset_id:
+        try:
+            sampler = dataset_store.sampler(dataset_id, SimpleCNN.input_shape,
+                                            shuffle=request.args.get('shuffle', 'false') == 'true',
+                                            num_classes=SimpleCNN.num_classes)
+        except DatasetError as e:
+            admission.release(ticket)
+            return jsonify({'error': str(e)}), 400
+        next_sample = lambda: next(sampler)
+    else:
+        sampler = None
+        sample = create_sample_data()
+        next_sample = lambda: sample
+    
+    # 최근 반복 하나만 보관해 연결당 메모리를 제한
+    session = LiveTrainingSession(
+        ModelVisualizer(pristine_model(), learning_rate=visualizer.learning_rate, history_limit=1),
+        next_sample,
+        fields=fields,
+        interval=interval,
+        max_iterations=max_iterations
+    ).start()
+    
+    closed = threading.Lock()
+    def close_session():
+        # 스트림이 끝나거나, 본문 전송 전에 연결이 끊겨도(call_on_close) 한 번만 정리
+        if not closed.acquire(blocking=False):
+            return
+        session.stop()
+        if sampler is not None:
+            sampler.close()
+        admission.release(ticket)
+    
+    def generate():
+        try:
+            yield from session.frames()
+        finally:
+            # 클라이언트 연결이 끊기면 학습도 중단
+            close_session()
+    
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    response.call_on_close(close_session)
+    return response
+
+def build_model_info():
+    """모델 구조 요약 (API 응답과 HTML 내보내기에서 공통 사용)"""
+    return {
         'name': 'SimpleCNN',
         'layers': [
             {'name': 'Conv2d', 'params': {'in_channels': 1, 'out_channels': 1, 'kernel_size': 2, 'padding': 0}},
@@ -119,7 +530,132 @@ def get_model_info():
             {'name': 'Linear', 'params': {'in_features': 4, 'out_features': 2}}
         ],
         'total_params': sum(p.numel() for p in model.parameters())
+    }
+
+@app.route('/api/model_info', methods=['GET'])
+def get_model_info():
+    return jsonify(build_model_info())
+
+@app.route('/api/export_html', methods=['GET'])
+def export_html_file():
+    # 실행을 백엔드 없이 열 수 있는 단일 HTML 파일로 내려받기
+    try:
+        run = get_or_restore_run(request.args.get('run_id', ''))
+        html = export_run(run.iter_iterations(), build_model_info(), MODEL_CONFIG,
+                          request.args.get('dtype', 'float32'))
+    except RunError as e:
+        return jsonify({'error': str(e)}), 404
+    except (ExportError, DatasetError) as e:
+        return jsonify({'error': str(e)}), 400
+    return Response(html, mimetype='text/html', headers={
+        'Content-Disposition': f'attachment; filename=cnn_visualization_{run.run_id[:8]}.html'
     })
 
+@app.route('/api/datasets', methods=['POST'])
+def create_dataset():
+    # 업로드 전에 데이터셋 크기와 형태를 등록
+    data = request.json or {}
+    try:
+        meta = dataset_store.create(
+            data.get('num_samples', 0),
+            data.get('sample_shape', []),
+            data.get('dtype', 'float32')
+        )
+    except DatasetError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(meta), 201
+
+@app.route('/api/datasets/<dataset_id>', methods=['GET'])
+def get_dataset(dataset_id):
+    try:
+        return jsonify(dataset_store.info(dataset_id))
+    except DatasetError as e:
+        return jsonify({'error': str(e)}), 404
+
+@app.route('/api/datasets/<dataset_id>', methods=['DELETE'])
+def delete_dataset(dataset_id):
+    try:
+        dataset_store.delete(dataset_id)
+    except DatasetError as e:
+        return jsonify({'error': str(e)}), 404
+    return '', 204
+
+@app.route('/api/datasets/<dataset_id>/<part>', methods=['PUT'])
+def upload_dataset_chunk(dataset_id, part):
+    # 요청 본문을 버퍼링하지 않고 스트림 그대로 메모리 맵에 기록
+    offset = request.args.get('offset', 0, type=int)
+    try:
+        written = dataset_store.write_stream(dataset_id, part, offset, request.stream)
+    except DatasetError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'written': written, 'offset': offset})
+
+@app.route('/api/datasets/<dataset_id>/finalize', methods=['POST'])
+def finalize_dataset(dataset_id):
+    # 정규화/리사이즈 전처리를 한 번 수행하고 캐시
+    try:
+        entry = dataset_store.preprocess(dataset_id, SimpleCNN.input_shape, SimpleCNN.num_classes)
+    except DatasetError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify(entry)
+
+@app.route('/api/atlas', methods=['POST'])
+def create_atlas():
+    # 데이터셋 전체에 대해 역전파 없는 배치 순전파로 유닛별 top-k 인덱스 생성
+    data = request.json or {}
+    dataset_id = data.get('dataset_id')
+    options = {'k': data.get('k', 10), 'bins': data.get('bins', 32), 'batch_size': data.get('batch_size', 256)}
+    for key, value in options.items():
+        if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+            return jsonify({'error': f"{key}는 1 이상의 정수여야 합니다."}), 400
+    
+    # run_id가 주어지면 해당 실행의 마지막 업데이트 가중치 사용, 아니면 초기 가중치 사용
+    atlas_visualizer = visualizer
+    if data.get('run_id'):
+        try:
+            run = get_or_restore_run(data['run_id'])
+            trained_model = pristine_model()
+            trained_model.set_weights(run.iteration(len(run) - 1)['updated_weights'])
+        except RunError as e:
+            return jsonify({'error': str(e)}), 404
+        except DatasetError as e:
+            return jsonify({'error': str(e)}), 400
+        atlas_visualizer = ModelVisualizer(trained_model)
+    
+    try:
+        num_samples = dataset_store.info(dataset_id)['num_samples']
+        sampler = dataset_store.sampler(dataset_id, SimpleCNN.input_shape, batch_size=options['batch_size'])
+    except DatasetError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    with sampler:
+        atlas = build_atlas(atlas_visualizer, sampler, num_samples, k=options['k'], bins=options['bins'])
+    atlas_id = atlas_registry.add(atlas)
+    return jsonify({'atlas_id': atlas_id, **atlas.summary()}), 201
+
+@app.route('/api/atlas/<atlas_id>/<layer>/<int:unit>', methods=['GET'])
+def query_atlas(atlas_id, layer, unit):
+    try:
+        return jsonify(atlas_registry.get(atlas_id).query(layer, unit))
+    except AtlasError as e:
+        return jsonify({'error': str(e)}), 404
+
+def warm_up():
+    """시작 시 반복 계산과 직렬화를 한 번 실행해 torch 커널 지연 초기화 비용을 첫 요청 전에 치름"""
+    warm_visualizer = ModelVisualizer(pristine_model(), learning_rate=visualizer.learning_rate)
+    input_data, target = create_sample_data()
+    for iteration in warm_visualizer.run_epochs(input_data, target, 2):
+        json.dumps(serialize_iteration(iteration))
+    warm_visualizer.forward_activations(input_data)
+
+STARTUP_TIMINGS['init_ms'] = (time.perf_counter() - _startup_begin) * 1000 - STARTUP_TIMINGS['imports_ms']
+
+# CNN_VIS_WARMUP=0이면 생략 (예: 짧게 실행되는 CLI)
+if os.environ.get('CNN_VIS_WARMUP', '1') != '0':
+    _warmup_begin = time.perf_counter()
+    warm_up()
+    STARTUP_TIMINGS['warmup_ms'] = (time.perf_counter() - _warmup_begin) * 1000
+STARTUP_TIMINGS['total_ms'] = (time.perf_counter() - _startup_begin) * 1000
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=True)
@@ -1,20 +1,46 @@
+import os
+import pickle
+import hashlib
+import threading
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
 import numpy as np
 
+# 초기 가중치(state_dict) 파일을 저장하는 위치 (기본값 backend/output)
+SNAPSHOT_DIR = os.environ.get('CNN_VIS_SNAPSHOT_DIR',
+                              os.path.join(os.path.dirname(os.path.abspath(__file__)), 'output'))
+
+# 초기 가중치 상태 모델의 직렬화 스냅샷 (pristine_model에서 사용)
+_pristine_snapshot = None
+_pristine_lock = threading.Lock()
+# 초기 가중치를 어디서 얻었는지 ('disk': 저장된 파일, 'built': 새로 생성 후 저장)
+_pristine_source = None
+
 class SimpleCNN(nn.Module):
+    # 모델이 기대하는 입력 형태 (채널, 높이, 너비)
+    input_shape = (1, 4, 4)
+    # 분류 클래스 수 (데이터셋 라벨 범위 검증에도 사용)
+    num_classes = 2
+
     def __init__(self):
         super(SimpleCNN, self).__init__()
         self.conv1 = nn.Conv2d(in_channels=1, out_channels=1, kernel_size=2, padding=0, bias=False)
         self.pool1 = nn.MaxPool2d(kernel_size=2, stride=1)
-        self.fc = nn.Linear(4, 2)
+        self.fc = nn.Linear(4, self.num_classes)
         
         # 가중치 초기화 (시각화를 위해 특정 값으로 초기화)
         self.conv1.weight.data = torch.tensor([[[[1.0, 0.5], [0.5, 1.0]]]], requires_grad=True)
         self.fc.weight.data = torch.tensor([[0.1, 0.2, 0.3, 0.4], [0.4, 0.3, 0.2, 0.1]], requires_grad=True)
         self.fc.bias.data = torch.tensor([0.1, -0.1], requires_grad=True)
 
+    def set_weights(self, weights):
+        """시각화 데이터의 가중치 딕셔너리(conv1_weight, fc_weight, fc_bias)로 파라미터 설정"""
+        with torch.no_grad():
+            self.conv1.weight.copy_(torch.as_tensor(weights['conv1_weight']))
+            self.fc.weight.copy_(torch.as_tensor(weights['fc_weight']))
+            self.fc.bias.copy_(torch.as_tensor(weights['fc_bias']))
+
     def forward(self, x):
         conv_out = self.conv1(x)
         relu_out = F.relu(conv_out)
@@ -55,3 +81,63 @@ class SimpleCNN(nn.Module):
         intermediates['fc_out'] = fc_out
         
         return fc_out, intermediates
+
+
+def _snapshot_path():
+    """모델 코드와 PyTorch 버전별 초기 가중치 파일 경로 (코드가 바뀌면 이전 파일을 쓰지 않음)"""
+    with open(os.path.abspath(__file__), 'rb') as f:
+        key = hashlib.sha1(f.read() + torch.__version__.encode()).hexdigest()[:16]
+    return os.path.join(SNAPSHOT_DIR, f'pristine_state_{key}.pt')
+
+
+def _load_state(path, model):
+    """저장된 초기 가중치(state_dict)를 텐서만 허용하는 방식으로 읽어 모델에 적용"""
+    state = torch.load(path, map_location='cpu', weights_only=True)
+    # 키나 형태가 다르면 load_state_dict가 예외를 발생시킴
+    model.load_state_dict(state, strict=True)
+
+
+def _load_or_build_snapshot():
+    """저장된 초기 가중치를 읽어 모델을 직렬화하고, 없으면 새로 만든 모델의 가중치를 다음 워커를 위해 저장
+
+    파일에는 state_dict(텐서)만 저장하고 weights_only=True로 읽으므로 파일이 바뀌어도 임의 코드가 실행되지 않음.
+    파일이 없거나 손상되었으면(어떤 예외든) 새로 만든 모델을 사용함.
+    """
+    global _pristine_source
+    path = _snapshot_path()
+    model = SimpleCNN()
+    try:
+        _load_state(path, model)
+        _pristine_source = 'disk'
+    except Exception:
+        model = SimpleCNN()
+        _pristine_source = 'built'
+        try:
+            os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+            tmp_path = f'{path}.{os.getpid()}.tmp'
+            torch.save(model.state_dict(), tmp_path)
+            os.replace(tmp_path, path)
+        except OSError:
+            # 저장하지 못해도 이 프로세스에서는 새로 만든 모델 사용
+            pass
+    # 프로세스 안에서는 이 프로세스가 만든 모델 객체만 직렬화/역직렬화함
+    return pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def pristine_model():
+    """초기 가중치 상태의 새 SimpleCNN 반환
+
+    초기 가중치는 backend/output에 state_dict로 저장되어 모든 워커가 같은 값에서 시작함.
+    처음 한 번 만든 모델을 프로세스 안에서 직렬화해 두고 이후에는 역직렬화만 하므로
+    레이어 생성과 기본 가중치 초기화 후 덮어쓰기를 요청마다 반복하지 않음.
+    """
+    global _pristine_snapshot
+    with _pristine_lock:
+        if _pristine_snapshot is None:
+            _pristine_snapshot = _load_or_build_snapshot()
+    return pickle.loads(_pristine_snapshot)
+
+
+def pristine_snapshot_source():
+    """스냅샷 출처 ('disk', 'built', 아직 만들지 않았으면 None)"""
+    return _pristine_source
@@ -0,0 +1,153 @@
+import threading
+from collections import OrderedDict
+from model import pristine_model
+from visualizer import ModelVisualizer
+from run_registry import TraceRun, RunError
+from admission import trace_memory_bytes
+
+# 기본 체크포인트 간격 (K가 클수록 저장 공간은 줄고 임의 접근 시 재생할 반복은 늘어남)
+DEFAULT_CHECKPOINT_INTERVAL = 10
+
+# 재생한 반복 트레이스를 보관할 최대 개수
+DEFAULT_REPLAY_CACHE_SIZE = 32
+
+
+def _snapshot(model):
+    """모델 가중치를 run_iteration의 가중치 딕셔너리 형태로 복사"""
+    return {
+        'conv1_weight': model.conv1.weight.detach().clone().numpy(),
+        'fc_weight': model.fc.weight.detach().clone().numpy(),
+        'fc_bias': model.fc.bias.detach().clone().numpy()
+    }
+
+
+class ReplayRun(TraceRun):
+    """K 반복마다의 가중치 체크포인트와 입력/타겟/하이퍼파라미터만 저장하는 실행
+
+    학습이 결정적(고정된 초기 가중치, 고정된 입력, 단순 SGD)이므로 요청된 반복은
+    가장 가까운 이전 체크포인트(또는 캐시된 반복)부터 run_iteration을 다시 실행해 복원함.
+    """
+
+    def __init__(self, run_id, checkpoints, inputs, targets, learning_rate, checkpoint_interval,
+                 capture_mode='eager', cache_size=DEFAULT_REPLAY_CACHE_SIZE, meta=None,
+                 gradient_history=None):
+        # 반복 트레이스 목록은 보관하지 않음 (iteration()이 재생해서 만듦)
+        super(ReplayRun, self).__init__(run_id, None, meta, gradient_history)
+        self.checkpoints = checkpoints
+        self.inputs = inputs
+        self.targets = targets
+        self.learning_rate = learning_rate
+        self.checkpoint_interval = checkpoint_interval
+        self.capture_mode = capture_mode
+        self.cache_size = max(1, int(cache_size))
+        self._cache = OrderedDict()
+        # 재생 캐시에 있는 반복별 트레이스 크기와 그 합계 (메모리 예산에 포함)
+        self._cache_sizes = {}
+        self._cache_bytes = 0
+        self._replay_lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'replayed_steps': 0}
+
+        # 같은 텐서를 반복해서 쓰는 입력(샘플 데이터)은 한 번만 계산
+        unique = {id(t): t for t in list(inputs) + list(targets)}
+        self._stored_bytes = (
+            sum(t.numel() * t.element_size() for t in unique.values())
+            + sum(a.nbytes for weights in checkpoints.values() for a in weights.values())
+            + (gradient_history.nbytes if gradient_history else 0)
+        )
+
+    @property
+    def nbytes(self):
+        """저장한 입력/체크포인트/곡선과 재생 캐시에 있는 반복 트레이스의 크기 합"""
+        return self._stored_bytes + self._cache_bytes
+
+    def __len__(self):
+        return len(self.inputs)
+
+    def iter_iterations(self):
+        """반복을 하나씩 재생하며 순서대로 반환 (전체 트레이스를 한꺼번에 메모리에 두지 않음)
+
+        직전 반복이 캐시에 남아 있으므로 각 반복은 한 스텝만 재생함.
+        """
+        for index in range(len(self)):
+            yield self.iteration(index)
+
+    def _remember(self, index, trace):
+        self._cache_bytes -= self._cache_sizes.get(index, 0)
+        self._cache[index] = trace
+        self._cache_sizes[index] = trace_memory_bytes(trace)
+        self._cache_bytes += self._cache_sizes[index]
+        self._cache.move_to_end(index)
+        while len(self._cache) > self.cache_size:
+            evicted, _ = self._cache.popitem(last=False)
+            self._cache_bytes -= self._cache_sizes.pop(evicted)
+
+    def iteration(self, index):
+        if not 0 <= index < len(self):
+            raise RunError(f"반복 인덱스가 범위를 벗어났습니다: {index}")
+
+        with self._replay_lock:
+            if index in self._cache:
+                self._stats['hits'] += 1
+                self._cache.move_to_end(index)
+                return self._cache[index]
+            self._stats['misses'] += 1
+
+            # 가장 가까운 체크포인트, 또는 그 이후 캐시에 남아 있는 가장 가까운 반복부터 재생
+            start = index - index % self.checkpoint_interval
+            weights = self.checkpoints[start]
+            for cached in range(index - 1, start - 1, -1):
+                if cached in self._cache:
+                    start, weights = cached + 1, self._cache[cached]['updated_weights']
+                    break
+
+            model = pristine_model()
+            model.set_weights(weights)
+            visualizer = ModelVisualizer(model, learning_rate=self.learning_rate, history_limit=1,
+                                         capture_mode=self.capture_mode)
+            visualizer.step_count = start
+            for step in range(start, index + 1):
+                trace = visualizer.run_iteration(self.inputs[step], self.targets[step])
+                self._remember(step, trace)
+            self._stats['replayed_steps'] += index + 1 - start
+            return trace
+
+    def stats(self):
+        with self._replay_lock:
+            return {
+                'num_iterations': len(self),
+                'checkpoint_interval': self.checkpoint_interval,
+                'num_checkpoints': len(self.checkpoints),
+                'stored_bytes': self._stored_bytes,
+                'cache_bytes': self._cache_bytes,
+                'cache_size': self.cache_size,
+                'cached_iterations': len(self._cache),
+                **self._stats
+            }
+
+
+def record_replay_run(run_id, next_sample, num_steps, learning_rate,
+                      checkpoint_interval=DEFAULT_CHECKPOINT_INTERVAL, capture_mode='eager',
+                      cache_size=DEFAULT_REPLAY_CACHE_SIZE, meta=None):
+    """학습을 한 번 실행하면서 체크포인트와 입력만 기록 (전체 트레이스는 보관하지 않음)"""
+    checkpoint_interval = int(checkpoint_interval)
+    if checkpoint_interval < 1:
+        raise ValueError("checkpoint_interval은 1 이상이어야 합니다.")
+
+    model = pristine_model()
+    # 최근 반복 하나만 보관해 기록 중 메모리를 제한 (재생과 같은 run_iteration 경로 사용)
+    visualizer = ModelVisualizer(model, learning_rate=learning_rate, history_limit=1,
+                                 capture_mode=capture_mode, record_history=True)
+    checkpoints = {}
+    inputs = []
+    targets = []
+    for step in range(num_steps):
+        if step % checkpoint_interval == 0:
+            checkpoints[step] = _snapshot(model)
+        input_data, target = next_sample()
+        inputs.append(input_data)
+        targets.append(target)
+        visualizer.run_iteration(input_data, target)
+
+    return ReplayRun(run_id, checkpoints, inputs, targets, learning_rate, checkpoint_interval,
+                     capture_mode=capture_mode, cache_size=cache_size, meta=meta,
+                     gradient_history=visualizer.gradient_history)
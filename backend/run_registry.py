@@ -0,0 +1,102 @@
+import uuid
+import threading
+from collections import OrderedDict
+from tensor_pyramid import TensorPyramid, PyramidError
+from admission import trace_memory_bytes
+
+# 실행 하나가 보관하는 텐서 피라미드의 최대 개수 (최근에 사용한 것부터 유지)
+MAX_PYRAMIDS_PER_RUN = 64
+
+
+class RunError(KeyError):
+    """존재하지 않는 실행(run)이나 반복을 요청했을 때 발생하는 예외"""
+
+    def __str__(self):
+        return str(self.args[0]) if self.args else ''
+
+
+def lookup_path(iteration, path):
+    """'forward/conv/output_tensor' 형태의 경로로 반복 데이터 안의 텐서를 찾음"""
+    value = iteration
+    for key in path.split('/'):
+        if not isinstance(value, dict) or key not in value:
+            raise RunError(f"경로를 찾을 수 없습니다: {path}")
+        value = value[key]
+    return value
+
+
+class TraceRun:
+    """한 번의 시각화 요청으로 생성된 반복 데이터와 파생 캐시(피라미드 등)"""
+
+    def __init__(self, run_id, iterations, meta=None, gradient_history=None):
+        self.run_id = run_id
+        self.iterations = iterations
+        self.meta = meta or {}
+        # 모든 반복의 그래디언트 크기 곡선 (ModelVisualizer.gradient_history)
+        self.gradient_history = gradient_history
+        # 보관 중인 반복 데이터의 실제 크기 (배열 데이터와 객체 포함, 메모리 예산 계산용)
+        self._stored_bytes = trace_memory_bytes(iterations) + (gradient_history.nbytes if gradient_history else 0)
+        self._pyramids = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self):
+        return self._stored_bytes
+
+    def __len__(self):
+        return len(self.iterations)
+
+    def iteration(self, index):
+        if not 0 <= index < len(self.iterations):
+            raise RunError(f"반복 인덱스가 범위를 벗어났습니다: {index}")
+        return self.iterations[index]
+
+    def iter_iterations(self):
+        """반복을 순서대로 반환 (ReplayRun과 같은 인터페이스)"""
+        return iter(self.iterations)
+
+    def pyramid(self, index, path):
+        """텐서 피라미드를 처음 요청될 때 만들고 이후에는 재사용"""
+        key = (index, path)
+        with self._lock:
+            if key not in self._pyramids:
+                try:
+                    self._pyramids[key] = TensorPyramid(lookup_path(self.iteration(index), path))
+                except PyramidError as e:
+                    raise RunError(str(e))
+                while len(self._pyramids) > MAX_PYRAMIDS_PER_RUN:
+                    self._pyramids.popitem(last=False)
+            self._pyramids.move_to_end(key)
+            return self._pyramids[key]
+
+
+class RunRegistry:
+    """최근 실행을 최대 개수까지만 보관하는 레지스트리 (오래된 것부터 제거)"""
+
+    def __init__(self, max_runs=16):
+        self.max_runs = max_runs
+        self._runs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, iterations, meta=None, run_id=None, gradient_history=None):
+        return self.register(TraceRun(run_id or uuid.uuid4().hex, iterations, meta, gradient_history))
+
+    def register(self, run):
+        """이미 만들어진 실행 객체(TraceRun 또는 같은 인터페이스의 객체)를 등록"""
+        with self._lock:
+            self._runs[run.run_id] = run
+            while len(self._runs) > self.max_runs:
+                self._runs.popitem(last=False)
+        return run
+
+    def get(self, run_id):
+        with self._lock:
+            if run_id not in self._runs:
+                raise RunError(f"실행을 찾을 수 없습니다: {run_id}")
+            self._runs.move_to_end(run_id)
+            return self._runs[run_id]
+
+    def nbytes(self):
+        """보관 중인 모든 실행의 트레이스 바이트 합계"""
+        with self._lock:
+            return sum(run.nbytes for run in self._runs.values())
@@ -0,0 +1,318 @@
+import os
+import mmap
+import time
+import struct
+import hashlib
+import tempfile
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    # Windows에서는 프로세스 간 잠금 없이 단일 프로세스 캐시로 동작
+    fcntl = None
+
+# 인덱스 파일 레이아웃: 헤더 + 고정 크기 슬롯 배열
+HEADER_FORMAT = '<8sII'
+HEADER_MAGIC = b'CNNTRC02'
+MAX_PINS = 8
+# 키(sha1), 상태, 크기, 마지막 접근 시각, 작성 중인 pid, 참조 중인 pid 목록
+SLOT_FORMAT = '<20sB3xQdi' + 'i' * MAX_PINS
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+SLOT_SIZE = struct.calcsize(SLOT_FORMAT)
+
+SLOT_EMPTY = 0
+SLOT_WRITING = 1
+SLOT_READY = 2
+
+# 캐시된 페이로드를 응답으로 흘려보낼 때의 청크 크기
+STREAM_CHUNK_BYTES = 256 * 1024
+
+
+def default_cache_dir():
+    """공유 메모리 파일 시스템(/dev/shm)이 있으면 사용하고, 없으면 임시 디렉터리 사용"""
+    base = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    return os.path.join(base, 'cnn-vis-trace-cache')
+
+
+def _pid_alive(pid):
+    if pid <= 0:
+        return False
+    if os.name == 'nt':
+        # Windows의 os.kill은 프로세스를 종료시키므로 확인하지 않음
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class CachedTrace:
+    """공유 세그먼트를 읽기 전용으로 매핑한 캐시 항목 (닫을 때 참조 해제)"""
+
+    def __init__(self, cache, slot, mapped):
+        self._cache = cache
+        self._slot = slot
+        self._mmap = mapped
+        self.view = memoryview(mapped)
+        self._closed = False
+
+    def __len__(self):
+        return len(self.view)
+
+    def iter_chunks(self, chunk_size=STREAM_CHUNK_BYTES):
+        """세그먼트 전체를 복사하지 않고 청크 단위로 내보내고 끝나면 참조 해제"""
+        try:
+            for start in range(0, len(self.view), chunk_size):
+                yield bytes(self.view[start:start + chunk_size])
+        finally:
+            self.close()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self.view.release()
+        self._mmap.close()
+        self._cache._unpin(self._slot)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SharedTraceCache:
+    """여러 워커 프로세스가 공유하는 직렬화된 트레이스 캐시
+
+    인덱스는 잠금(flock)으로 보호되는 mmap 파일이고, 각 트레이스는 별도의
+    mmap 세그먼트 파일에 저장됨. 읽는 동안에는 pid로 참조를 고정(pin)하며,
+    종료된 워커의 참조는 정리 시 회수되므로 세그먼트가 새지 않음.
+    """
+
+    def __init__(self, directory=None, num_slots=256, capacity_bytes=512 * 1024 * 1024, version=0):
+        self.directory = directory or default_cache_dir()
+        self.version = version
+        self.num_slots = num_slots
+        self.capacity_bytes = capacity_bytes
+        self._thread_lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+        index_path = os.path.join(self.directory, 'index')
+        self._index_fd = os.open(index_path, os.O_RDWR | os.O_CREAT, 0o600)
+        index_size = HEADER_SIZE + SLOT_SIZE * num_slots
+        with self._locked():
+            magic, version, slots = self._read_header_raw()
+            if magic != HEADER_MAGIC or version != self.version or slots != num_slots:
+                # 처음 만들거나 형식/코드 버전이 다르면 인덱스를 초기화하고 이전 배포의 세그먼트 삭제
+                self._remove_segments()
+                os.ftruncate(self._index_fd, 0)
+                os.ftruncate(self._index_fd, index_size)
+                os.lseek(self._index_fd, 0, os.SEEK_SET)
+                os.write(self._index_fd, struct.pack(HEADER_FORMAT, HEADER_MAGIC, self.version, num_slots))
+        self._index = mmap.mmap(self._index_fd, index_size)
+
+    def _read_header_raw(self):
+        os.lseek(self._index_fd, 0, os.SEEK_SET)
+        data = os.read(self._index_fd, HEADER_SIZE)
+        if len(data) < HEADER_SIZE:
+            return None, 0, 0
+        return struct.unpack(HEADER_FORMAT, data)
+
+    def _locked(self):
+        return _IndexLock(self._thread_lock, self._index_fd)
+
+    def _remove_segments(self):
+        for name in os.listdir(self.directory):
+            if name.endswith('.trace'):
+                try:
+                    os.unlink(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+
+    def _segment_path(self, digest):
+        return os.path.join(self.directory, digest.hex() + '.trace')
+
+    def _read_slot(self, slot):
+        fields = struct.unpack_from(SLOT_FORMAT, self._index, HEADER_SIZE + slot * SLOT_SIZE)
+        return {
+            'key': fields[0],
+            'state': fields[1],
+            'size': fields[2],
+            'last_access': fields[3],
+            'writer': fields[4],
+            'pins': list(fields[5:])
+        }
+
+    def _write_slot(self, slot, entry):
+        struct.pack_into(
+            SLOT_FORMAT, self._index, HEADER_SIZE + slot * SLOT_SIZE,
+            entry['key'], entry['state'], entry['size'], entry['last_access'],
+            entry['writer'], *entry['pins']
+        )
+
+    def _clear_slot(self, slot, entry):
+        if entry['state'] != SLOT_EMPTY:
+            try:
+                os.unlink(self._segment_path(entry['key']))
+            except FileNotFoundError:
+                pass
+        self._write_slot(slot, {
+            'key': b'\0' * 20, 'state': SLOT_EMPTY, 'size': 0,
+            'last_access': 0.0, 'writer': 0, 'pins': [0] * MAX_PINS
+        })
+
+    def _sweep(self):
+        """종료된 워커의 참조와 중단된 쓰기를 정리 (잠금을 잡은 상태에서 호출)"""
+        entries = []
+        for slot in range(self.num_slots):
+            entry = self._read_slot(slot)
+            if entry['state'] == SLOT_WRITING and not _pid_alive(entry['writer']):
+                self._clear_slot(slot, entry)
+                entry = self._read_slot(slot)
+            elif entry['state'] == SLOT_READY:
+                live = [pid if _pid_alive(pid) else 0 for pid in entry['pins']]
+                if live != entry['pins']:
+                    entry['pins'] = live
+                    self._write_slot(slot, entry)
+            entries.append(entry)
+        return entries
+
+    def _find(self, entries, digest):
+        for slot, entry in enumerate(entries):
+            if entry['state'] != SLOT_EMPTY and entry['key'] == digest:
+                return slot
+        return None
+
+    def _evict(self, entries, needed_bytes):
+        """필요한 공간과 빈 슬롯이 생길 때까지 참조되지 않은 항목을 LRU 순으로 제거"""
+        used = sum(e['size'] for e in entries if e['state'] != SLOT_EMPTY)
+        free_slot = next((i for i, e in enumerate(entries) if e['state'] == SLOT_EMPTY), None)
+        candidates = sorted(
+            (i for i, e in enumerate(entries) if e['state'] == SLOT_READY and not any(e['pins'])),
+            key=lambda i: entries[i]['last_access']
+        )
+        for slot in candidates:
+            if free_slot is not None and used + needed_bytes <= self.capacity_bytes:
+                break
+            used -= entries[slot]['size']
+            self._clear_slot(slot, entries[slot])
+            entries[slot] = self._read_slot(slot)
+            if free_slot is None:
+                free_slot = slot
+        if free_slot is None or used + needed_bytes > self.capacity_bytes:
+            return None
+        return free_slot
+
+    @staticmethod
+    def digest(key):
+        return hashlib.sha1(key.encode()).digest()
+
+    def get(self, key):
+        """캐시된 트레이스를 참조 고정 후 반환 (없으면 None)"""
+        digest = self.digest(key)
+        pid = os.getpid()
+        with self._locked():
+            entries = self._sweep()
+            slot = self._find(entries, digest)
+            if slot is None or entries[slot]['state'] != SLOT_READY:
+                return None
+            entry = entries[slot]
+            if 0 not in entry['pins']:
+                # 참조 자리가 모두 찼으면 캐시를 건너뛰고 다시 계산
+                return None
+            entry['pins'][entry['pins'].index(0)] = pid
+            entry['last_access'] = time.time()
+            self._write_slot(slot, entry)
+
+        try:
+            with open(self._segment_path(digest), 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), entry['size'], access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self._unpin(slot)
+            return None
+        return CachedTrace(self, slot, mapped)
+
+    def _unpin(self, slot):
+        pid = os.getpid()
+        with self._locked():
+            entry = self._read_slot(slot)
+            if pid in entry['pins']:
+                entry['pins'][entry['pins'].index(pid)] = 0
+                self._write_slot(slot, entry)
+
+    def put(self, key, payload):
+        """직렬화된 트레이스를 새 세그먼트에 기록 (이미 있거나 공간이 없으면 False)"""
+        digest = self.digest(key)
+        size = len(payload)
+        if size == 0 or size > self.capacity_bytes:
+            return False
+
+        # 슬롯을 '쓰기 중'으로 예약한 뒤 잠금 밖에서 세그먼트 작성
+        with self._locked():
+            entries = self._sweep()
+            if self._find(entries, digest) is not None:
+                return False
+            slot = self._evict(entries, size)
+            if slot is None:
+                return False
+            self._write_slot(slot, {
+                'key': digest, 'state': SLOT_WRITING, 'size': size,
+                'last_access': time.time(), 'writer': os.getpid(), 'pins': [0] * MAX_PINS
+            })
+
+        path = self._segment_path(digest)
+        try:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600)
+            try:
+                os.ftruncate(fd, size)
+                with mmap.mmap(fd, size) as mapped:
+                    mapped[:] = payload
+            finally:
+                os.close(fd)
+        except BaseException as e:
+            # 어떤 예외(KeyboardInterrupt 등)로 중단되어도 '쓰기 중' 예약을 남기지 않음
+            with self._locked():
+                self._clear_slot(slot, self._read_slot(slot))
+            if isinstance(e, OSError):
+                return False
+            raise
+
+        with self._locked():
+            entry = self._read_slot(slot)
+            entry['state'] = SLOT_READY
+            self._write_slot(slot, entry)
+        return True
+
+    def stats(self):
+        with self._locked():
+            entries = self._sweep()
+        ready = [e for e in entries if e['state'] == SLOT_READY]
+        return {
+            'entries': len(ready),
+            'bytes': sum(e['size'] for e in ready),
+            'pinned': sum(1 for e in ready if any(e['pins'])),
+            'capacity_bytes': self.capacity_bytes
+        }
+
+
+class _IndexLock:
+    """스레드 잠금과 인덱스 파일 flock을 함께 잡는 컨텍스트"""
+
+    def __init__(self, thread_lock, fd):
+        self._thread_lock = thread_lock
+        self._fd = fd
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._thread_lock.release()
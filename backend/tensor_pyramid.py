@@ -0,0 +1,130 @@
+import numpy as np
+
+# 이 개수 이상의 원소를 가진 텐서는 전체 값 대신 피라미드로 전송
+PYRAMID_MIN_ELEMENTS = 4096
+
+# 타일 한 변의 크기 (픽셀)
+DEFAULT_TILE_SIZE = 64
+
+
+class PyramidError(ValueError):
+    """피라미드 타일 요청이 잘못되었을 때 발생하는 예외"""
+    pass
+
+
+def is_large_tensor(array):
+    """피라미드로 다운샘플링해야 할 만큼 큰 2차원 이상 텐서인지 확인"""
+    return isinstance(array, np.ndarray) and array.ndim >= 2 and array.size >= PYRAMID_MIN_ELEMENTS
+
+
+def _pad_even(array, mode):
+    """마지막 두 축을 짝수 크기로 맞춤 (가장자리 값을 복제)"""
+    pad_h = array.shape[-2] % 2
+    pad_w = array.shape[-1] % 2
+    if not pad_h and not pad_w:
+        return array
+    return np.pad(array, ((0, 0), (0, pad_h), (0, pad_w)), mode=mode)
+
+
+def _pool2x2(array, reducer):
+    """(평면, 높이, 너비) 배열을 2x2 블록 단위로 축약"""
+    array = _pad_even(array, 'edge')
+    planes, height, width = array.shape
+    blocks = array.reshape(planes, height // 2, 2, width // 2, 2)
+    return reducer(blocks, axis=(2, 4))
+
+
+def _tile_stats(array, tile_size, ufunc):
+    """각 타일의 통계값을 (평면, 타일 행, 타일 열) 배열로 계산"""
+    row_starts = np.arange(0, array.shape[1], tile_size)
+    col_starts = np.arange(0, array.shape[2], tile_size)
+    # reduceat은 마지막 타일이 잘려도 패딩 없이 처리됨
+    return ufunc.reduceat(ufunc.reduceat(array, row_starts, axis=1), col_starts, axis=2)
+
+
+class TensorPyramid:
+    """큰 텐서의 마지막 두 축을 평균/최대 풀링으로 단계별 축소한 다중 해상도 피라미드"""
+
+    def __init__(self, array, tile_size=DEFAULT_TILE_SIZE):
+        array = np.asarray(array)
+        if array.ndim < 2:
+            raise PyramidError("피라미드는 2차원 이상의 텐서에서만 만들 수 있습니다.")
+        self.shape = array.shape
+        self.tile_size = int(tile_size)
+
+        # 앞쪽 축(배치, 채널)은 평면 목록으로 평탄화
+        base = array.reshape(-1, *array.shape[-2:])
+        self.levels = [{'mean': base, 'max': base, 'min': base}]
+
+        # 한 타일에 들어갈 때까지 2배씩 축소
+        while max(self.levels[-1]['mean'].shape[-2:]) > self.tile_size:
+            prev = self.levels[-1]
+            self.levels.append({
+                'mean': _pool2x2(prev['mean'], np.mean).astype(np.float32),
+                'max': _pool2x2(prev['max'], np.max),
+                'min': _pool2x2(prev['min'], np.min)
+            })
+
+        # 레벨별 타일 최소/최대값을 미리 계산
+        for level in self.levels:
+            level['tile_min'] = _tile_stats(level['min'], self.tile_size, np.minimum)
+            level['tile_max'] = _tile_stats(level['max'], self.tile_size, np.maximum)
+
+    @property
+    def num_planes(self):
+        return self.levels[0]['mean'].shape[0]
+
+    def summary(self, path):
+        """응답에 전체 텐서 대신 넣을 요약 (가장 거친 레벨 미리보기 포함)"""
+        coarsest = self.levels[-1]
+        return {
+            'pyramid': True,
+            'path': path,
+            'shape': list(self.shape),
+            'num_planes': self.num_planes,
+            'num_levels': len(self.levels),
+            'tile_size': self.tile_size,
+            'min': float(self.levels[0]['min'].min()),
+            'max': float(self.levels[0]['max'].max()),
+            'preview': coarsest['mean'].tolist()
+        }
+
+    def tiles(self, plane, level, x, y, width, height):
+        """전체 해상도 좌표의 뷰포트 (x, y, width, height)와 겹치는 타일 목록 반환"""
+        if not 0 <= plane < self.num_planes:
+            raise PyramidError(f"평면 인덱스가 범위를 벗어났습니다: {plane}")
+        if not 0 <= level < len(self.levels):
+            raise PyramidError(f"레벨이 범위를 벗어났습니다: {level}")
+
+        data = self.levels[level]
+        scale = 2 ** level
+        level_h, level_w = data['mean'].shape[-2:]
+
+        # 뷰포트를 해당 레벨 좌표로 변환한 뒤 겹치는 타일 범위 계산
+        x0 = max(int(x) // scale, 0)
+        y0 = max(int(y) // scale, 0)
+        x1 = min(-(-(int(x) + int(width)) // scale), level_w)
+        y1 = min(-(-(int(y) + int(height)) // scale), level_h)
+
+        result = []
+        for ty in range(y0 // self.tile_size, -(-y1 // self.tile_size)):
+            for tx in range(x0 // self.tile_size, -(-x1 // self.tile_size)):
+                rows = slice(ty * self.tile_size, min((ty + 1) * self.tile_size, level_h))
+                cols = slice(tx * self.tile_size, min((tx + 1) * self.tile_size, level_w))
+                tile = {
+                    'tx': tx,
+                    'ty': ty,
+                    'x': cols.start * scale,
+                    'y': rows.start * scale,
+                    'scale': scale,
+                    'min': float(data['tile_min'][plane, ty, tx]),
+                    'max': float(data['tile_max'][plane, ty, tx])
+                }
+                if level == 0:
+                    # 원본 해상도는 화면에 보이는 영역만 원본 텐서에서 잘라서 전송
+                    tile['values'] = data['mean'][plane, rows, cols].tolist()
+                else:
+                    tile['mean'] = data['mean'][plane, rows, cols].tolist()
+                    tile['max_values'] = data['max'][plane, rows, cols].tolist()
+                result.append(tile)
+        return result
@@ -0,0 +1,126 @@
+import numpy as np
+
+# 비교 대상이 되는 반복 데이터의 섹션
+DIFF_SECTIONS = ('initial_weights', 'updated_weights', 'gradients', 'forward', 'backward')
+
+
+def _iter_arrays(iteration):
+    """반복 데이터 안의 모든 NumPy 배열을 ('섹션/레이어/키', 배열) 형태로 나열"""
+    for section in DIFF_SECTIONS:
+        for name, value in iteration.get(section, {}).items():
+            if isinstance(value, dict):
+                for key, array in value.items():
+                    if isinstance(array, np.ndarray):
+                        yield f'{section}/{name}/{key}', array
+            elif isinstance(value, np.ndarray):
+                yield f'{section}/{name}', value
+
+
+def _to_coo(mask, values):
+    """마스크가 참인 원소만 COO 희소 형식으로 변환"""
+    indices = np.nonzero(mask)
+    return {
+        'indices': np.stack(indices).tolist() if indices else [],
+        'values': values[mask].tolist(),
+        'nnz': int(mask.sum())
+    }
+
+
+def diff_arrays(a, b, threshold=None, include_dense=False):
+    """두 텐서의 원소별 변화량, 변화 노름, 부호 반전 수를 계산"""
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    delta = b - a
+
+    base_norm = float(np.linalg.norm(a))
+    delta_norm = float(np.linalg.norm(delta))
+    sign_flips = (np.sign(a) * np.sign(b)) < 0
+
+    result = {
+        'shape': list(delta.shape),
+        'delta_norm': delta_norm,
+        'relative_norm': delta_norm / base_norm if base_norm > 0 else None,
+        'max_abs_delta': float(np.abs(delta).max()) if delta.size else 0.0,
+        'sign_flips': int(sign_flips.sum())
+    }
+    if threshold is not None:
+        result['sparse'] = _to_coo(np.abs(delta) > threshold, delta)
+    if include_dense:
+        result['delta'] = delta.tolist()
+    return result
+
+
+def diff_iterations(a, b, threshold=None, include_dense=False, changed_only=False):
+    """두 반복 데이터를 비교해 텐서별 변화와 ReLU 마스크/MaxPool argmax 변화를 반환"""
+    arrays_b = dict(_iter_arrays(b))
+    tensors = {}
+    for path, array_a in _iter_arrays(a):
+        array_b = arrays_b.get(path)
+        if array_b is None or array_b.shape != array_a.shape:
+            continue
+        # 값이 완전히 같은 텐서는 전송하지 않을 수 있음
+        if changed_only and np.array_equal(array_a, array_b):
+            continue
+        tensors[path] = diff_arrays(array_a, array_b, threshold, include_dense)
+
+    result = {
+        'loss_delta': b['loss'] - a['loss'],
+        'tensors': tensors
+    }
+
+    # ReLU 활성 마스크가 바뀐 위치
+    mask_a = a.get('forward', {}).get('relu', {}).get('mask')
+    mask_b = b.get('forward', {}).get('relu', {}).get('mask')
+    if mask_a is not None and mask_b is not None and mask_a.shape == mask_b.shape:
+        changed = mask_a != mask_b
+        result['relu_mask_changes'] = _to_coo(changed, mask_b.astype(np.int8) - mask_a.astype(np.int8))
+
+    # MaxPool에서 최대값 위치(argmax)가 바뀐 출력 위치
+    idx_a = a.get('forward', {}).get('pool', {}).get('indices')
+    idx_b = b.get('forward', {}).get('pool', {}).get('indices')
+    if idx_a is not None and idx_b is not None and idx_a.shape == idx_b.shape:
+        switched = idx_a != idx_b
+        result['pool_argmax_switches'] = {
+            **_to_coo(switched, idx_b),
+            'previous': idx_a[switched].tolist()
+        }
+
+    return result
+
+
+def diff_weight_update(iteration, threshold=None, include_dense=False):
+    """한 반복 안에서 초기 가중치와 업데이트된 가중치를 비교"""
+    return {
+        name: diff_arrays(iteration['initial_weights'][name], iteration['updated_weights'][name],
+                          threshold, include_dense)
+        for name in iteration['initial_weights']
+    }
+
+
+def diff_runs(iterations_a, iterations_b, threshold=None, include_dense=False):
+    """두 실행을 같은 반복 번호(step)끼리 비교 (바뀐 텐서만 포함)
+
+    반복 데이터를 하나씩 내주는 iterable을 받으므로 재생 실행도 한 반복씩만 메모리에 둠.
+    두 실행 모두 step이 증가하는 순서로 기록되므로 병합하듯 짝을 맞추고,
+    한쪽에만 있는 반복의 step과 각 실행의 반복 수를 함께 반환함.
+    """
+    result = {'iterations': [], 'length_a': 0, 'length_b': 0, 'only_in_a': [], 'only_in_b': []}
+    iter_a, iter_b = iter(iterations_a), iter(iterations_b)
+    a, b = next(iter_a, None), next(iter_b, None)
+    while a is not None or b is not None:
+        if b is None or (a is not None and a['step'] < b['step']):
+            result['only_in_a'].append(a['step'])
+            result['length_a'] += 1
+            a = next(iter_a, None)
+        elif a is None or b['step'] < a['step']:
+            result['only_in_b'].append(b['step'])
+            result['length_b'] += 1
+            b = next(iter_b, None)
+        else:
+            diff = diff_iterations(a, b, threshold, include_dense, changed_only=True)
+            result['iterations'].append({'step': a['step'], **diff})
+            result['length_a'] += 1
+            result['length_b'] += 1
+            a, b = next(iter_a, None), next(iter_b, None)
+    result['length_mismatch'] = result['length_a'] != result['length_b']
+    return result
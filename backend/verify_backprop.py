@@ -6,7 +6,7 @@ import json
 import os
 from model import SimpleCNN
 from visualizer import ModelVisualizer
-import matplotlib.pyplot as plt
+from replay_store import record_replay_run
 import math
 
 def verify_gradients():
@@ -224,9 +224,6 @@ def visualize_gradient_flow():
     """
     print("\n=== 그래디언트 흐름 시각화 ===")
     
-    # 모델 초기화
-    model = SimpleCNN()
-    
     # 입력과 타깃
     input_data = torch.tensor([[[[1.0, 2.0, 3.0, 4.0],
                                [5.0, 6.0, 7.0, 8.0],
@@ -234,55 +231,31 @@ def visualize_gradient_flow():
                                [13.0, 14.0, 15.0, 16.0]]]], dtype=torch.float32)
     target = torch.tensor([0], dtype=torch.long)
     
-    # 3번의 에포크 동안 그래디언트 변화 추적
+    # 3번의 에포크 동안 그래디언트 변화 추적 (반복 데이터는 요약만 보관하고 곡선은 gradient_history에서 조회)
     epochs = 3
-    layer_names = ['Conv2d', 'ReLU', 'MaxPool2d', 'Linear']
-    gradients_history = {name: [] for name in layer_names}
-    
-    for epoch in range(epochs):
-        # 순전파 및 역전파
-        model.zero_grad()
-        
-        # 중간 텐서들 저장
-        x = input_data.clone().requires_grad_(True)
-        
-        conv_out = model.conv1(x)
-        conv_out.retain_grad()
-        
-        relu_out = F.relu(conv_out)
-        relu_out.retain_grad()
-        
-        pool_out = model.pool1(relu_out)
-        pool_out.retain_grad()
-        
-        flatten = pool_out.view(input_data.size(0), -1)
-        flatten.retain_grad()
-        
-        fc_out = model.fc(flatten)
-        fc_out.retain_grad()
-        
-        # 손실 계산 및 역전파
-        criterion = nn.CrossEntropyLoss()
-        loss = criterion(fc_out, target)
-        loss.backward()
-        
-        # 각 레이어의 그래디언트 크기 저장
-        gradients_history['Conv2d'].append(model.conv1.weight.grad.norm().item())
-        gradients_history['ReLU'].append(conv_out.grad.norm().item())
-        gradients_history['MaxPool2d'].append(relu_out.grad.norm().item())
-        gradients_history['Linear'].append(model.fc.weight.grad.norm().item())
-        
-        # 가중치 업데이트 (SGD)
-        with torch.no_grad():
-            lr = 0.01
-            model.conv1.weight -= lr * model.conv1.weight.grad
-            model.fc.weight -= lr * model.fc.weight.grad
-            model.fc.bias -= lr * model.fc.bias.grad
+    visualizer = ModelVisualizer(SimpleCNN(), learning_rate=0.01, capture='summary',
+                                 record_history=True)
+    visualizer.run_epochs(input_data, target, epochs)
+    
+    # 레이어 이름 -> 기록 열 (ReLU/MaxPool2d는 각 레이어 입력, 즉 이전 레이어 출력의 그래디언트)
+    columns = {
+        'Conv2d': 'grad_norm/conv1_weight',
+        'ReLU': 'activation_grad_norm/conv',
+        'MaxPool2d': 'activation_grad_norm/relu',
+        'Linear': 'grad_norm/fc_weight'
+    }
+    _, curves = visualizer.gradient_history.range(columns=list(columns.values()))
+    gradients_history = {name: curves[column] for name, column in columns.items()}
     
     # 그래디언트 흐름 시각화를 위한 결과 출력
     print("에포크별 그래디언트 크기 변화:")
-    for name in layer_names:
-        print(f"{name}: {[round(grad, 6) for grad in gradients_history[name]]}")
+    for name, values in gradients_history.items():
+        print(f"{name}: {np.round(values, 6).tolist()}")
+    
+    # 업데이트 비율 |Δw|/|w| (너무 크거나 작으면 학습률 조정 필요)
+    _, ratios = visualizer.gradient_history.range(columns=['update_ratio/conv1_weight', 'update_ratio/fc_weight'])
+    for column, values in ratios.items():
+        print(f"{column}: {np.round(values, 6).tolist()}")
     
     # 여기서는 시각화만 확인하고 실제 플롯은 생성하지 않음
     return gradients_history
@@ -419,6 +392,67 @@ def calculate_expected_vs_actual_gradients():
     
     return True
 
+def _compare_traces(expected, actual, path=''):
+    """두 반복 데이터에서 값이 다른 항목의 (경로, 최대 절대 오차) 목록"""
+    if isinstance(expected, dict):
+        mismatches = []
+        for key, value in expected.items():
+            if key not in actual:
+                mismatches.append((f'{path}/{key}', None))
+            else:
+                mismatches += _compare_traces(value, actual[key], f'{path}/{key}')
+        return mismatches
+    if isinstance(expected, np.ndarray):
+        if expected.shape != actual.shape:
+            return [(path, None)]
+        error = float(np.abs(expected.astype(np.float64) - actual.astype(np.float64)).max()) if expected.size else 0.0
+        return [(path, error)] if error > 0 else []
+    return [] if expected == actual else [(path, None)]
+
+def verify_replay_matches_full_run():
+    """
+    체크포인트에서 재생한 반복(ReplayRun.iteration)이 전체 기록 실행의 같은 반복과 값까지 같은지 검증
+    체크포인트 사이의 반복, 캐시 적중, 캐시된 이전 반복에서 이어서 재생하는 경우를 모두 확인
+    """
+    print("\n=== 재생 실행 vs 전체 기록 실행 ===")
+    
+    input_data = torch.tensor([[[[1.0, 2.0, 3.0, 4.0],
+                               [5.0, 6.0, 7.0, 8.0],
+                               [9.0, 10.0, 11.0, 12.0],
+                               [13.0, 14.0, 15.0, 16.0]]]], dtype=torch.float32)
+    target = torch.tensor([0], dtype=torch.long)
+    num_steps, lr = 12, 0.01
+    
+    full_run = ModelVisualizer(SimpleCNN(), learning_rate=lr).run_epochs(input_data, target, num_steps)
+    replay_run = record_replay_run('verify', lambda: (input_data, target), num_steps, lr,
+                                   checkpoint_interval=5, cache_size=3)
+    
+    # 7: 체크포인트 5부터 재생, 8: 캐시된 7에서 이어서 재생, 3: 체크포인트 0부터 재생,
+    # 11: 체크포인트 10부터 재생, 11(두 번째): 캐시 적중, 0: 체크포인트 자체
+    order = [7, 8, 3, 11, 11, 0]
+    all_match = True
+    for index in order:
+        mismatches = _compare_traces(full_run[index], replay_run.iteration(index))
+        if mismatches:
+            all_match = False
+            print(f"반복 {index}: 불일치 {len(mismatches)}개 - {mismatches[:5]}")
+        else:
+            print(f"반복 {index}: 일치")
+    
+    # 순차 조회(실행 비교, HTML 내보내기 경로)도 같은 결과인지 확인
+    for index, iteration in enumerate(replay_run.iter_iterations()):
+        if _compare_traces(full_run[index], iteration):
+            all_match = False
+            print(f"순차 재생 반복 {index}: 불일치")
+    
+    stats = replay_run.stats()
+    print(f"재생 통계: {stats}")
+    if stats['hits'] < 1:
+        all_match = False
+        print("캐시 적중이 한 번도 없었습니다.")
+    print(f"재생 결과 일치: {'예' if all_match else '아니오'}")
+    return all_match
+
 if __name__ == "__main__":
     # 역전파 그래디언트 검증
     verify_gradients()
@@ -428,3 +462,6 @@ if __name__ == "__main__":
     
     # 예상 vs 실제 그래디언트 비교
     calculate_expected_vs_actual_gradients()
+    
+    # 체크포인트 재생 결과 검증
+    verify_replay_matches_full_run()
@@ -3,14 +3,32 @@ import torch.nn as nn
 import torch.nn.functional as F
 import numpy as np
 from model import SimpleCNN
+from compiled_capture import get_compiled_step
+from gradient_history import GradientHistory
 import copy
 from collections import defaultdict
 
+# 'summary' 캡처에서 보관하는 항목 (순전파/역전파 중간 텐서와 입력은 제외)
+SUMMARY_KEYS = ('step', 'learning_rate', 'loss', 'target', 'initial_weights', 'updated_weights',
+                'gradients', 'weight_delta')
+
 class ModelVisualizer:
-    def __init__(self, model, learning_rate=0.01):
+    def __init__(self, model, learning_rate=0.01, history_limit=None, capture_mode='eager',
+                 capture='full', capture_stride=1, record_history=False):
         self.model = model
         self.learning_rate = learning_rate
+        # 'eager' 또는 컴파일된 캡처 경로 ('script': TorchScript, 'compile': torch.compile)
+        self.capture_mode = capture_mode
+        # 보관할 최근 반복 수 (None이면 모두 보관, 장시간 실시간 학습용)
+        self.history_limit = history_limit
+        # 기록 범위 ('full' 또는 'summary')와 기록 간격 (capture_stride번째 반복마다 기록)
+        self.capture = capture
+        self.capture_stride = capture_stride
+        self.step_count = 0
         self.iterations = []
+        # 모든 반복의 손실/그래디언트 크기/업데이트 비율 곡선 (캡처 범위, 간격, 보관 개수와 무관)
+        # 반복마다 계속 커지므로 끝이 정해진 실행에서만 켬 (실시간 학습, 재생용 재계산에서는 끔)
+        self.gradient_history = GradientHistory() if record_history else None
         
     def _compute_conv2d_matrix_form(self, input_tensor, layer):
         """Conv2d 연산을 행렬로 표현하는 함수"""
@@ -93,8 +111,30 @@ class ModelVisualizer:
             'stride': stride
         }
     
+    def forward_activations(self, input_batch):
+        """역전파 없이 배치 순전파를 수행하고 레이어별 활성값을 (배치, 유닛) 형태로 반환"""
+        with torch.no_grad():
+            conv_out = self.model.conv1(input_batch)
+            relu_out = F.relu(conv_out)
+            pool_out = self.model.pool1(relu_out)
+            flatten = pool_out.reshape(pool_out.size(0), -1)
+            fc_out = self.model.fc(flatten)
+        
+        batch_size = input_batch.size(0)
+        return {
+            'conv': conv_out.reshape(batch_size, -1).numpy(),
+            'pool': flatten.numpy(),
+            'fc': fc_out.numpy()
+        }
+    
     def run_iteration(self, input_data, target):
         """한 번의 반복(iteration)을 실행하고 모든 계산 과정 추적"""
+        # 컴파일된 캡처 경로를 사용할 수 있으면 사용하고, 아니면 기존 경로로 실행
+        if self.capture_mode != 'eager':
+            step = get_compiled_step(self.model, input_data.shape, self.learning_rate, self.capture_mode)
+            if step is not None:
+                return self._run_iteration_compiled(step, input_data, target)
+        
         iteration_data = {
             'input_data': input_data.detach().numpy(),
             'target': target.detach().numpy(),
@@ -271,7 +311,129 @@ class ModelVisualizer:
             'expected_fc_bias': (-self.learning_rate * self.model.fc.bias.grad.detach()).numpy()
         }
         
-        self.iterations.append(iteration_data)
+        return self._record(iteration_data)
+    
+    def _run_iteration_compiled(self, step, input_data, target):
+        """컴파일된 스텝으로 한 번의 반복을 실행하고 run_iteration과 같은 형태로 기록"""
+        # 모델 파라미터는 복사본을 넘겨 이후 업데이트가 기록된 값에 영향을 주지 않도록 함
+        conv_w = self.model.conv1.weight.detach().clone()
+        fc_w = self.model.fc.weight.detach().clone()
+        fc_b = self.model.fc.bias.detach().clone()
+        one_hot = F.one_hot(target, self.model.fc.out_features).to(input_data.dtype)
+        
+        with torch.no_grad():
+            (unfolded, weight_matrix, conv_out, relu_mask, relu_out, pool_out, indices, flatten, fc_out,
+             loss, fc_output_grad, flatten_grad, pool_out_grad, relu_out_grad, conv_out_grad,
+             conv_w_grad, fc_w_grad, fc_b_grad, new_conv_w, new_fc_w, new_fc_b) = step(
+                input_data, one_hot, conv_w, fc_w, fc_b
+            )
+            
+            # 가중치 업데이트
+            self.model.conv1.weight.copy_(new_conv_w)
+            self.model.fc.weight.copy_(new_fc_w)
+            self.model.fc.bias.copy_(new_fc_b)
+            
+            # 시각화 확인용 예상 그래디언트는 컴파일된 스텝의 결과를 그대로 쓰지 않고 eager로 따로 계산
+            expected_flatten_grad = torch.matmul(fc_output_grad, fc_w)
+            expected_conv_out_grad = relu_out_grad * (conv_out > 0).float()
+        
+        iteration_data = {
+            'input_data': input_data.detach().numpy(),
+            'target': target.detach().numpy(),
+            'learning_rate': self.learning_rate,
+            'loss': loss.item(),
+            'initial_weights': {
+                'conv1_weight': conv_w.numpy(),
+                'fc_weight': fc_w.numpy(),
+                'fc_bias': fc_b.numpy()
+            },
+            'forward': {
+                'conv': {
+                    'input_tensor': input_data.detach().numpy(),
+                    'weight_tensor': conv_w.numpy(),
+                    'unfolded_input': unfolded.numpy(),
+                    'weight_matrix': weight_matrix.numpy(),
+                    'output_tensor': conv_out.numpy()
+                },
+                'relu': {
+                    'input_tensor': conv_out.numpy(),
+                    'output_tensor': relu_out.numpy(),
+                    'mask': relu_mask.numpy()
+                },
+                'pool': {
+                    'input_tensor': relu_out.numpy(),
+                    'output_tensor': pool_out.numpy(),
+                    'indices': indices.numpy(),
+                    'kernel_size': self.model.pool1.kernel_size,
+                    'stride': self.model.pool1.stride
+                },
+                'fc': {
+                    'input_tensor': flatten.numpy(),
+                    'weight': fc_w.numpy(),
+                    'bias': fc_b.numpy(),
+                    'output': fc_out.numpy()
+                }
+            },
+            'gradients': {
+                'conv1_weight_grad': conv_w_grad.numpy(),
+                'fc_weight_grad': fc_w_grad.numpy(),
+                'fc_bias_grad': fc_b_grad.numpy()
+            },
+            'backward': {
+                'fc': {
+                    'output_grad': fc_output_grad.numpy(),
+                    'input_grad': flatten_grad.numpy(),
+                    'weight_grad': fc_w_grad.numpy(),
+                    'bias_grad': fc_b_grad.numpy(),
+                    'expected_input_grad': expected_flatten_grad.numpy()
+                },
+                'pool': {
+                    'output_grad': pool_out_grad.numpy(),
+                    'input_grad': relu_out_grad.numpy()
+                },
+                'relu': {
+                    'output_grad': relu_out_grad.numpy(),
+                    'input_grad': conv_out_grad.numpy(),
+                    'mask': relu_mask.numpy(),
+                    'expected_input_grad': expected_conv_out_grad.numpy()
+                },
+                'conv': {
+                    'output_grad': conv_out_grad.numpy(),
+                    'weight_grad': conv_w_grad.numpy()
+                }
+            },
+            'updated_weights': {
+                'conv1_weight': new_conv_w.numpy(),
+                'fc_weight': new_fc_w.numpy(),
+                'fc_bias': new_fc_b.numpy()
+            },
+            'weight_delta': {
+                'conv1_weight': (new_conv_w - conv_w).numpy(),
+                'fc_weight': (new_fc_w - fc_w).numpy(),
+                'fc_bias': (new_fc_b - fc_b).numpy(),
+                'expected_conv1_weight': (-self.learning_rate * conv_w_grad).numpy(),
+                'expected_fc_weight': (-self.learning_rate * fc_w_grad).numpy(),
+                'expected_fc_bias': (-self.learning_rate * fc_b_grad).numpy()
+            }
+        }
+        
+        return self._record(iteration_data)
+    
+    def _record(self, iteration_data):
+        """캡처 설정(범위, 간격, 보관 개수)에 따라 반복 데이터를 기록"""
+        iteration_data['step'] = self.step_count
+        self.step_count += 1
+        if self.gradient_history is not None:
+            self.gradient_history.append(iteration_data)
+        if iteration_data['step'] % self.capture_stride:
+            return iteration_data
+        
+        if self.capture == 'summary':
+            self.iterations.append({k: iteration_data[k] for k in SUMMARY_KEYS})
+        else:
+            self.iterations.append(iteration_data)
+        if self.history_limit is not None and len(self.iterations) > self.history_limit:
+            del self.iterations[:-self.history_limit]
         return iteration_data
     
     def run_epochs(self, input_data, target, num_epochs=3):
@@ -281,3 +443,12 @@ class ModelVisualizer:
             self.run_iteration(input_data, target)
         
         return self.iterations
+    
+    def run_sampler(self, sampler, num_epochs=3):
+        """샘플러가 공급하는 데이터로 지정된 에포크 수만큼 학습 반복 실행"""
+        for epoch in range(num_epochs):
+            print(f"Running epoch {epoch+1}/{num_epochs}")
+            input_data, target = next(sampler)
+            self.run_iteration(input_data, target)
+        
+        return self.iterations
@@ -1,8 +1,10 @@
 import React, { useState, useEffect } from 'react';
 import axios from 'axios';
-import { Container, Spinner, Alert } from 'react-bootstrap';
+import { Container, Spinner, Alert, Form } from 'react-bootstrap';
 import ModelArchitecture from './components/ModelArchitecture';
 import IterationView from './components/IterationView';
+import { isExportedTrace, loadManifest, decodeIteration } from './utils/exportedTrace';
+import { PyramidContext } from './utils/pyramidClient';
 import './App.css';
 
 function App() {
@@ -10,8 +12,21 @@ function App() {
   const [error, setError] = useState(null);
   const [modelData, setModelData] = useState(null);
   const [iterations, setIterations] = useState([]);
+  // 큰 텐서의 피라미드 타일을 요청할 실행 ID
+  const [runId, setRunId] = useState(null);
+  // 내보낸 HTML에서 실행 중일 때의 매니페스트와 선택한 반복
+  const [exportManifest, setExportManifest] = useState(null);
+  const [selectedIteration, setSelectedIteration] = useState(0);
 
   useEffect(() => {
+    // 내보낸 HTML이면 백엔드 대신 내장된 데이터를 사용
+    if (isExportedTrace()) {
+      const manifest = loadManifest();
+      setModelData(manifest.model_info);
+      setExportManifest(manifest);
+      return;
+    }
+
     const fetchData = async () => {
       try {
         setLoading(true);
@@ -22,6 +37,7 @@ function App() {
         // 시각화 데이터 가져오기
         const visualizationResponse = await axios.post('/api/run_visualization', { epochs: 3 });
         setIterations(visualizationResponse.data.iterations);
+        setRunId(visualizationResponse.data.run_id);
         
         setLoading(false);
       } catch (err) {
@@ -34,6 +50,29 @@ function App() {
     fetchData();
   }, []);
 
+  useEffect(() => {
+    if (!exportManifest) {
+      return;
+    }
+    // 선택한 반복만 필요할 때 압축 해제
+    let cancelled = false;
+    decodeIteration(exportManifest, selectedIteration)
+      .then((iteration) => {
+        if (!cancelled) {
+          setIterations([iteration]);
+          setLoading(false);
+        }
+      })
+      .catch((err) => {
+        setError('내보낸 데이터를 읽는 중 오류가 발생했습니다.');
+        setLoading(false);
+        console.error('Error decoding exported trace:', err);
+      });
+    return () => {
+      cancelled = true;
+    };
+  }, [exportManifest, selectedIteration]);
+
   if (loading) {
     return (
       <Container className="text-center py-5">
@@ -70,15 +109,34 @@ function App() {
         {modelData && <ModelArchitecture modelData={modelData} />}
       </section>
 
-      {iterations.map((iteration, index) => (
-        <section key={index} className="iteration-section mb-5">
-          <h2 className="section-title">Iteration {index + 1}</h2>
-          <IterationView 
-            iteration={iteration}
-            iterationIndex={index}
+      {exportManifest && (
+        <section className="mb-4">
+          <Form.Label>
+            Iteration {selectedIteration + 1} / {exportManifest.iterations.length}
+          </Form.Label>
+          <Form.Range
+            min={0}
+            max={exportManifest.iterations.length - 1}
+            value={selectedIteration}
+            onChange={(e) => setSelectedIteration(Number(e.target.value))}
           />
         </section>
-      ))}
+      )}
+
+      {iterations.map((iteration, index) => {
+        const iterationIndex = exportManifest ? selectedIteration : index;
+        return (
+          <section key={iterationIndex} className="iteration-section mb-5">
+            <h2 className="section-title">Iteration {iterationIndex + 1}</h2>
+            <PyramidContext.Provider value={{ runId, iterationIndex }}>
+              <IterationView 
+                iteration={iteration}
+                iterationIndex={iterationIndex}
+              />
+            </PyramidContext.Provider>
+          </section>
+        );
+      })}
 
       <footer className="text-center py-4 mt-5 border-top">
         <p className="text-muted">
@@ -1,6 +1,7 @@
 import React, { useState } from 'react';
 import { Row, Col, Form, Button } from 'react-bootstrap';
 import { InlineMath, BlockMath } from 'react-katex';
+import HeatmapCanvas, { shouldUseHeatmap } from './HeatmapCanvas';
 
 /**
  * Component for visualizing convolution operations at different positions
@@ -169,32 +170,39 @@ const ConvolutionVisualizer = ({ inputTensor, kernel, outputTensor }) => {
             <div className="tensor-container p-3 bg-light rounded">
               <h6 className="text-center mb-2">Input Tensor</h6>
               <div className="position-relative">
-                <table className="conv-table mx-auto">
-                  <tbody>
-                    {inputTensor.map((row, rowIdx) => (
-                      <tr key={rowIdx}>
-                        {row.map((value, colIdx) => {
-                          // Highlight convolution region for current selected position
-                          const isInKernelRegion = (
-                            rowIdx >= selectedPosition.i && 
-                            rowIdx < selectedPosition.i + kernelHeight && 
-                            colIdx >= selectedPosition.j && 
-                            colIdx < selectedPosition.j + kernelWidth
-                          );
-                          
-                          return (
-                            <td 
-                              key={colIdx}
-                              className={isInKernelRegion ? "highlight" : ""}
-                            >
-                              {value.toFixed(1)}
-                            </td>
-                          );
-                        })}
-                      </tr>
-                    ))}
-                  </tbody>
-                </table>
+                {shouldUseHeatmap(inputTensor) ? (
+                  <HeatmapCanvas
+                    tensor={inputTensor}
+                    highlightRegion={{ row: selectedPosition.i, col: selectedPosition.j, height: kernelHeight, width: kernelWidth }}
+                  />
+                ) : (
+                  <table className="conv-table mx-auto">
+                    <tbody>
+                      {inputTensor.map((row, rowIdx) => (
+                        <tr key={rowIdx}>
+                          {row.map((value, colIdx) => {
+                            // Highlight convolution region for current selected position
+                            const isInKernelRegion = (
+                              rowIdx >= selectedPosition.i && 
+                              rowIdx < selectedPosition.i + kernelHeight && 
+                              colIdx >= selectedPosition.j && 
+                              colIdx < selectedPosition.j + kernelWidth
+                            );
+                            
+                            return (
+                              <td 
+                                key={colIdx}
+                                className={isInKernelRegion ? "highlight" : ""}
+                              >
+                                {value.toFixed(1)}
+                              </td>
+                            );
+                          })}
+                        </tr>
+                      ))}
+                    </tbody>
+                  </table>
+                )}
               </div>
             </div>
           </Col>
@@ -219,22 +227,30 @@ const ConvolutionVisualizer = ({ inputTensor, kernel, outputTensor }) => {
           <Col md={5}>
             <div className="output-container p-3 bg-light rounded">
               <h6 className="text-center mb-2">Output Tensor</h6>
-              <table className="conv-table mx-auto">
-                <tbody>
-                  {outputTensor.map((row, rowIdx) => (
-                    <tr key={rowIdx}>
-                      {row.map((value, colIdx) => (
-                        <td 
-                          key={colIdx}
-                          className={(rowIdx === selectedPosition.i && colIdx === selectedPosition.j) ? "selected" : ""}
-                        >
-                          {value.toFixed(1)}
-                        </td>
-                      ))}
-                    </tr>
-                  ))}
-                </tbody>
-              </table>
+              {shouldUseHeatmap(outputTensor) ? (
+                <HeatmapCanvas
+                  tensor={outputTensor}
+                  highlightPosition={{ row: selectedPosition.i, col: selectedPosition.j }}
+                  onCellClick={(i, j) => setSelectedPosition({ i, j })}
+                />
+              ) : (
+                <table className="conv-table mx-auto">
+                  <tbody>
+                    {outputTensor.map((row, rowIdx) => (
+                      <tr key={rowIdx}>
+                        {row.map((value, colIdx) => (
+                          <td 
+                            key={colIdx}
+                            className={(rowIdx === selectedPosition.i && colIdx === selectedPosition.j) ? "selected" : ""}
+                          >
+                            {value.toFixed(1)}
+                          </td>
+                        ))}
+                      </tr>
+                    ))}
+                  </tbody>
+                </table>
+              )}
             </div>
           </Col>
         </Row>
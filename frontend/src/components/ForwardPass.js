@@ -2,6 +2,7 @@ import React from 'react';
 import { Row, Col, Accordion } from 'react-bootstrap';
 import { InlineMath, BlockMath } from 'react-katex';
 import TensorVisualizer from './TensorVisualizer';
+import { selectPlane } from '../utils/pyramidClient';
 import AnimatedCalculation from './AnimatedCalculation';
 import ConvolutionVisualizer from './ConvolutionVisualizer';
 import ReluVisualizer from './ReluVisualizer';
@@ -69,15 +70,15 @@ const ForwardPass = ({ forward }) => {
                 </div>
                 
                 <h6 className="mt-4">Kernel Weights</h6>
-                <TensorVisualizer tensor={forward.conv.weight_tensor[0][0]} />
+                <TensorVisualizer tensor={selectPlane(forward.conv.weight_tensor)} />
               </Col>
               
               <Col md={6}>
                 <h6>Input Tensor</h6>
-                <TensorVisualizer tensor={forward.conv.input_tensor[0][0]} />
+                <TensorVisualizer tensor={selectPlane(forward.conv.input_tensor)} />
                 
                 <h6 className="mt-4">Output Feature Map</h6>
-                <TensorVisualizer tensor={forward.conv.output_tensor[0][0]} />
+                <TensorVisualizer tensor={selectPlane(forward.conv.output_tensor)} />
                 
                 <div className="mt-4">
                   <h6>Matrix Representation</h6>
@@ -119,16 +120,16 @@ const ForwardPass = ({ forward }) => {
                 </div>
                 
                 <h6 className="mt-4">Input Tensor (Convolution Output)</h6>
-                <TensorVisualizer tensor={forward.relu.input_tensor[0][0]} />
+                <TensorVisualizer tensor={selectPlane(forward.relu.input_tensor)} />
               </Col>
               
               <Col md={6}>
                 <h6>Output Tensor</h6>
-                <TensorVisualizer tensor={forward.relu.output_tensor[0][0]} />
+                <TensorVisualizer tensor={selectPlane(forward.relu.output_tensor)} />
                 
                 <div className="mt-4">
                   <h6>ReLU Activation Mask (1: Active, 0: Inactive)</h6>
-                  <TensorVisualizer tensor={forward.relu.mask[0][0]} />
+                  <TensorVisualizer tensor={selectPlane(forward.relu.mask)} />
                 </div>
                 
                 <div className="mt-4">
@@ -171,16 +172,16 @@ const ForwardPass = ({ forward }) => {
                 </div>
                 
                 <h6 className="mt-4">Input Tensor (ReLU Output)</h6>
-                <TensorVisualizer tensor={forward.pool.input_tensor[0][0]} />
+                <TensorVisualizer tensor={selectPlane(forward.pool.input_tensor)} />
               </Col>
               
               <Col md={6}>
                 <h6>Output Tensor</h6>
-                <TensorVisualizer tensor={forward.pool.output_tensor[0][0]} />
+                <TensorVisualizer tensor={selectPlane(forward.pool.output_tensor)} />
                 
                 <div className="mt-4">
                   <h6>Maximum Value Indices</h6>
-                  <TensorVisualizer tensor={forward.pool.indices[0][0]} />
+                  <TensorVisualizer tensor={selectPlane(forward.pool.indices)} />
                   <p className="text-muted small">
                     Indices represent the flattened index in the input tensor.
                   </p>
@@ -224,7 +225,7 @@ const ForwardPass = ({ forward }) => {
                 
                 <h6 className="mt-4">Input Tensor (MaxPool Output)</h6>
                 <p>Shape: [1, 1, 2, 2]</p>
-                <TensorVisualizer tensor={forward.pool.output_tensor[0][0]} />
+                <TensorVisualizer tensor={selectPlane(forward.pool.output_tensor)} />
               </Col>
               
               <Col md={6}>
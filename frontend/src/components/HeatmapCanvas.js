@@ -0,0 +1,210 @@
+import React, { useEffect, useMemo, useRef, useState, useCallback } from 'react';
+import { fromNested } from '../utils/tensorKernels';
+
+// 이 셀 수를 넘는 텐서는 DOM 표 대신 캔버스 히트맵으로 표시
+export const DOM_TABLE_MAX_CELLS = 256;
+
+/**
+ * 텐서 셀 수 계산 (중첩 배열 또는 { data, shape } 타입 배열 텐서)
+ * @param {Array|Object} tensor - 텐서
+ * @returns {number} 셀 수
+ */
+export const countCells = (tensor) => {
+  if (!tensor) return 0;
+  if (ArrayBuffer.isView(tensor.data)) return tensor.data.length;
+  if (!Array.isArray(tensor)) return 0;
+  return Array.isArray(tensor[0]) ? tensor.length * tensor[0].length : tensor.length;
+};
+
+/**
+ * DOM 표 대신 히트맵을 써야 하는지 여부
+ * @param {Array|Object} tensor - 텐서
+ * @returns {boolean} 히트맵 사용 여부
+ */
+export const shouldUseHeatmap = (tensor) => (
+  Boolean(tensor && ArrayBuffer.isView(tensor.data)) || countCells(tensor) > DOM_TABLE_MAX_CELLS
+);
+
+// 1D/2D 텐서를 { data, rows, cols }로 정규화 (타입 배열은 복사하지 않고 그대로 사용)
+const toGrid = (tensor) => {
+  const typed = ArrayBuffer.isView(tensor.data) ? tensor : fromNested(tensor);
+  const { shape } = typed;
+  const cols = shape[shape.length - 1] || 1;
+  return { data: typed.data, rows: typed.data.length / cols, cols };
+};
+
+/**
+ * 보이는 영역만 그리는 캔버스 히트맵
+ * 양수는 파란색, 음수는 빨간색이며 |값| / 최대 |값|을 투명도로 사용
+ */
+const HeatmapCanvas = ({
+  tensor,
+  cellSize = 14,
+  maxHeight = 360,
+  highlightPosition,
+  highlightRegion,
+  onCellClick,
+  valueRange,
+  onViewportChange
+}) => {
+  const scrollRef = useRef(null);
+  const canvasRef = useRef(null);
+  const frameRef = useRef(null);
+  const [hover, setHover] = useState(null);
+
+  const grid = useMemo(() => toGrid(tensor), [tensor]);
+
+  // 색상 정규화용 최대 절대값 (텐서마다 한 번만 계산, valueRange가 주어지면 그 범위 사용)
+  const maxAbs = useMemo(() => {
+    if (valueRange) return Math.max(Math.abs(valueRange.min), Math.abs(valueRange.max)) || 1;
+    let result = 0;
+    for (let i = 0; i < grid.data.length; i++) {
+      const value = Math.abs(grid.data[i]);
+      if (value > result) result = value;
+    }
+    return result || 1;
+  }, [grid, valueRange]);
+
+  const draw = useCallback(() => {
+    frameRef.current = null;
+    const scroller = scrollRef.current;
+    const canvas = canvasRef.current;
+    if (!scroller || !canvas) return;
+
+    const { data, rows, cols } = grid;
+    const viewWidth = scroller.clientWidth;
+    const viewHeight = scroller.clientHeight;
+    const ratio = window.devicePixelRatio || 1;
+    if (canvas.width !== viewWidth * ratio || canvas.height !== viewHeight * ratio) {
+      canvas.width = viewWidth * ratio;
+      canvas.height = viewHeight * ratio;
+      canvas.style.width = `${viewWidth}px`;
+      canvas.style.height = `${viewHeight}px`;
+    }
+
+    // 보이는 셀 범위
+    const firstRow = Math.floor(scroller.scrollTop / cellSize);
+    const firstCol = Math.floor(scroller.scrollLeft / cellSize);
+    const lastRow = Math.min(rows, Math.ceil((scroller.scrollTop + viewHeight) / cellSize));
+    const lastCol = Math.min(cols, Math.ceil((scroller.scrollLeft + viewWidth) / cellSize));
+    const visibleRows = Math.max(0, lastRow - firstRow);
+    const visibleCols = Math.max(0, lastCol - firstCol);
+    // 보이는 셀 범위를 알려 부모가 필요한 부분만 더 자세히 불러올 수 있도록 함
+    if (onViewportChange) onViewportChange({ firstRow, firstCol, lastRow, lastCol });
+
+    const ctx = canvas.getContext('2d');
+    ctx.setTransform(ratio, 0, 0, ratio, 0, 0);
+    ctx.clearRect(0, 0, viewWidth, viewHeight);
+    if (visibleRows === 0 || visibleCols === 0) return;
+
+    // 셀 하나를 픽셀 하나로 채운 뒤 확대해서 그림 (셀마다 fillRect를 호출하지 않음)
+    const image = new ImageData(visibleCols, visibleRows);
+    const pixels = image.data;
+    for (let r = 0; r < visibleRows; r++) {
+      const rowOffset = (firstRow + r) * cols + firstCol;
+      for (let c = 0; c < visibleCols; c++) {
+        const value = data[rowOffset + c];
+        const p = (r * visibleCols + c) * 4;
+        const alpha = Math.min(1, Math.abs(value) / maxAbs);
+        if (value >= 0) {
+          pixels[p] = 0; pixels[p + 1] = 123; pixels[p + 2] = 255;
+        } else {
+          pixels[p] = 220; pixels[p + 1] = 53; pixels[p + 2] = 69;
+        }
+        pixels[p + 3] = Math.round(alpha * 255);
+      }
+    }
+    const offscreen = document.createElement('canvas');
+    offscreen.width = visibleCols;
+    offscreen.height = visibleRows;
+    offscreen.getContext('2d').putImageData(image, 0, 0);
+
+    const originX = firstCol * cellSize - scroller.scrollLeft;
+    const originY = firstRow * cellSize - scroller.scrollTop;
+    ctx.imageSmoothingEnabled = false;
+    ctx.drawImage(offscreen, originX, originY, visibleCols * cellSize, visibleRows * cellSize);
+
+    // 선택 영역과 선택 셀 강조
+    const strokeCells = (row, col, height, width, color) => {
+      ctx.strokeStyle = color;
+      ctx.lineWidth = 2;
+      ctx.strokeRect(
+        col * cellSize - scroller.scrollLeft + 1,
+        row * cellSize - scroller.scrollTop + 1,
+        width * cellSize - 2,
+        height * cellSize - 2
+      );
+    };
+    if (highlightRegion) {
+      strokeCells(highlightRegion.row, highlightRegion.col, highlightRegion.height, highlightRegion.width, '#198754');
+    }
+    if (highlightPosition) {
+      strokeCells(highlightPosition.row, highlightPosition.col, 1, 1, '#ff8c00');
+    }
+  }, [grid, maxAbs, cellSize, highlightPosition, highlightRegion, onViewportChange]);
+
+  // 스크롤과 크기 변경은 다음 애니메이션 프레임에 한 번만 다시 그림
+  const scheduleDraw = useCallback(() => {
+    if (frameRef.current === null) {
+      frameRef.current = requestAnimationFrame(draw);
+    }
+  }, [draw]);
+
+  useEffect(() => {
+    scheduleDraw();
+    const scroller = scrollRef.current;
+    const observer = typeof ResizeObserver !== 'undefined' ? new ResizeObserver(scheduleDraw) : null;
+    if (observer && scroller) observer.observe(scroller);
+    return () => {
+      if (observer) observer.disconnect();
+      if (frameRef.current !== null) {
+        cancelAnimationFrame(frameRef.current);
+        frameRef.current = null;
+      }
+    };
+  }, [scheduleDraw]);
+
+  const cellAt = (event) => {
+    const scroller = scrollRef.current;
+    const bounds = scroller.getBoundingClientRect();
+    const row = Math.floor((event.clientY - bounds.top + scroller.scrollTop) / cellSize);
+    const col = Math.floor((event.clientX - bounds.left + scroller.scrollLeft) / cellSize);
+    if (row < 0 || col < 0 || row >= grid.rows || col >= grid.cols) return null;
+    return { row, col, value: grid.data[row * grid.cols + col] };
+  };
+
+  const handleClick = (event) => {
+    const cell = cellAt(event);
+    if (cell && onCellClick) onCellClick(cell.row, cell.col);
+  };
+
+  return (
+    <div className="heatmap-canvas">
+      <div style={{ position: 'relative' }}>
+        <canvas ref={canvasRef} style={{ position: 'absolute', top: 0, left: 0, pointerEvents: 'none' }} />
+        <div
+          ref={scrollRef}
+          onScroll={scheduleDraw}
+          onMouseMove={(event) => setHover(cellAt(event))}
+          onMouseLeave={() => setHover(null)}
+          onClick={handleClick}
+          style={{
+            overflow: 'auto',
+            maxHeight: `${maxHeight}px`,
+            cursor: onCellClick ? 'pointer' : 'crosshair'
+          }}
+        >
+          <div style={{ width: `${grid.cols * cellSize}px`, height: `${grid.rows * cellSize}px` }} />
+        </div>
+      </div>
+      <div className="text-muted small mt-1">
+        [{grid.rows} × {grid.cols}]
+        {hover
+          ? ` (${hover.row}, ${hover.col}) = ${hover.value.toFixed(6)}`
+          : ` max |value| ${maxAbs.toFixed(4)}`}
+      </div>
+    </div>
+  );
+};
+
+export default HeatmapCanvas;
@@ -2,6 +2,7 @@ import React from 'react';
 import { Card, Row, Col, Accordion } from 'react-bootstrap';
 import { InlineMath, BlockMath } from 'react-katex';
 import TensorVisualizer from './TensorVisualizer';
+import { selectPlane } from '../utils/pyramidClient';
 import ForwardPass from './ForwardPass';
 import BackwardPass from './BackwardPass';
 
@@ -15,7 +16,7 @@ const IterationView = ({ iteration, iterationIndex }) => {
               <Card.Title>Input Data and Settings</Card.Title>
               <div className="mb-3">
                 <h6>Input Tensor (4x4)</h6>
-                <TensorVisualizer tensor={iteration.input_data[0][0]} />
+                <TensorVisualizer tensor={selectPlane(iteration.input_data)} />
                 <p className="mt-2 text-muted">Shape: [1, 1, 4, 4] (batch size, channels, height, width)</p>
               </div>
               
@@ -46,10 +47,10 @@ const IterationView = ({ iteration, iterationIndex }) => {
                   <Accordion.Header>Convolutional Layer Weights</Accordion.Header>
                   <Accordion.Body>
                     <h6>Initial Weights</h6>
-                    <TensorVisualizer tensor={iteration.initial_weights.conv1_weight[0][0]} />
+                    <TensorVisualizer tensor={selectPlane(iteration.initial_weights.conv1_weight)} />
                     
                     <h6 className="mt-3">Updated Weights</h6>
-                    <TensorVisualizer tensor={iteration.updated_weights.conv1_weight[0][0]} />
+                    <TensorVisualizer tensor={selectPlane(iteration.updated_weights.conv1_weight)} />
                     
                     {iterationIndex > 0 && (
                       <div className="mt-2 text-muted">
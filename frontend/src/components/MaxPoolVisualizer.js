@@ -1,6 +1,7 @@
 import React, { useState } from 'react';
 import { Row, Col, Form, Button } from 'react-bootstrap';
 import { InlineMath, BlockMath } from 'react-katex';
+import HeatmapCanvas, { shouldUseHeatmap } from './HeatmapCanvas';
 
 /**
  * Component for visualizing MaxPool operations at different positions
@@ -161,58 +162,73 @@ const MaxPoolVisualizer = ({ inputTensor, outputTensor, kernelSize = 2, stride =
           <Col md={7}>
             <div className="tensor-container p-3 bg-light rounded">
               <h6 className="text-center mb-2">Input Tensor with Pooling Window</h6>
-              <table className="tensor-table mx-auto">
-                <tbody>
-                  {inputTensor.map((row, rowIdx) => (
-                    <tr key={rowIdx}>
-                      {row.map((value, colIdx) => {
-                        // Check if this cell is in the current pooling window
-                        const isInWindow = (
-                          rowIdx >= startRow && rowIdx < endRow &&
-                          colIdx >= startCol && colIdx < endCol
-                        );
-                        
-                        // Check if this cell has the maximum value
-                        const isMaxValue = isInWindow && Math.abs(value - maxValue) < 0.001;
-                        
-                        return (
-                          <td 
-                            key={colIdx}
-                            className={`
-                              ${isInWindow ? "in-window" : ""}
-                              ${isMaxValue ? "max-value" : ""}
-                            `}
-                          >
-                            {value.toFixed(1)}
-                          </td>
-                        );
-                      })}
-                    </tr>
-                  ))}
-                </tbody>
-              </table>
+              {shouldUseHeatmap(inputTensor) ? (
+                <HeatmapCanvas
+                  tensor={inputTensor}
+                  highlightRegion={{ row: startRow, col: startCol, height: endRow - startRow, width: endCol - startCol }}
+                />
+              ) : (
+                <table className="tensor-table mx-auto">
+                  <tbody>
+                    {inputTensor.map((row, rowIdx) => (
+                      <tr key={rowIdx}>
+                        {row.map((value, colIdx) => {
+                          // Check if this cell is in the current pooling window
+                          const isInWindow = (
+                            rowIdx >= startRow && rowIdx < endRow &&
+                            colIdx >= startCol && colIdx < endCol
+                          );
+                          
+                          // Check if this cell has the maximum value
+                          const isMaxValue = isInWindow && Math.abs(value - maxValue) < 0.001;
+                          
+                          return (
+                            <td 
+                              key={colIdx}
+                              className={`
+                                ${isInWindow ? "in-window" : ""}
+                                ${isMaxValue ? "max-value" : ""}
+                              `}
+                            >
+                              {value.toFixed(1)}
+                            </td>
+                          );
+                        })}
+                      </tr>
+                    ))}
+                  </tbody>
+                </table>
+              )}
             </div>
           </Col>
           
           <Col md={5}>
             <div className="tensor-container p-3 bg-light rounded">
               <h6 className="text-center mb-2">Output Tensor (After MaxPool)</h6>
-              <table className="tensor-table mx-auto">
-                <tbody>
-                  {outputTensor.map((row, rowIdx) => (
-                    <tr key={rowIdx}>
-                      {row.map((value, colIdx) => (
-                        <td 
-                          key={colIdx}
-                          className={(rowIdx === selectedPosition.i && colIdx === selectedPosition.j) ? "selected" : ""}
-                        >
-                          {value.toFixed(1)}
-                        </td>
-                      ))}
-                    </tr>
-                  ))}
-                </tbody>
-              </table>
+              {shouldUseHeatmap(outputTensor) ? (
+                <HeatmapCanvas
+                  tensor={outputTensor}
+                  highlightPosition={{ row: selectedPosition.i, col: selectedPosition.j }}
+                  onCellClick={(i, j) => setSelectedPosition({ i, j })}
+                />
+              ) : (
+                <table className="tensor-table mx-auto">
+                  <tbody>
+                    {outputTensor.map((row, rowIdx) => (
+                      <tr key={rowIdx}>
+                        {row.map((value, colIdx) => (
+                          <td 
+                            key={colIdx}
+                            className={(rowIdx === selectedPosition.i && colIdx === selectedPosition.j) ? "selected" : ""}
+                          >
+                            {value.toFixed(1)}
+                          </td>
+                        ))}
+                      </tr>
+                    ))}
+                  </tbody>
+                </table>
+              )}
             </div>
           </Col>
         </Row>
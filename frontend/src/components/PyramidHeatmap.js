@@ -0,0 +1,136 @@
+import React, { useCallback, useEffect, useMemo, useRef, useState } from 'react';
+import { Button, ButtonGroup } from 'react-bootstrap';
+import HeatmapCanvas from './HeatmapCanvas';
+import { chooseLevel, fetchPyramidTiles, levelDims } from '../utils/pyramidClient';
+
+// 한 레벨의 격자를 이 셀 수 이하로 유지 (더 자세한 레벨은 더 확대해야 사용)
+const MAX_GRID_CELLS = 4 * 1024 * 1024;
+
+// 스크롤이 멈춘 뒤 타일을 요청하기까지 기다리는 시간 (ms)
+const FETCH_DELAY_MS = 120;
+
+// 확대 단계 (원본 해상도 한 칸이 화면에서 차지하는 픽셀 수)
+const MIN_ZOOM = 1 / 64;
+const MAX_ZOOM = 16;
+
+// 레벨 격자를 가장 거친 레벨 미리보기로 채움 (타일이 도착하기 전까지 표시)
+const fillFromPreview = (preview, previewLevel, level, rows, cols) => {
+  const data = new Float32Array(rows * cols);
+  const shift = previewLevel - level;
+  const previewRows = preview.length;
+  const previewCols = preview[0].length;
+  for (let r = 0; r < rows; r++) {
+    const previewRow = preview[Math.min(r >> shift, previewRows - 1)];
+    for (let c = 0; c < cols; c++) {
+      data[r * cols + c] = previewRow[Math.min(c >> shift, previewCols - 1)];
+    }
+  }
+  return data;
+};
+
+/**
+ * 피라미드 요약으로 받은 큰 텐서를 거친 미리보기부터 보여주고,
+ * 확대하거나 스크롤하면 보이는 영역의 타일만 백엔드에서 받아 더 자세한 레벨로 채우는 히트맵
+ */
+const PyramidHeatmap = ({ summary, runId, iterationIndex }) => {
+  const plane = summary.plane || 0;
+  const dims = useMemo(() => levelDims(summary), [summary]);
+  const [fullRows, fullCols] = dims[0];
+
+  // 처음에는 텐서 전체가 약 360픽셀 안에 들어오도록 축소
+  const [zoom, setZoom] = useState(() => Math.min(1, 360 / Math.max(fullRows, fullCols)));
+  const [version, setVersion] = useState(0);
+  const [loading, setLoading] = useState(false);
+  const timerRef = useRef(null);
+
+  // 격자가 너무 커지지 않는 가장 자세한 레벨
+  const minLevel = useMemo(() => {
+    const index = dims.findIndex(([rows, cols]) => rows * cols <= MAX_GRID_CELLS);
+    return index === -1 ? dims.length - 1 : index;
+  }, [dims]);
+  const level = Math.max(chooseLevel(summary, zoom), minLevel);
+  const scale = 2 ** level;
+  const [rows, cols] = dims[level];
+
+  // 레벨(또는 평면)이 바뀔 때마다 미리보기로 채운 새 격자와 받은 타일 목록을 만듦
+  const grid = useMemo(() => ({
+    data: fillFromPreview(summary.preview[plane], summary.num_levels - 1, level, rows, cols),
+    loaded: new Set()
+  }), [summary, plane, level, rows, cols]);
+
+  const tensor = useMemo(
+    () => ({ data: grid.data, shape: [rows, cols] }),
+    // 타일이 도착하면 같은 버퍼를 새 객체로 감싸 다시 그리게 함
+    [grid, rows, cols, version]
+  );
+
+  useEffect(() => () => clearTimeout(timerRef.current), []);
+
+  const handleViewportChange = useCallback(({ firstRow, firstCol, lastRow, lastCol }) => {
+    clearTimeout(timerRef.current);
+    timerRef.current = setTimeout(async () => {
+      const tileSize = summary.tile_size;
+      const missing = [];
+      for (let ty = Math.floor(firstRow / tileSize); ty < Math.ceil(lastRow / tileSize); ty++) {
+        for (let tx = Math.floor(firstCol / tileSize); tx < Math.ceil(lastCol / tileSize); tx++) {
+          if (!grid.loaded.has(`${tx}:${ty}`)) missing.push(`${tx}:${ty}`);
+        }
+      }
+      if (missing.length === 0) return;
+      // 같은 타일을 중복 요청하지 않도록 미리 표시 (실패하면 되돌림)
+      missing.forEach((key) => grid.loaded.add(key));
+
+      setLoading(true);
+      try {
+        const tiles = await fetchPyramidTiles(runId, iterationIndex, summary, {
+          plane,
+          level,
+          x: firstCol * scale,
+          y: firstRow * scale,
+          width: (lastCol - firstCol) * scale,
+          height: (lastRow - firstRow) * scale
+        });
+        for (const tile of tiles) {
+          const values = level === 0 ? tile.values : tile.mean;
+          const rowStart = tile.y / scale;
+          const colStart = tile.x / scale;
+          values.forEach((row, r) => {
+            grid.data.set(row, (rowStart + r) * cols + colStart);
+          });
+          grid.loaded.add(`${tile.tx}:${tile.ty}`);
+        }
+        setVersion((v) => v + 1);
+      } catch (err) {
+        missing.forEach((key) => grid.loaded.delete(key));
+        console.error('Error fetching pyramid tiles:', err);
+      } finally {
+        setLoading(false);
+      }
+    }, FETCH_DELAY_MS);
+  }, [grid, summary, runId, iterationIndex, plane, level, scale, cols]);
+
+  return (
+    <div>
+      <div className="d-flex align-items-center mb-2">
+        <ButtonGroup size="sm" className="me-2">
+          <Button variant="outline-secondary" disabled={zoom <= MIN_ZOOM}
+            onClick={() => setZoom((z) => Math.max(MIN_ZOOM, z / 2))}>−</Button>
+          <Button variant="outline-secondary" disabled={zoom >= MAX_ZOOM}
+            onClick={() => setZoom((z) => Math.min(MAX_ZOOM, z * 2))}>+</Button>
+        </ButtonGroup>
+        <span className="text-muted small">
+          Shape [{summary.shape.join(', ')}], level {level} (1/{scale} resolution)
+          {loading ? ', loading tiles…' : ''}
+        </span>
+      </div>
+      <HeatmapCanvas
+        tensor={tensor}
+        cellSize={zoom * scale}
+        valueRange={summary}
+        onViewportChange={handleViewportChange}
+      />
+    </div>
+  );
+};
+
+export default PyramidHeatmap;
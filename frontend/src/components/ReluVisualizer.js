@@ -1,6 +1,7 @@
 import React, { useState } from 'react';
 import { Row, Col, Form, Button } from 'react-bootstrap';
 import { InlineMath, BlockMath } from 'react-katex';
+import HeatmapCanvas, { shouldUseHeatmap } from './HeatmapCanvas';
 
 /**
  * Component for visualizing ReLU operations at different positions
@@ -138,50 +139,66 @@ const ReluVisualizer = ({ inputTensor, outputTensor }) => {
           <Col md={6}>
             <div className="tensor-container p-3 bg-light rounded">
               <h6 className="text-center mb-2">Input Tensor</h6>
-              <table className="tensor-table mx-auto">
-                <tbody>
-                  {inputTensor.map((row, rowIdx) => (
-                    <tr key={rowIdx}>
-                      {row.map((value, colIdx) => (
-                        <td 
-                          key={colIdx}
-                          className={(rowIdx === selectedPosition.i && colIdx === selectedPosition.j) ? "selected" : ""}
-                          style={{ 
-                            backgroundColor: value > 0 ? `rgba(0, 123, 255, ${Math.min(value / 10, 0.7)})` : 'rgba(220, 53, 69, 0.2)' 
-                          }}
-                        >
-                          {value.toFixed(1)}
-                        </td>
-                      ))}
-                    </tr>
-                  ))}
-                </tbody>
-              </table>
+              {shouldUseHeatmap(inputTensor) ? (
+                <HeatmapCanvas
+                  tensor={inputTensor}
+                  highlightPosition={{ row: selectedPosition.i, col: selectedPosition.j }}
+                  onCellClick={(i, j) => setSelectedPosition({ i, j })}
+                />
+              ) : (
+                <table className="tensor-table mx-auto">
+                  <tbody>
+                    {inputTensor.map((row, rowIdx) => (
+                      <tr key={rowIdx}>
+                        {row.map((value, colIdx) => (
+                          <td 
+                            key={colIdx}
+                            className={(rowIdx === selectedPosition.i && colIdx === selectedPosition.j) ? "selected" : ""}
+                            style={{ 
+                              backgroundColor: value > 0 ? `rgba(0, 123, 255, ${Math.min(value / 10, 0.7)})` : 'rgba(220, 53, 69, 0.2)' 
+                            }}
+                          >
+                            {value.toFixed(1)}
+                          </td>
+                        ))}
+                      </tr>
+                    ))}
+                  </tbody>
+                </table>
+              )}
             </div>
           </Col>
           
           <Col md={6}>
             <div className="tensor-container p-3 bg-light rounded">
               <h6 className="text-center mb-2">Output Tensor (After ReLU)</h6>
-              <table className="tensor-table mx-auto">
-                <tbody>
-                  {outputTensor.map((row, rowIdx) => (
-                    <tr key={rowIdx}>
-                      {row.map((value, colIdx) => (
-                        <td 
-                          key={colIdx}
-                          className={(rowIdx === selectedPosition.i && colIdx === selectedPosition.j) ? "selected" : ""}
-                          style={{ 
-                            backgroundColor: value > 0 ? `rgba(40, 167, 69, ${Math.min(value / 10, 0.7)})` : 'rgba(239, 239, 239, 0.5)' 
-                          }}
-                        >
-                          {value.toFixed(1)}
-                        </td>
-                      ))}
-                    </tr>
-                  ))}
-                </tbody>
-              </table>
+              {shouldUseHeatmap(outputTensor) ? (
+                <HeatmapCanvas
+                  tensor={outputTensor}
+                  highlightPosition={{ row: selectedPosition.i, col: selectedPosition.j }}
+                  onCellClick={(i, j) => setSelectedPosition({ i, j })}
+                />
+              ) : (
+                <table className="tensor-table mx-auto">
+                  <tbody>
+                    {outputTensor.map((row, rowIdx) => (
+                      <tr key={rowIdx}>
+                        {row.map((value, colIdx) => (
+                          <td 
+                            key={colIdx}
+                            className={(rowIdx === selectedPosition.i && colIdx === selectedPosition.j) ? "selected" : ""}
+                            style={{ 
+                              backgroundColor: value > 0 ? `rgba(40, 167, 69, ${Math.min(value / 10, 0.7)})` : 'rgba(239, 239, 239, 0.5)' 
+                            }}
+                          >
+                            {value.toFixed(1)}
+                          </td>
+                        ))}
+                      </tr>
+                    ))}
+                  </tbody>
+                </table>
+              )}
             </div>
           </Col>
         </Row>
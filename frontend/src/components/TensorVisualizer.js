@@ -1,7 +1,34 @@
-import React from 'react';
+import React, { useContext } from 'react';
 import { OverlayTrigger, Tooltip } from 'react-bootstrap';
+import { isPyramidSummary, PyramidContext } from '../utils/pyramidClient';
+import HeatmapCanvas, { shouldUseHeatmap } from './HeatmapCanvas';
+import PyramidHeatmap from './PyramidHeatmap';
 
 const TensorVisualizer = ({ tensor, highlightPosition }) => {
+  const { runId, iterationIndex } = useContext(PyramidContext);
+  
+  // 큰 텐서는 피라미드 요약으로 전달되므로 거친 미리보기부터 보여주고 확대/스크롤 시 타일로 채움
+  if (isPyramidSummary(tensor) && runId) {
+    return <PyramidHeatmap summary={tensor} runId={runId} iterationIndex={iterationIndex} />;
+  }
+  
+  // 타일을 요청할 백엔드가 없으면(내보낸 HTML) 가장 거친 레벨 미리보기만 표시
+  if (isPyramidSummary(tensor)) {
+    return (
+      <div>
+        <TensorVisualizer tensor={tensor.preview[tensor.plane || 0]} />
+        <p className="mt-2 text-muted">
+          Preview of shape [{tensor.shape.join(', ')}] at 1/{2 ** (tensor.num_levels - 1)} resolution
+        </p>
+      </div>
+    );
+  }
+  
+  // 큰 텐서나 타입 배열 텐서는 셀마다 DOM 요소를 만들지 않고 캔버스 히트맵으로 표시
+  if (shouldUseHeatmap(tensor)) {
+    return <HeatmapCanvas tensor={tensor} highlightPosition={highlightPosition} />;
+  }
+  
   // 텐서가 없거나 유효하지 않은 경우 처리
   if (!tensor || !Array.isArray(tensor)) {
     return <div>유효한 텐서 데이터가 없습니다.</div>;
@@ -2,6 +2,7 @@ import React from 'react';
 import { Row, Col, Alert } from 'react-bootstrap';
 import { InlineMath, BlockMath } from 'react-katex';
 import TensorVisualizer from '../TensorVisualizer';
+import { selectPlane } from '../../utils/pyramidClient';
 import ConvGradientVisualizer from './ConvGradientVisualizer';
 
 const ConvBackprop = ({ backward, initial_weights, updated_weights, learning_rate, forward }) => {
@@ -56,7 +57,7 @@ const ConvBackprop = ({ backward, initial_weights, updated_weights, learning_rat
           {backward.conv.output_grad ? (
             <div className="tensor-container p-2 border rounded">
               <p className="text-center">Gradient flowing from the ReLU layer (∂L/∂O)</p>
-              <TensorVisualizer tensor={backward.conv.output_grad[0][0]} />
+              <TensorVisualizer tensor={selectPlane(backward.conv.output_grad)} />
               <p className="text-muted text-center mt-2 small">
                 This gradient represents how the loss changes with respect to each element in the convolution output.
               </p>
@@ -71,7 +72,7 @@ const ConvBackprop = ({ backward, initial_weights, updated_weights, learning_rat
           {backward.conv.weight_grad ? (
             <div className="tensor-container p-2 border rounded">
               <p className="text-center">Computed gradient for convolution weights (∂L/∂W)</p>
-              <TensorVisualizer tensor={backward.conv.weight_grad[0][0]} />
+              <TensorVisualizer tensor={selectPlane(backward.conv.weight_grad)} />
               <p className="text-muted text-center mt-2 small">
                 This gradient is used to update the weights during optimization.
               </p>
@@ -91,11 +92,11 @@ const ConvBackprop = ({ backward, initial_weights, updated_weights, learning_rat
                   <Row>
                     <Col md={6}>
                       <h6 className="text-center">Initial Weights</h6>
-                      <TensorVisualizer tensor={initial_weights.conv1_weight[0][0]} />
+                      <TensorVisualizer tensor={selectPlane(initial_weights.conv1_weight)} />
                     </Col>
                     <Col md={6}>
                       <h6 className="text-center">Updated Weights</h6>
-                      <TensorVisualizer tensor={updated_weights.conv1_weight[0][0]} />
+                      <TensorVisualizer tensor={selectPlane(updated_weights.conv1_weight)} />
                     </Col>
                   </Row>
                 </div>
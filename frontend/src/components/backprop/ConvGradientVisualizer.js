@@ -3,16 +3,33 @@ import { Row, Col, Form, Button, OverlayTrigger, Tooltip, Card } from 'react-boo
 import { InlineMath, BlockMath } from 'react-katex';
 import TensorVisualizer from '../TensorVisualizer';
 import AnimatedCalculation from '../AnimatedCalculation';
+import { fromNested } from '../../utils/tensorKernels';
+import { useKernel } from '../../utils/workerPool';
+
+// 수식에 직접 나열할 최대 항 수 (나머지는 \cdots로 생략하고 합계는 워커 재계산 결과 사용)
+const MAX_EQUATION_TERMS = 16;
+
+// If essential data is missing, use sample data for demonstration
+// (렌더링마다 새 배열이 만들어지면 워커 재계산이 반복되므로 모듈 상수로 둠)
+const sampleInputTensor = [
+  [1.0, 2.0, 3.0, 4.0],
+  [5.0, 6.0, 7.0, 8.0],
+  [9.0, 10.0, 11.0, 12.0],
+  [13.0, 14.0, 15.0, 16.0]
+];
+
+const sampleOutputGrad = [
+  [0.2, 0.3, 0.1],
+  [0.4, 0.5, 0.2],
+  [0.1, 0.3, 0.2]
+];
+
+const sampleWeightGrad = [
+  [0.15, 0.25],
+  [0.35, 0.45]
+];
 
 const ConvGradientVisualizer = ({ outputGrad, inputTensor, weightGrad, initialWeights, updatedWeights, learningRate = 0.01 }) => {
-  // 디버깅을 위한 콘솔 로그 추가
-  console.log('Output Gradient:', outputGrad);
-  console.log('Input Tensor:', inputTensor);
-  console.log('Weight Gradient:', weightGrad);
-  console.log('Initial Weights:', initialWeights);
-  console.log('Updated Weights:', updatedWeights);
-  console.log('Learning Rate:', learningRate);
-  
   // 값의 포맷팅 함수 - 소수점 자릿수 조절 및 표시 최적화
   const formatValue = (value) => {
     // 전체 값은 정확한 값
@@ -41,30 +58,18 @@ const ConvGradientVisualizer = ({ outputGrad, inputTensor, weightGrad, initialWe
   // State for the selected kernel gradient position
   const [selectedPosition, setSelectedPosition] = useState({ row: 0, col: 0 });
   
-  // If essential data is missing, use sample data for demonstration
-  const sampleInputTensor = [
-    [1.0, 2.0, 3.0, 4.0],
-    [5.0, 6.0, 7.0, 8.0],
-    [9.0, 10.0, 11.0, 12.0],
-    [13.0, 14.0, 15.0, 16.0]
-  ];
-  
-  const sampleOutputGrad = [
-    [0.2, 0.3, 0.1],
-    [0.4, 0.5, 0.2],
-    [0.1, 0.3, 0.2]
-  ];
-  
-  const sampleWeightGrad = [
-    [0.15, 0.25],
-    [0.35, 0.45]
-  ];
-  
   // Use real data if available, otherwise use sample data
   const displayInputTensor = inputTensor || sampleInputTensor;
   const displayOutputGrad = outputGrad || sampleOutputGrad;
   const displayWeightGrad = weightGrad || sampleWeightGrad;
   
+  // 전체 커널 그래디언트(입력과 출력 그래디언트의 교차상관)를 워커에서 재계산
+  const recomputedGrad = useKernel(
+    'convWeightGrad',
+    () => [fromNested(displayInputTensor), fromNested(displayOutputGrad)],
+    [displayInputTensor, displayOutputGrad]
+  );
+  
   // Get dimensions from display tensors
   const kernelHeight = displayWeightGrad.length;
   const kernelWidth = displayWeightGrad[0].length;
@@ -132,11 +137,11 @@ const ConvGradientVisualizer = ({ outputGrad, inputTensor, weightGrad, initialWe
     // Step 2: Substituting values
     let equationWithValues = "\\frac{\\partial L}{\\partial W_{" + row + "," + col + "}} = ";
     let terms = [];
-    let sum = 0;
+    const totalTerms = displayOutputGrad.length * displayOutputGrad[0].length;
     
-    // For each position in the output gradient
-    for (let i = 0; i < displayOutputGrad.length; i++) {
-      for (let j = 0; j < displayOutputGrad[0].length; j++) {
+    // For each position in the output gradient (수식에는 앞쪽 항만 표시)
+    for (let i = 0; i < displayOutputGrad.length && terms.length < MAX_EQUATION_TERMS; i++) {
+      for (let j = 0; j < displayOutputGrad[0].length && terms.length < MAX_EQUATION_TERMS; j++) {
         // Calculate the corresponding input position
         const inputRow = i + row;
         const inputCol = j + col;
@@ -148,18 +153,23 @@ const ConvGradientVisualizer = ({ outputGrad, inputTensor, weightGrad, initialWe
         }
         
         const outputGradValue = displayOutputGrad[i][j];
-        const term = outputGradValue * inputValue;
         
         // Format values for display in equation
         const outputGradFormatted = formatValue(outputGradValue).displayValue;
         const inputFormatted = formatValue(inputValue).displayValue;
         
         terms.push(`(${outputGradFormatted} \\cdot ${inputFormatted})`);
-        sum += term;
       }
     }
+    if (totalTerms > terms.length) {
+      terms.push(`\\cdots \\; (${totalTerms} \\text{ terms})`);
+    }
     
     equationWithValues += terms.join(" + ");
+    if (recomputedGrad && recomputedGrad.shape[0] === kernelHeight && recomputedGrad.shape[1] === kernelWidth) {
+      const { strides, data } = recomputedGrad;
+      equationWithValues += ` = ${formatValue(data[row * strides[0] + col]).displayValue}`;
+    }
     
     steps.push({
       description: "Substituting the actual values",
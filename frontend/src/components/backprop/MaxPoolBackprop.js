@@ -2,6 +2,7 @@ import React from 'react';
 import { Row, Col } from 'react-bootstrap';
 import { InlineMath, BlockMath } from 'react-katex';
 import TensorVisualizer from '../TensorVisualizer';
+import { selectPlane } from '../../utils/pyramidClient';
 import MaxPoolBackpropVisualizer from './MaxPoolBackpropVisualizer';
 
 const MaxPoolBackprop = ({ backward }) => {
@@ -20,12 +21,12 @@ const MaxPoolBackprop = ({ backward }) => {
           </div>
           
           <h6 className="mt-4">MaxPool Output Gradient</h6>
-          <TensorVisualizer tensor={backward.pool.output_grad[0][0]} />
+          <TensorVisualizer tensor={selectPlane(backward.pool.output_grad)} />
         </Col>
         
         <Col md={6}>
           <h6>MaxPool Input Gradient (Expanded form)</h6>
-          <TensorVisualizer tensor={backward.pool.input_grad[0][0]} />
+          <TensorVisualizer tensor={selectPlane(backward.pool.input_grad)} />
           
           <div className="mt-4">
             <p>Gradients are only propagated to positions that held the maximum value. Gradients at other positions are zero.</p>
@@ -2,6 +2,7 @@ import React from 'react';
 import { Row, Col } from 'react-bootstrap';
 import { InlineMath, BlockMath } from 'react-katex';
 import TensorVisualizer from '../TensorVisualizer';
+import { selectPlane } from '../../utils/pyramidClient';
 import ReluBackpropVisualizer from './ReluBackpropVisualizer';
 
 const ReluBackprop = ({ backward }) => {
@@ -19,18 +20,18 @@ const ReluBackprop = ({ backward }) => {
           
           <div className="mt-4">
             <h6>ReLU Output Gradient</h6>
-            <TensorVisualizer tensor={backward.relu.output_grad[0][0]} />
+            <TensorVisualizer tensor={selectPlane(backward.relu.output_grad)} />
           </div>
           
           <div className="mt-4">
             <h6>ReLU Activation Mask (1: Active, 0: Inactive)</h6>
-            <TensorVisualizer tensor={backward.relu.mask[0][0]} />
+            <TensorVisualizer tensor={selectPlane(backward.relu.mask)} />
           </div>
         </Col>
         
         <Col md={6}>
           <h6>ReLU Input Gradient</h6>
-          <TensorVisualizer tensor={backward.relu.input_grad[0][0]} />
+          <TensorVisualizer tensor={selectPlane(backward.relu.input_grad)} />
           
           <div className="mt-4">
             <p>ReLU backpropagation simply passes the gradient through positions where the input was positive.</p>
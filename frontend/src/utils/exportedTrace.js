@@ -0,0 +1,132 @@
+/**
+ * 독립 실행형 HTML로 내보낸 트레이스 로더
+ * (backend/export_html.py가 삽입한 매니페스트와 압축 텐서 청크를 읽음)
+ */
+
+const MANIFEST_ELEMENT_ID = 'cnn-vis-export';
+
+// 디코딩한 반복 데이터 캐시 (반복 인덱스 -> 객체, 최근에 사용한 순서)
+// 중첩 배열로 펼친 반복은 압축 청크보다 훨씬 크므로 최근 몇 개만 보관
+const DECODED_CACHE_SIZE = 8;
+const decodedCache = new Map();
+
+/**
+ * 내보낸 HTML 안에서 실행 중인지 확인
+ * @returns {boolean} 내보내기 매니페스트 존재 여부
+ */
+export const isExportedTrace = () => Boolean(document.getElementById(MANIFEST_ELEMENT_ID));
+
+/**
+ * 매니페스트 읽기
+ * @returns {Object} 모델 정보, 모델 구성, 반복별 텐서 목록
+ */
+export const loadManifest = () => JSON.parse(document.getElementById(MANIFEST_ELEMENT_ID).textContent);
+
+/**
+ * IEEE 754 반정밀도(float16) 값을 Number로 변환
+ * @param {number} h - 16비트 정수 표현
+ * @returns {number} 변환된 값
+ */
+const halfToFloat = (h) => {
+  const sign = h & 0x8000 ? -1 : 1;
+  const exponent = (h >> 10) & 0x1f;
+  const fraction = h & 0x3ff;
+  if (exponent === 0) {
+    return sign * Math.pow(2, -14) * (fraction / 1024);
+  }
+  if (exponent === 31) {
+    return fraction ? NaN : sign * Infinity;
+  }
+  return sign * Math.pow(2, exponent - 15) * (1 + fraction / 1024);
+};
+
+/**
+ * 평탄한 배열을 shape에 맞는 중첩 배열로 변환 (기존 시각화 컴포넌트 입력 형식)
+ * @param {ArrayLike} flat - 평탄한 값 배열
+ * @param {Array} shape - 텐서 형태
+ * @returns {Array} 중첩 배열
+ */
+const reshape = (flat, shape) => {
+  if (shape.length === 0) {
+    return flat[0];
+  }
+  const build = (offset, dim) => {
+    const size = shape[dim];
+    if (dim === shape.length - 1) {
+      return Array.from(flat.subarray(offset, offset + size));
+    }
+    const stride = shape.slice(dim + 1).reduce((acc, s) => acc * s, 1);
+    return Array.from({ length: size }, (_, i) => build(offset + i * stride, dim + 1));
+  };
+  return build(0, 0);
+};
+
+/**
+ * 'forward/conv/output_tensor' 경로에 값 설정
+ */
+const setPath = (target, path, value) => {
+  const keys = path.split('/');
+  let node = target;
+  keys.slice(0, -1).forEach((key) => {
+    node[key] = node[key] || {};
+    node = node[key];
+  });
+  node[keys[keys.length - 1]] = value;
+};
+
+/**
+ * base64 청크를 gzip 해제하여 ArrayBuffer로 변환
+ * @param {string} base64 - base64 문자열
+ * @returns {Promise<ArrayBuffer>} 압축 해제된 바이트
+ */
+const inflate = async (base64) => {
+  const binary = atob(base64.trim());
+  const bytes = new Uint8Array(binary.length);
+  for (let i = 0; i < binary.length; i++) {
+    bytes[i] = binary.charCodeAt(i);
+  }
+  const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+  return new Response(stream).arrayBuffer();
+};
+
+/**
+ * 특정 반복만 필요할 때 디코딩 (최근에 디코딩한 반복은 캐시에서 반환)
+ * @param {Object} manifest - loadManifest() 결과
+ * @param {number} index - 반복 인덱스
+ * @returns {Promise<Object>} API 응답과 같은 형태의 반복 데이터
+ */
+export const decodeIteration = async (manifest, index) => {
+  if (decodedCache.has(index)) {
+    // 다시 넣어 가장 최근에 사용한 항목으로 표시
+    const cached = decodedCache.get(index);
+    decodedCache.delete(index);
+    decodedCache.set(index, cached);
+    return cached;
+  }
+
+  const entry = manifest.iterations[index];
+  const buffer = await inflate(document.getElementById(entry.blob).textContent);
+  const iteration = {};
+
+  Object.entries(entry.scalars).forEach(([path, value]) => setPath(iteration, path, value));
+
+  entry.tensors.forEach(({ path, dtype, shape, offset, length }) => {
+    let flat;
+    if (dtype === 'float32') {
+      flat = new Float32Array(buffer, offset, length / 4);
+    } else if (dtype === 'int32') {
+      flat = new Int32Array(buffer, offset, length / 4);
+    } else {
+      const halves = new Uint16Array(buffer, offset, length / 2);
+      flat = Float32Array.from(halves, halfToFloat);
+    }
+    setPath(iteration, path, reshape(flat, shape));
+  });
+
+  decodedCache.set(index, iteration);
+  if (decodedCache.size > DECODED_CACHE_SIZE) {
+    // Map은 삽입 순서를 유지하므로 첫 키가 가장 오래 사용하지 않은 반복
+    decodedCache.delete(decodedCache.keys().next().value);
+  }
+  return iteration;
+};
@@ -0,0 +1,72 @@
+import { createContext } from 'react';
+import axios from 'axios';
+
+/**
+ * 피라미드 타일을 요청할 실행 ID와 반복 인덱스 (내보낸 HTML처럼 백엔드가 없으면 runId는 null)
+ */
+export const PyramidContext = createContext({ runId: null, iterationIndex: 0 });
+
+/**
+ * 피라미드 요약 객체인지 확인 (백엔드가 큰 텐서를 전체 값 대신 보내는 형태)
+ * @param {*} tensor - 텐서 데이터
+ * @returns {boolean} 피라미드 요약 여부
+ */
+export const isPyramidSummary = (tensor) => Boolean(tensor && tensor.pyramid === true);
+
+/**
+ * (배치, 채널, 높이, 너비) 텐서에서 한 평면 선택
+ * 중첩 배열은 tensor[batch][channel]을, 피라미드 요약은 해당 평면 번호를 붙인 요약을 반환
+ * @param {Array|Object} tensor - 텐서 또는 피라미드 요약
+ * @param {number} batch - 배치 인덱스
+ * @param {number} channel - 채널 인덱스
+ * @returns {Array|Object} 2D 텐서 또는 피라미드 요약
+ */
+export const selectPlane = (tensor, batch = 0, channel = 0) => {
+  if (isPyramidSummary(tensor)) {
+    // 백엔드는 앞쪽 축(배치, 채널)을 평면 목록으로 평탄화함
+    const channels = tensor.shape.length === 4 ? tensor.shape[1] : 1;
+    return { ...tensor, plane: tensor.shape.length === 4 ? batch * channels + channel : 0 };
+  }
+  return tensor && tensor[batch] ? tensor[batch][channel] : undefined;
+};
+
+/**
+ * 레벨별 (행, 열) 크기 목록 (각 레벨은 이전 레벨을 2x2로 축소하며 홀수 크기는 올림)
+ * @param {Object} summary - 피라미드 요약 객체
+ * @returns {Array<Array<number>>} [[행, 열], ...] (인덱스 = 레벨)
+ */
+export const levelDims = (summary) => {
+  const dims = [summary.shape.slice(-2)];
+  for (let level = 1; level < summary.num_levels; level++) {
+    const [rows, cols] = dims[level - 1];
+    dims.push([Math.ceil(rows / 2), Math.ceil(cols / 2)]);
+  }
+  return dims;
+};
+
+/**
+ * 화면 배율에 맞는 피라미드 레벨 선택
+ * @param {Object} summary - 피라미드 요약 객체
+ * @param {number} pixelsPerCell - 원본 해상도 한 칸이 화면에서 차지하는 픽셀 수
+ * @returns {number} 레벨 (0 = 원본 해상도)
+ */
+export const chooseLevel = (summary, pixelsPerCell) => {
+  // 한 칸이 1픽셀보다 작아지는 만큼 거친 레벨을 사용
+  const level = Math.floor(Math.log2(1 / Math.max(pixelsPerCell, 1e-6)));
+  return Math.min(Math.max(level, 0), summary.num_levels - 1);
+};
+
+/**
+ * 뷰포트에 해당하는 피라미드 타일 요청
+ * @param {string} runId - 시각화 실행 ID
+ * @param {number} iterationIndex - 반복 인덱스
+ * @param {Object} summary - 피라미드 요약 객체 (path 포함)
+ * @param {Object} viewport - { plane, level, x, y, width, height } (원본 해상도 좌표)
+ * @returns {Promise<Array>} 타일 목록
+ */
+export const fetchPyramidTiles = async (runId, iterationIndex, summary, viewport) => {
+  const response = await axios.get(`/api/runs/${runId}/iterations/${iterationIndex}/pyramid`, {
+    params: { path: summary.path, ...viewport }
+  });
+  return response.data.tiles;
+};
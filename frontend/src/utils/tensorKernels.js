@@ -0,0 +1,228 @@
+/**
+ * Float32Array 기반 텐서 연산 커널
+ * 텐서는 { data: Float32Array, shape: Array, strides: Array } 형태 (행 우선 연속 배치)
+ * 메인 스레드와 Web Worker(workers/mathWorker.js) 양쪽에서 사용
+ */
+
+/**
+ * shape에 대한 행 우선 strides 계산
+ * @param {Array} shape - 텐서 형태
+ * @returns {Array} 각 축의 stride
+ */
+export const computeStrides = (shape) => {
+  const strides = new Array(shape.length);
+  let stride = 1;
+  for (let i = shape.length - 1; i >= 0; i--) {
+    strides[i] = stride;
+    stride *= shape[i];
+  }
+  return strides;
+};
+
+/**
+ * 텐서 생성
+ * @param {Array} shape - 텐서 형태
+ * @param {Float32Array} [data] - 값 (생략 시 0으로 초기화)
+ * @returns {Object} 텐서
+ */
+export const createTensor = (shape, data) => {
+  const size = shape.reduce((acc, s) => acc * s, 1);
+  const values = data || new Float32Array(size);
+  if (values.length !== size) {
+    throw new Error(`텐서 크기 불일치: 형태 [${shape.join(', ')}]에는 ${size}개의 값이 필요하지만 ${values.length}개가 주어졌습니다.`);
+  }
+  return { data: values, shape: shape.slice(), strides: computeStrides(shape) };
+};
+
+/**
+ * 중첩 배열을 텐서로 변환
+ * @param {Array} nested - 중첩 배열 (예: 2D 행렬)
+ * @returns {Object} 텐서
+ */
+export const fromNested = (nested) => {
+  const shape = [];
+  let node = nested;
+  while (Array.isArray(node)) {
+    shape.push(node.length);
+    node = node[0];
+  }
+  return createTensor(shape, Float32Array.from(shape.length > 1 ? nested.flat(shape.length - 1) : nested));
+};
+
+/**
+ * 텐서를 중첩 배열로 변환 (기존 시각화 컴포넌트 입력 형식)
+ * @param {Object} tensor - 텐서
+ * @returns {Array} 중첩 배열
+ */
+export const toNested = ({ data, shape, strides }) => {
+  const build = (offset, dim) => {
+    if (dim === shape.length - 1) {
+      return Array.from(data.subarray(offset, offset + shape[dim]));
+    }
+    return Array.from({ length: shape[dim] }, (_, i) => build(offset + i * strides[dim], dim + 1));
+  };
+  return shape.length === 0 ? [] : build(0, 0);
+};
+
+/**
+ * 행렬 곱셈 (M x K) @ (K x N)
+ * @param {Object} a - 2D 텐서
+ * @param {Object} b - 2D 텐서
+ * @returns {Object} 결과 2D 텐서
+ */
+export const matmul = (a, b) => {
+  const [m, k] = a.shape;
+  const [bRows, n] = b.shape;
+  if (k !== bRows) {
+    throw new Error(`행렬 곱셈 불가: 첫 번째 행렬의 열 수(${k})와 두 번째 행렬의 행 수(${bRows})가 일치하지 않습니다.`);
+  }
+  const out = new Float32Array(m * n);
+  const A = a.data;
+  const B = b.data;
+  // i-k-j 순서로 순회해 B와 결과 행을 연속적으로 접근
+  for (let i = 0; i < m; i++) {
+    const outRow = i * n;
+    for (let p = 0; p < k; p++) {
+      const aVal = A[i * k + p];
+      if (aVal === 0) continue;
+      const bRow = p * n;
+      for (let j = 0; j < n; j++) {
+        out[outRow + j] += aVal * B[bRow + j];
+      }
+    }
+  }
+  return createTensor([m, n], out);
+};
+
+/**
+ * 2D 전치
+ * @param {Object} a - 2D 텐서
+ * @returns {Object} 전치된 텐서
+ */
+export const transpose2d = (a) => {
+  const [rows, cols] = a.shape;
+  const out = new Float32Array(rows * cols);
+  for (let i = 0; i < rows; i++) {
+    for (let j = 0; j < cols; j++) {
+      out[j * rows + i] = a.data[i * cols + j];
+    }
+  }
+  return createTensor([cols, rows], out);
+};
+
+/**
+ * 2D 합성곱 (valid, stride 1 - PyTorch Conv2d와 같은 교차상관)
+ * @param {Object} input - 2D 텐서 (H x W)
+ * @param {Object} kernel - 2D 텐서 (KH x KW)
+ * @returns {Object} 결과 텐서 ((H-KH+1) x (W-KW+1))
+ */
+export const conv2d = (input, kernel) => {
+  const [h, w] = input.shape;
+  const [kh, kw] = kernel.shape;
+  const oh = h - kh + 1;
+  const ow = w - kw + 1;
+  const out = new Float32Array(oh * ow);
+  const X = input.data;
+  const K = kernel.data;
+  for (let i = 0; i < oh; i++) {
+    for (let j = 0; j < ow; j++) {
+      let sum = 0;
+      for (let ki = 0; ki < kh; ki++) {
+        const rowOffset = (i + ki) * w + j;
+        const kOffset = ki * kw;
+        for (let kj = 0; kj < kw; kj++) {
+          sum += X[rowOffset + kj] * K[kOffset + kj];
+        }
+      }
+      out[i * ow + j] = sum;
+    }
+  }
+  return createTensor([oh, ow], out);
+};
+
+/**
+ * ReLU
+ * @param {Object} x - 텐서
+ * @returns {Object} ReLU 적용 결과
+ */
+export const relu = (x) => {
+  const out = new Float32Array(x.data.length);
+  for (let i = 0; i < out.length; i++) {
+    out[i] = x.data[i] > 0 ? x.data[i] : 0;
+  }
+  return createTensor(x.shape, out);
+};
+
+/**
+ * 2D 최대 풀링
+ * @param {Object} input - 2D 텐서
+ * @param {number} poolSize - 풀링 크기
+ * @param {number} stride - 스트라이드
+ * @returns {Object} { output, indices } (indices는 입력 평탄화 인덱스)
+ */
+export const maxPool2d = (input, poolSize = 2, stride = 2) => {
+  const [h, w] = input.shape;
+  const oh = Math.floor((h - poolSize) / stride) + 1;
+  const ow = Math.floor((w - poolSize) / stride) + 1;
+  const out = new Float32Array(oh * ow);
+  const indices = new Float32Array(oh * ow);
+  const X = input.data;
+  for (let i = 0; i < oh; i++) {
+    for (let j = 0; j < ow; j++) {
+      let maxVal = -Infinity;
+      let maxIdx = -1;
+      for (let ki = 0; ki < poolSize; ki++) {
+        for (let kj = 0; kj < poolSize; kj++) {
+          const idx = (i * stride + ki) * w + (j * stride + kj);
+          if (X[idx] > maxVal) {
+            maxVal = X[idx];
+            maxIdx = idx;
+          }
+        }
+      }
+      out[i * ow + j] = maxVal;
+      indices[i * ow + j] = maxIdx;
+    }
+  }
+  return { output: createTensor([oh, ow], out), indices: createTensor([oh, ow], indices) };
+};
+
+/**
+ * 소프트맥스 (마지막 축 기준, 최대값을 빼서 수치 안정화)
+ * @param {Object} x - 텐서
+ * @returns {Object} 확률 분포 텐서
+ */
+export const softmax = (x) => {
+  const n = x.shape[x.shape.length - 1];
+  const out = new Float32Array(x.data.length);
+  for (let offset = 0; offset < x.data.length; offset += n) {
+    let maxVal = -Infinity;
+    for (let i = 0; i < n; i++) maxVal = Math.max(maxVal, x.data[offset + i]);
+    let sum = 0;
+    for (let i = 0; i < n; i++) {
+      out[offset + i] = Math.exp(x.data[offset + i] - maxVal);
+      sum += out[offset + i];
+    }
+    for (let i = 0; i < n; i++) out[offset + i] /= sum;
+  }
+  return createTensor(x.shape, out);
+};
+
+/**
+ * 합성곱 가중치 그래디언트 (dL/dW = 입력과 출력 그래디언트의 교차상관)
+ * @param {Object} input - 2D 입력 텐서
+ * @param {Object} outputGrad - 2D 출력 그래디언트 텐서
+ * @returns {Object} 커널 크기의 그래디언트 텐서
+ */
+export const convWeightGrad = (input, outputGrad) => conv2d(input, outputGrad);
+
+// 워커에서 이름으로 호출할 수 있는 커널 목록
+export const KERNELS = {
+  matmul,
+  transpose2d,
+  conv2d,
+  relu,
+  maxPool2d,
+  softmax,
+  convWeightGrad
+};
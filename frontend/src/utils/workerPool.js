@@ -0,0 +1,147 @@
+/**
+ * 텐서 연산 Web Worker 풀
+ * 큰 재계산을 메인 스레드 밖에서 실행해 렌더링이 막히지 않도록 함
+ */
+import { useEffect, useState } from 'react';
+import { KERNELS } from './tensorKernels';
+import { isExportedTrace } from './exportedTrace';
+
+// 메인 스레드 몫으로 코어 하나를 남기고 최대 4개까지 사용
+const POOL_SIZE = Math.max(1, Math.min(4, ((typeof navigator !== 'undefined' && navigator.hardwareConcurrency) || 2) - 1));
+
+const workers = [];
+const idleWorkers = [];
+const queue = [];
+const pending = new Map();
+let nextId = 0;
+// Worker 생성이 실패한 환경 (예: file://로 연 페이지에서 SecurityError)
+let workersUnavailable = false;
+
+// 내보낸 HTML에는 워커 청크가 포함되지 않으므로 (export_html.py는 index.html의 스크립트만 인라인) 워커를 쓰지 않음
+const workersSupported = () => typeof Worker !== 'undefined' && !workersUnavailable
+  && !(typeof document !== 'undefined' && isExportedTrace());
+
+// 워커 없이 메인 스레드에서 커널 실행 (커널 예외는 거부로 전달)
+const runOnMainThread = (op, args) => new Promise((resolve) => resolve(KERNELS[op](...args)));
+
+// 입력 텐서 버퍼 수집 (전송 후 호출자 쪽 버퍼는 분리되어 길이가 0이 됨)
+const collectBuffers = (args) => args
+  .filter((arg) => arg && arg.data instanceof Float32Array)
+  .map((arg) => arg.data.buffer);
+
+const dispatch = () => {
+  while (idleWorkers.length > 0 && queue.length > 0) {
+    const worker = idleWorkers.pop();
+    const task = queue.shift();
+    pending.set(task.id, { ...task, worker });
+    worker.postMessage({ id: task.id, op: task.op, args: task.args }, collectBuffers(task.args));
+  }
+};
+
+const handleMessage = ({ data: { id, result, error } }) => {
+  const task = pending.get(id);
+  if (!task) return;
+  pending.delete(id);
+  idleWorkers.push(task.worker);
+  if (error) {
+    task.reject(new Error(error));
+  } else {
+    task.resolve(result);
+  }
+  dispatch();
+};
+
+const spawnWorkers = () => {
+  for (let i = workers.length; i < POOL_SIZE; i++) {
+    let worker;
+    try {
+      worker = new Worker(new URL('../workers/mathWorker.js', import.meta.url));
+    } catch (error) {
+      console.warn('Web Worker unavailable, running kernels on the main thread:', error);
+      workersUnavailable = true;
+      break;
+    }
+    worker.onmessage = handleMessage;
+    worker.onerror = (event) => {
+      event.preventDefault();
+      replaceWorker(worker, new Error(event.message || 'Worker error'));
+    };
+    worker.onmessageerror = () => {
+      replaceWorker(worker, new Error('Worker result could not be deserialized'));
+    };
+    workers.push(worker);
+    idleWorkers.push(worker);
+  }
+  if (workers.length === 0) {
+    // 워커를 하나도 만들 수 없으면 대기 중인 작업을 메인 스레드에서 처리
+    queue.splice(0).forEach(({ op, args, resolve, reject }) => runOnMainThread(op, args).then(resolve, reject));
+  }
+};
+
+// 워커에서 잡히지 않은 오류가 나거나 결과 메시지를 복원할 수 없으면
+// 그 워커가 맡은 작업을 실패 처리하고 워커를 새것으로 교체
+const replaceWorker = (worker, reason) => {
+  for (const [id, task] of pending) {
+    if (task.worker === worker) {
+      pending.delete(id);
+      task.reject(reason);
+    }
+  }
+  worker.terminate();
+  workers.splice(workers.indexOf(worker), 1);
+  const idleIndex = idleWorkers.indexOf(worker);
+  if (idleIndex !== -1) idleWorkers.splice(idleIndex, 1);
+  // 대기 중인 작업이 있을 때만 바로 새 워커를 띄움 (스크립트 자체가 깨졌을 때 무한히 재생성하지 않도록)
+  if (queue.length > 0) {
+    spawnWorkers();
+    dispatch();
+  }
+};
+
+/**
+ * 워커 풀에서 커널 실행
+ * 입력 텐서의 버퍼는 워커로 전송되므로 호출 후 재사용하면 안 됨
+ * (Worker를 지원하지 않거나 생성할 수 없는 환경에서는 메인 스레드에서 바로 실행)
+ * @param {string} op - tensorKernels의 KERNELS 이름 (예: 'conv2d')
+ * @param {Array} args - 커널 인자 (텐서는 createTensor/fromNested 결과)
+ * @returns {Promise<Object>} 결과 텐서
+ */
+export const runKernel = (op, args) => {
+  if (!workersSupported()) {
+    return runOnMainThread(op, args);
+  }
+  spawnWorkers();
+  if (workers.length === 0) {
+    return runOnMainThread(op, args);
+  }
+  return new Promise((resolve, reject) => {
+    queue.push({ id: nextId++, op, args, resolve, reject });
+    dispatch();
+  });
+};
+
+/**
+ * 입력이 바뀔 때마다 워커에서 커널을 실행하고 결과를 상태로 반환하는 훅
+ * @param {string} op - 커널 이름
+ * @param {Function} makeArgs - 인자 배열을 만드는 함수 (실행마다 새 버퍼가 필요하므로 함수로 받음)
+ * @param {Array} deps - 재계산 의존성
+ * @returns {Object|null} 결과 텐서 (계산 중이면 이전 결과 또는 null)
+ */
+export const useKernel = (op, makeArgs, deps) => {
+  const [result, setResult] = useState(null);
+
+  useEffect(() => {
+    let cancelled = false;
+    const args = makeArgs();
+    if (!args) {
+      setResult(null);
+      return undefined;
+    }
+    runKernel(op, args)
+      .then((value) => { if (!cancelled) setResult(value); })
+      .catch((error) => { if (!cancelled) console.error(`Kernel ${op} failed:`, error); });
+    return () => { cancelled = true; };
+  }, deps); // eslint-disable-line react-hooks/exhaustive-deps
+
+  return result;
+};
@@ -0,0 +1,39 @@
+/* eslint-disable no-restricted-globals */
+/**
+ * 텐서 연산 Web Worker
+ * 메시지 형식: { id, op, args } (텐서 인자는 { data: Float32Array, shape })
+ * 결과 텐서의 버퍼는 복사하지 않고 전송(transfer)으로 돌려줌
+ */
+import { KERNELS, createTensor } from '../utils/tensorKernels';
+
+// 구조화 복제로 전달된 텐서에 strides 복원
+const reviveArg = (arg) => (
+  arg && arg.data instanceof Float32Array && Array.isArray(arg.shape)
+    ? createTensor(arg.shape, arg.data)
+    : arg
+);
+
+// 결과 안의 모든 Float32Array 버퍼 수집 (텐서 또는 { output, indices } 형태)
+const collectBuffers = (result) => {
+  if (result && result.data instanceof Float32Array) {
+    return [result.data.buffer];
+  }
+  if (result && typeof result === 'object') {
+    return Object.values(result).flatMap(collectBuffers);
+  }
+  return [];
+};
+
+self.onmessage = ({ data: { id, op, args } }) => {
+  const kernel = KERNELS[op];
+  if (!kernel) {
+    self.postMessage({ id, error: `알 수 없는 연산입니다: ${op}` });
+    return;
+  }
+  try {
+    const result = kernel(...args.map(reviveArg));
+    self.postMessage({ id, result }, collectBuffers(result));
+  } catch (error) {
+    self.postMessage({ id, error: error.message });
+  }
+};